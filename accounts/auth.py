@@ -1,7 +1,12 @@
-from django.contrib.auth import authenticate, get_user_model
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import update_last_login
+from django.contrib.auth.signals import user_login_failed
 from django.core.cache import cache
+from django.db.models import Q
+from django.db.models.functions import Lower
 from django.utils import timezone
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework import exceptions
 from datetime import timedelta
@@ -22,6 +27,25 @@ def _keys(identifier: str):
 def _now():
     return timezone.now()
 
+
+def resolver_usuario(identifier: str):
+    """
+    Una sola consulta por username o email (índice funcional auth_user_email_lower_idx,
+    migración accounts 0004), con perfil y grupos ya cargados.
+    Si el email es ambiguo (varios usuarios) solo vale el username.
+    """
+    qs = User.objects.select_related('perfil').prefetch_related('groups')
+    if "@" not in identifier:
+        return qs.filter(username=identifier).first()
+    candidatos = list(
+        qs.alias(email_lower=Lower('email'))
+          .filter(Q(username=identifier) | Q(email_lower=identifier))[:3]
+    )
+    for u in candidatos:
+        if u.username == identifier:
+            return u
+    return candidatos[0] if len(candidatos) == 1 else None
+
 class EmailOrUsernameTokenObtainPairSerializer(TokenObtainPairSerializer):
     """
     Valida credenciales por username o email.
@@ -52,18 +76,15 @@ class EmailOrUsernameTokenObtainPairSerializer(TokenObtainPairSerializer):
                 detail={"detail": "Usuario bloqueado por intentos fallidos.", "locked_for_minutes": mins}
             )
 
-        # Si es email, obtener username real
-        username = identifier
-        if "@" in identifier:
-            try:
-                user = User.objects.get(email__iexact=identifier)
-                username = user.username
-            except User.DoesNotExist:
-                # para evitar enumeración de usuarios, tratamos como credencial inválida
-                pass
-
-        user = authenticate(self.context.get("request"), username=username, password=password)
+        # Un solo hash: se valida la contraseña acá y el token se emite directo
+        # (sin authenticate() + super().validate(), que la verificaban dos veces)
+        user = resolver_usuario(identifier)
+        if user is None:
+            User().set_password(password)   # mismo costo que un usuario existente (enumeración por tiempo)
+        elif not user.check_password(password) or not user.is_active:
+            user = None
         if not user:
+            user_login_failed.send(sender=__name__, credentials={"username": identifier}, request=request)
             # fallo → incrementar intentos
             attempts = cache.get(attempts_key, 0) + 1
             cache.set(attempts_key, attempts, timeout=LOCK_MINUTES * 60)  # TTL rueda
@@ -77,25 +98,25 @@ class EmailOrUsernameTokenObtainPairSerializer(TokenObtainPairSerializer):
                 detail={"detail": "Credenciales inválidas.", "remaining_attempts": remaining}
             )
 
-            # (no continúa)
-
         # Éxito → resetear contadores
         cache.delete_many([attempts_key, blocked_key])
 
-        # Permitir solo usuarios creados en Django (esto ya lo es) y opcionalmente solo activos
-        if not user.is_active:
-            raise exceptions.PermissionDenied("Usuario inactivo.")
-
         # Generar tokens estándar
-        data = super().validate({"username": user.username, "password": password})
-
-        # Extra: incluir grupos/rol en la respuesta si querés
+        self.user = user
+        refresh = self.get_token(user)
+        data = {"refresh": str(refresh), "access": str(refresh.access_token)}
+        if api_settings.UPDATE_LAST_LOGIN:
+            update_last_login(None, user)
+
+        # Extra: incluir grupos/rol en la respuesta (ya precargados)
+        perfil = getattr(user, "perfil", None)
         data["user"] = {
             "id": user.id,
             "username": user.username,
             "email": user.email,
             "is_superuser": user.is_superuser,
-            "groups": list(user.groups.values_list("name", flat=True)),
+            "groups": [g.name for g in user.groups.all()],
+            "rol": getattr(perfil, "rol", "empleado"),
         }
         return data
 
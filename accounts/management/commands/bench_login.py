@@ -0,0 +1,67 @@
+# accounts/management/commands/bench_login.py
+import time
+import uuid
+
+from django.contrib.auth import authenticate, get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+
+from accounts.auth import EmailOrUsernameTokenObtainPairSerializer
+
+User = get_user_model()
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _login_anterior(request, email, password):
+    """ Flujo previo: búsqueda por email__iexact + authenticate() + super().validate() (dos hashes). """
+    username = User.objects.get(email__iexact=email).username
+    user = authenticate(request, username=username, password=password)
+    data = TokenObtainPairSerializer().validate({"username": user.username, "password": password})
+    data["groups"] = list(user.groups.values_list("name", flat=True))
+    return data
+
+
+def _login_actual(request, email, password):
+    serializer = EmailOrUsernameTokenObtainPairSerializer(
+        data={"username": email, "password": password}, context={"request": request})
+    serializer.is_valid(raise_exception=True)
+    return serializer.validated_data
+
+
+class Command(BaseCommand):
+    help = "Benchmark de login por email (logins/s en un core): flujo anterior vs resolver_usuario + un hash."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--logins', type=int, default=10)
+
+    def handle(self, *args, **opts):
+        n = opts['logins']
+        request = APIRequestFactory().post('/api/token/')
+        try:
+            # usuario temporal: todo se deshace al final
+            with transaction.atomic():
+                sufijo = uuid.uuid4().hex[:8]
+                email, password = f'bench-{sufijo}@empresa.com', uuid.uuid4().hex
+                User.objects.create_user(f'bench-{sufijo}', email, password)
+
+                resultados = {}
+                for nombre, login in (('anterior', _login_anterior), ('actual', _login_actual)):
+                    login(request, email.upper(), password)   # calentamiento
+                    inicio = time.perf_counter()
+                    for _ in range(n):
+                        login(request, email.upper(), password)
+                    resultados[nombre] = n / (time.perf_counter() - inicio)
+                    cache.delete_many([f"auth:attempts:{email}|127.0.0.1", f"auth:blocked_until:{email}|127.0.0.1"])
+                raise _Rollback
+        except _Rollback:
+            pass
+
+        self.stdout.write(f"Flujo anterior : {resultados['anterior']:8.2f} logins/s")
+        self.stdout.write(f"Flujo actual   : {resultados['actual']:8.2f} logins/s  "
+                          f"(x{resultados['actual'] / resultados['anterior']:.1f})")
@@ -0,0 +1,30 @@
+from django.db import migrations, models
+from django.db.models.functions import Lower
+
+INDICE = models.Index(Lower('email'), name='auth_user_email_lower_idx')
+
+
+def crear_indice(apps, schema_editor):
+    schema_editor.add_index(apps.get_model('auth', 'User'), INDICE)
+
+
+def borrar_indice(apps, schema_editor):
+    schema_editor.remove_index(apps.get_model('auth', 'User'), INDICE)
+
+
+class Migration(migrations.Migration):
+    """
+    Índice funcional sobre lower(email) de auth_user (tabla de django.contrib.auth,
+    por eso va con el schema editor y no como AddIndex): lo usa
+    accounts.auth.resolver_usuario en el login. El schema editor arma el SQL de
+    cada motor (MySQL necesita la expresión entre doble paréntesis).
+    """
+
+    dependencies = [
+        ('accounts', '0003_alter_perfil_rol_alter_perfil_usuario'),
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indice, borrar_indice),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_auth_user_email_lower_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TokenRevocado',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('clave', models.CharField(db_index=True, max_length=64)),
+                ('emitidos_antes', models.DateTimeField(blank=True, null=True)),
+                ('expira', models.DateTimeField(db_index=True)),
+                ('creado_en', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
@@ -23,6 +23,23 @@ class Perfil(models.Model):
     def __str__(self):
         return f'{self.usuario.username} - {self.get_rol_display()}'
 
+class TokenRevocado(models.Model):
+    """
+    Revocación de JWT (ver accounts/revocacion.py). Dos formas de clave:
+      'jti:<jti>'       -> un token puntual (logout)
+      'usuario:<id>'    -> todos los tokens del usuario emitidos antes de `emitidos_antes`
+                           (baja de empleado, cambio de rol)
+    Pasado `expira` ya no hay token vivo que la necesite y la fila se purga.
+    """
+    clave          = models.CharField(max_length=64, db_index=True)
+    emitidos_antes = models.DateTimeField(null=True, blank=True)
+    expira         = models.DateTimeField(db_index=True)
+    creado_en      = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return self.clave
+
+
 def _sync_groups_for(user: User) -> None:
     """
     Mantiene los grupos básicos alineados con el rol del perfil y con is_superuser.
@@ -35,10 +52,14 @@ def _sync_groups_for(user: User) -> None:
     admin_g, _ = Group.objects.get_or_create(name='Admin')
     emp_g, _   = Group.objects.get_or_create(name='Empleado')
 
+    es_admin = user.is_superuser or user.perfil.rol == 'administrador'
+    antes = set(user.groups.filter(pk__in=[admin_g.pk, emp_g.pk]).values_list('pk', flat=True))
+    cambio_de_rol = bool(antes) and antes != {admin_g.pk if es_admin else emp_g.pk}
+
     # Limpia pertenencia básica (ajusta si usas más grupos)
     user.groups.remove(admin_g, emp_g)
 
-    if user.is_superuser or user.perfil.rol == 'administrador':
+    if es_admin:
         user.groups.add(admin_g)
         if not user.is_staff:
             user.is_staff = True
@@ -47,6 +68,11 @@ def _sync_groups_for(user: User) -> None:
         user.groups.add(emp_g)
         # no forzamos is_staff para no-admin
 
+    if cambio_de_rol:
+        # los tokens emitidos llevan permisos del rol anterior: que vuelva a loguearse
+        from .revocacion import revocar_usuario
+        revocar_usuario(user.pk)
+
 @receiver(post_save, sender=User)
 def crear_o_sync_perfil(sender, instance: User, created: bool, **kwargs):
     """
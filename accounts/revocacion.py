@@ -0,0 +1,146 @@
+# accounts/revocacion.py
+"""
+Revocación de JWT sin consultar la base en cada request.
+
+Cada proceso mantiene un filtro de Bloom con las claves de TokenRevocado
+('jti:<jti>' / 'usuario:<id>'), actualizado de forma incremental (filas con
+id > último visto) cada REVOCACION_REFRESCO_SEGUNDOS. Solo si el filtro dice
+"posiblemente revocado" se confirma contra la tabla; un falso positivo cuesta
+una consulta, nunca un rechazo.
+
+Una revocación hecha en otro proceso se ve a lo sumo REVOCACION_REFRESCO_SEGUNDOS
+después; en el mismo proceso, de inmediato.
+"""
+import hashlib
+import threading
+import time
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .models import TokenRevocado
+
+
+class FiltroBloom:
+    def __init__(self, bits, hashes):
+        self.bits, self.hashes = bits, hashes
+        self._arr = bytearray((bits + 7) // 8)
+
+    def _posiciones(self, clave):
+        # doble hashing (Kirsch-Mitzenmacher) sobre un solo blake2b
+        h = hashlib.blake2b(clave.encode(), digest_size=16).digest()
+        a = int.from_bytes(h[:8], 'little')
+        b = int.from_bytes(h[8:], 'little') | 1
+        return [(a + i * b) % self.bits for i in range(self.hashes)]
+
+    def agregar(self, clave):
+        for p in self._posiciones(clave):
+            self._arr[p >> 3] |= 1 << (p & 7)
+
+    def __contains__(self, clave):
+        return all(self._arr[p >> 3] & (1 << (p & 7)) for p in self._posiciones(clave))
+
+
+class _Revocaciones:
+    """ Estado por proceso: filtro + último id de TokenRevocado ya cargado. """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reiniciar()
+
+    def _reiniciar(self):
+        self.filtro = FiltroBloom(settings.REVOCACION_BLOOM_BITS, settings.REVOCACION_BLOOM_HASHES)
+        self.ultimo_id = 0
+        self.cargadas = 0
+        self.refrescado_en = None
+
+    def refrescar(self, forzar=False):
+        ahora = time.monotonic()
+        if not forzar and self.refrescado_en is not None \
+                and ahora - self.refrescado_en < settings.REVOCACION_REFRESCO_SEGUNDOS:
+            return
+        with self._lock:
+            if not forzar and self.refrescado_en is not None \
+                    and ahora - self.refrescado_en < settings.REVOCACION_REFRESCO_SEGUNDOS:
+                return
+            qs = TokenRevocado.objects.filter(pk__gt=self.ultimo_id)
+            if self.cargadas > settings.REVOCACION_BLOOM_CAPACIDAD:
+                # demasiadas claves (y muchas ya vencidas): rearmar con las vigentes
+                self._reiniciar()
+                qs = TokenRevocado.objects.filter(expira__gt=timezone.now())
+            for pk, clave in qs.order_by('pk').values_list('pk', 'clave').iterator():
+                self.filtro.agregar(clave)
+                self.ultimo_id = max(self.ultimo_id, pk)
+                self.cargadas += 1
+            self.refrescado_en = ahora
+
+    def agregar(self, clave):
+        self.filtro.agregar(clave)
+
+
+revocaciones = _Revocaciones()
+
+
+def _desde_epoch(segundos):
+    return datetime.fromtimestamp(segundos, tz=dt_timezone.utc)
+
+
+def revocar_token(token):
+    """ Revoca un token puntual (access o refresh) hasta su vencimiento. """
+    clave = f"jti:{token[api_settings.JTI_CLAIM]}"
+    TokenRevocado.objects.create(clave=clave, expira=_desde_epoch(token['exp']))
+    revocaciones.agregar(clave)
+
+
+def revocar_usuario(user_id):
+    """ Revoca todos los tokens del usuario emitidos hasta ahora. """
+    ahora = timezone.now()
+    clave = f"usuario:{user_id}"
+    fila = TokenRevocado.objects.create(
+        clave=clave, emitidos_antes=ahora,
+        expira=ahora + api_settings.REFRESH_TOKEN_LIFETIME,
+    )
+    revocaciones.agregar(clave)
+    # limpieza ocasional de filas sin tokens vivos
+    if fila.pk % 500 == 0:
+        TokenRevocado.objects.filter(expira__lt=ahora).delete()
+
+
+def esta_revocado(token):
+    revocaciones.refrescar()
+    claves = [f"jti:{token.get(api_settings.JTI_CLAIM)}", f"usuario:{token.get(api_settings.USER_ID_CLAIM)}"]
+    posibles = [c for c in claves if c in revocaciones.filtro]
+    if not posibles:
+        return False
+
+    iat = token.get('iat')
+    filas = TokenRevocado.objects.filter(clave__in=posibles, expira__gt=timezone.now())
+    for emitidos_antes in filas.values_list('emitidos_antes', flat=True):
+        if emitidos_antes is None or iat is None or iat < emitidos_antes.timestamp():
+            return True
+    return False
+
+
+class JWTAuthenticationRevocable(JWTAuthentication):
+    """ JWTAuthentication + chequeo de revocación (DEFAULT_AUTHENTICATION_CLASSES). """
+
+    def get_validated_token(self, raw_token):
+        token = super().get_validated_token(raw_token)
+        if esta_revocado(token):
+            raise InvalidToken({"detail": "Token revocado.", "code": "token_revoked"})
+        return token
+
+
+class TokenRefreshRevocableSerializer(TokenRefreshSerializer):
+    """ /api/token/refresh/ rechaza refresh tokens revocados (SIMPLE_JWT['TOKEN_REFRESH_SERIALIZER']). """
+
+    def validate(self, attrs):
+        if esta_revocado(RefreshToken(attrs['refresh'])):
+            raise InvalidToken({"detail": "Token revocado.", "code": "token_revoked"})
+        return super().validate(attrs)
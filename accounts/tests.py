@@ -1,3 +1,41 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .revocacion import esta_revocado
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class RevocarTokenTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user('ana', 'ana@empresa.com', 'clave')
+        self.refresh = RefreshToken.for_user(self.user)
+        self.client = APIClient()
+
+    def _logout(self, access):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+        return self.client.post(reverse('token_revocar'), {'refresh': str(self.refresh)}, format='json')
+
+    def test_logout_revoca_refresh_y_access(self):
+        access = self.refresh.access_token
+        resp = self._logout(access)
+        self.assertEqual(resp.status_code, 204)
+        self.assertTrue(esta_revocado(RefreshToken(str(self.refresh))))
+        self.assertTrue(esta_revocado(access))
+
+    def test_logout_con_access_vencido_revoca_el_refresh(self):
+        access = self.refresh.access_token
+        access.set_exp(lifetime=-timedelta(minutes=1))
+        resp = self._logout(access)
+        self.assertEqual(resp.status_code, 204)
+        self.assertTrue(esta_revocado(RefreshToken(str(self.refresh))))
+
+    def test_logout_con_access_invalido_revoca_el_refresh(self):
+        resp = self._logout('basura')
+        self.assertEqual(resp.status_code, 204)
+        self.assertTrue(esta_revocado(RefreshToken(str(self.refresh))))
@@ -1,7 +1,14 @@
 # accounts/views.py
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from .revocacion import revocar_token
 
 class PerfilUsuarioAPIView(APIView):
     permission_classes = [IsAuthenticated]
@@ -24,3 +31,42 @@ class PerfilUsuarioAPIView(APIView):
             "perfil": {"rol": rol, "rol_display": rol_display},
             "rol_efectivo": "administrador" if es_admin else rol,
         })
+
+
+class RevocarTokenAPIView(APIView):
+    """
+    POST /api/token/revocar/ {"refresh": "..."}  (logout)
+    Revoca el refresh token y, si vino en el header, el access token actual.
+    Sin autenticación: al hacer logout el access suele estar vencido, y con la
+    autenticación por defecto el 401 cortaría antes de revocar el refresh.
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def post(self, request):
+        crudo = request.data.get('refresh')
+        if not crudo:
+            raise ValidationError({"refresh": "Requerido."})
+        try:
+            refresh = RefreshToken(crudo)
+        except TokenError:
+            refresh = None   # vencido o inválido: ya no sirve para nada
+        if refresh is not None:
+            revocar_token(refresh)
+        access = self._access_del_header(request)
+        if access is not None:
+            revocar_token(access)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+    @staticmethod
+    def _access_del_header(request):
+        """ Access token del header Authorization, o None si falta, venció o es inválido. """
+        auth = JWTAuthentication()
+        header = auth.get_header(request)
+        crudo = None if header is None else auth.get_raw_token(header)
+        if crudo is None:
+            return None
+        try:
+            return AccessToken(crudo)
+        except TokenError:
+            return None
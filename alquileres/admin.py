@@ -1,6 +1,24 @@
 # alquileres/admin.py
 from django.contrib import admin
+from myproject.admin_rendimiento import ModelAdminRapido
 from .models import Alquiler, DetAlquiler
 
-admin.site.register(Alquiler)
-admin.site.register(DetAlquiler)
+
+@admin.register(Alquiler)
+class AlquilerAdmin(ModelAdminRapido):
+    list_display = ('id', 'cliente_nombre', 'creado_en', 'items_count', 'total', 'open_incidents')
+    raw_id_fields = ('cliente',)
+    # "123" busca por id o cliente; texto: prefijo del nombre del cliente
+    search_id_fields = ('pk', 'cliente_id')
+    search_fields = ('^cliente_nombre',)
+    ordering = ('-creado_en',)
+
+
+@admin.register(DetAlquiler)
+class DetAlquilerAdmin(ModelAdminRapido):
+    list_display = ('id', 'alquiler', 'producto', 'cantidad', 'precio_unit')
+    list_select_related = ('alquiler', 'producto')
+    raw_id_fields = ('alquiler',)
+    autocomplete_fields = ('producto',)
+    search_id_fields = ('pk', 'alquiler_id', 'producto_id')
+    ordering = ('-id',)
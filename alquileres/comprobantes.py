@@ -0,0 +1,106 @@
+# alquileres/comprobantes.py
+"""
+Comprobante / remito en PDF de un alquiler (template alquileres/comprobante.txt
++ myproject/pdf.py), cacheado en disco.
+
+La clave del cache es un hash de todo lo que se imprime (alquiler, cliente,
+líneas con nombre de producto, precios, totales) más la versión del template:
+una reimpresión sin cambios es leer un archivo, y cualquier edición de una
+línea (o del nombre de un producto) genera otra clave. Al escribir una versión
+nueva se borran las anteriores del mismo alquiler; por eso para servir un PDF
+se usa abrir_cacheado(), que lo abre y si otro request lo borró justo antes, lo
+vuelve a generar.
+"""
+import hashlib
+import json
+import os
+import tempfile
+from decimal import Decimal
+from pathlib import Path
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.template.loader import get_template, render_to_string
+
+from myproject.pdf import COLUMNAS, documento_pdf, paginar
+from .models import Alquiler, DetAlquiler
+
+TEMPLATE = 'alquileres/comprobante.txt'
+TIPOS = ('comprobante', 'remito')
+
+
+def datos(alquiler_id):
+    """ Todo lo que va impreso, en 2 consultas. Alquiler.DoesNotExist si no existe. """
+    alquiler = (Alquiler.objects
+                .values('id', 'cliente_id', 'cliente_nombre', 'creado_en', 'total', 'items_count')
+                .get(pk=alquiler_id))
+    items = list(DetAlquiler.objects
+                 .filter(alquiler_id=alquiler_id)
+                 .order_by('pk')
+                 .values('id', 'producto_id', 'producto__nombre', 'cantidad', 'precio_unit'))
+    for item in items:
+        item['producto_nombre'] = item.pop('producto__nombre')
+        item['subtotal'] = Decimal(item['cantidad']) * item['precio_unit']
+    return {'alquiler': alquiler, 'items': items}
+
+
+def _version_template():
+    origen = get_template(TEMPLATE).origin.name
+    return str(os.stat(origen).st_mtime_ns)
+
+
+def clave(d, tipo):
+    crudo = json.dumps([tipo, _version_template(), d], cls=DjangoJSONEncoder, sort_keys=True)
+    return hashlib.sha256(crudo.encode()).hexdigest()[:20]
+
+
+def renderizar_lineas(d, tipo):
+    texto = render_to_string(TEMPLATE, {
+        **d,
+        'remito': tipo == 'remito',
+        'separador': '-' * min(COLUMNAS, 82),
+        'total_unidades': sum(i['cantidad'] for i in d['items']),
+    })
+    return texto.rstrip('\n').split('\n')
+
+
+def _dir():
+    return Path(settings.COMPROBANTES_DIR)
+
+
+def ruta_cacheada(alquiler_id, tipo, d=None):
+    """ (ruta, generado) con el PDF vigente; lo genera si no está en cache. """
+    d = datos(alquiler_id) if d is None else d
+    ruta = _dir() / f"{tipo}-{alquiler_id}-{clave(d, tipo)}.pdf"
+    if ruta.exists():
+        return ruta, False
+
+    pdf = documento_pdf(paginar(renderizar_lineas(d, tipo)), titulo=f"{tipo.capitalize()} {alquiler_id}")
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    # escritura atómica: otro request nunca lee un PDF a medio escribir
+    fd, tmp = tempfile.mkstemp(dir=ruta.parent, suffix='.tmp')
+    with os.fdopen(fd, 'wb') as f:
+        f.write(pdf)
+    os.replace(tmp, ruta)
+    for vieja in ruta.parent.glob(f"{tipo}-{alquiler_id}-*.pdf"):
+        if vieja != ruta:
+            try:
+                vieja.unlink(missing_ok=True)
+            except OSError:
+                pass   # abierta por otro request (Windows): se borra con la próxima versión
+    return ruta, True
+
+
+def abrir_cacheado(alquiler_id, tipo, intentos=3):
+    """
+    (archivo abierto en binario, generado). Entre ubicar el PDF y abrirlo, otro
+    request con una versión más nueva puede haberlo borrado: se relee y se reintenta.
+    """
+    for _ in range(intentos - 1):
+        ruta, generado = ruta_cacheada(alquiler_id, tipo)
+        try:
+            return open(ruta, 'rb'), generado
+        except FileNotFoundError:
+            continue
+    ruta, generado = ruta_cacheada(alquiler_id, tipo)
+    return open(ruta, 'rb'), generado
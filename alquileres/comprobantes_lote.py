@@ -0,0 +1,31 @@
+# alquileres/comprobantes_lote.py
+"""
+Funciones de los procesos hijos de `manage.py comprobantes_del_dia`.
+
+Con el inicio 'spawn' (default en Windows/macOS) el hijo importa este módulo
+antes de correr el initializer: no puede importar modelos a nivel de módulo
+(AppRegistryNotReady). Por eso los imports de Django van dentro de las
+funciones, después de django.setup().
+"""
+import os
+
+
+def inicializar():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'myproject.settings')
+    import django
+    django.setup()
+    # con fork el hijo hereda la conexión del padre: cada proceso abre la suya
+    from django.db import connections
+    connections.close_all()
+
+
+def renderizar(args):
+    """ Deja el PDF en el cache; con combinar, devuelve además sus páginas. """
+    from alquileres import comprobantes
+    from myproject.pdf import paginar
+
+    alquiler_id, tipo, combinar = args
+    d = comprobantes.datos(alquiler_id)
+    ruta, generado = comprobantes.ruta_cacheada(alquiler_id, tipo, d)
+    paginas = paginar(comprobantes.renderizar_lineas(d, tipo)) if combinar else None
+    return alquiler_id, str(ruta), generado, paginas
@@ -0,0 +1,74 @@
+# alquileres/management/commands/bench_render.py
+import random
+import timeit
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from myproject.renderers import FastJSONRenderer, orjson
+from alquileres.models import Alquiler
+from alquileres.serializers import AlquilerSerializer
+
+
+def _payload_sintetico(n_alquileres, n_items):
+    """ Misma forma que AlquilerSerializer(many=True).data """
+    ahora = timezone.now()
+    data = []
+    det_id = 1
+    for i in range(1, n_alquileres + 1):
+        items = []
+        for _ in range(n_items):
+            items.append({
+                'id': det_id,
+                'alquiler': i,
+                'producto': random.randint(1, 500),
+                'producto_nombre': f'Producto {random.randint(1, 500)}',
+                'cantidad': random.randint(1, 50),
+                'precio_unit': str(Decimal(random.randint(100, 99999)) / 100),
+            })
+            det_id += 1
+        data.append({
+            'id': i,
+            'cliente': i,
+            'cliente_nombre': f'Cliente {i}',
+            'creado_en': (ahora - timedelta(minutes=i)).isoformat(),
+            'items_count': n_items,
+            'total': str(sum(it['cantidad'] * Decimal(it['precio_unit']) for it in items)),
+            'open_incidents': 0,
+            'items': items,
+        })
+    return data
+
+
+class Command(BaseCommand):
+    help = "Benchmark de render JSON del listado de alquileres (DRF JSONRenderer vs FastJSONRenderer)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--alquileres', type=int, default=2000)
+        parser.add_argument('--items', type=int, default=8, help='Ítems por alquiler (payload sintético)')
+        parser.add_argument('--repeticiones', type=int, default=20)
+        parser.add_argument('--db', action='store_true',
+                            help='Usar el listado real de la base en vez del payload sintético')
+
+    def handle(self, *args, **opts):
+        if opts['db']:
+            qs = Alquiler.objects.prefetch_related('items__producto')[:opts['alquileres']]
+            data = AlquilerSerializer(qs, many=True).data
+        else:
+            data = _payload_sintetico(opts['alquileres'], opts['items'])
+
+        reps = opts['repeticiones']
+        drf, fast = JSONRenderer(), FastJSONRenderer()
+        assert drf.render(data) == fast.render(data), 'Las salidas no coinciden'
+
+        t_drf = min(timeit.repeat(lambda: drf.render(data), number=1, repeat=reps))
+        t_fast = min(timeit.repeat(lambda: fast.render(data), number=1, repeat=reps))
+        size_kb = len(fast.render(data)) / 1024
+
+        self.stdout.write(f"Payload: {len(data)} alquileres, {size_kb:.0f} KB")
+        self.stdout.write(f"orjson disponible: {'sí' if orjson is not None else 'no (fallback stdlib)'}")
+        self.stdout.write(f"DRF JSONRenderer : {t_drf * 1000:8.2f} ms")
+        self.stdout.write(f"FastJSONRenderer : {t_fast * 1000:8.2f} ms  (x{t_drf / t_fast:.1f})")
@@ -0,0 +1,61 @@
+# alquileres/management/commands/comprobantes_del_dia.py
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils import timezone
+
+from alquileres import comprobantes
+from alquileres.comprobantes_lote import inicializar, renderizar
+from alquileres.models import Alquiler
+from myproject.pdf import documento_pdf
+
+
+class Command(BaseCommand):
+    help = "Genera los remitos (o comprobantes) de todos los alquileres de un día, en paralelo."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fecha', help='YYYY-MM-DD (default: hoy)')
+        parser.add_argument('--tipo', choices=comprobantes.TIPOS, default='remito')
+        parser.add_argument('--procesos', type=int, default=None,
+                            help='Procesos en paralelo (default: cantidad de CPUs)')
+        parser.add_argument('--salida', help='Además, un solo PDF con todos (para imprimir de una vez)')
+
+    def handle(self, *args, **opts):
+        try:
+            dia = date.fromisoformat(opts['fecha']) if opts['fecha'] else timezone.localdate()
+        except ValueError:
+            raise CommandError("--fecha debe ser YYYY-MM-DD")
+
+        ids = list(Alquiler.objects
+                   .filter(creado_en__date=dia)
+                   .order_by('creado_en', 'pk')
+                   .values_list('pk', flat=True))
+        if not ids:
+            self.stdout.write(f"No hay alquileres del {dia:%d/%m/%Y}.")
+            return
+
+        procesos = opts['procesos'] or os.cpu_count() or 1
+        combinar = bool(opts['salida'])
+        tareas = [(pk, opts['tipo'], combinar) for pk in ids]
+
+        # el padre no le pasa su conexión abierta a los hijos
+        connections.close_all()
+        generados, paginas = 0, []
+        chunksize = max(1, len(tareas) // (procesos * 4))
+        # los hijos corren alquileres/comprobantes_lote.py (sirve con fork y con spawn)
+        with ProcessPoolExecutor(max_workers=procesos, initializer=inicializar) as pool:
+            for pk, ruta, generado, pags in pool.map(renderizar, tareas, chunksize=chunksize):
+                generados += generado
+                if pags:
+                    paginas.extend(pags)
+                self.stdout.write(f"Alquiler #{pk}: {ruta}{'' if generado else ' (cache)'}")
+
+        if combinar:
+            with open(opts['salida'], 'wb') as f:
+                f.write(documento_pdf(paginas, titulo=f"{opts['tipo'].capitalize()}s del {dia:%d/%m/%Y}"))
+            self.stdout.write(f"{len(paginas)} páginas en {opts['salida']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(ids)} {opts['tipo']}s del {dia:%d/%m/%Y} ({generados} generados, {len(ids) - generados} del cache)."))
@@ -0,0 +1,56 @@
+# alquileres/management/commands/rebuild_alquiler_totals.py
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connection, connections, transaction
+from django.db.models import Max, Min
+
+from alquileres.models import Alquiler, desalineados, recalcular_totales
+
+
+def _procesar_chunk(desde, hasta, fix):
+    """ Revisa alquileres con pk en [desde, hasta) y corrige los desalineados. """
+    try:
+        mal = desalineados(Alquiler.objects.filter(pk__gte=desde, pk__lt=hasta))
+        if fix and mal:
+            with transaction.atomic():
+                recalcular_totales([d[0] for d in mal])
+        return mal
+    finally:
+        # cada hilo usa su propia conexión
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = "Recalcula Alquiler.items_count/total desde DetAlquiler y corrige desvíos (en chunks paralelos)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=5000)
+        parser.add_argument('--workers', type=int, default=None,
+                            help='Hilos en paralelo (default: 4; 1 con SQLite)')
+        parser.add_argument('--dry-run', action='store_true', help='Solo informar, no corregir')
+
+    def handle(self, *args, **opts):
+        rango = Alquiler.objects.aggregate(desde=Min('pk'), hasta=Max('pk'))
+        if rango['desde'] is None:
+            self.stdout.write("No hay alquileres.")
+            return
+
+        workers = opts['workers'] or (1 if connection.vendor == 'sqlite' else 4)
+        size = opts['chunk_size']
+        chunks = [(i, i + size) for i in range(rango['desde'], rango['hasta'] + 1, size)]
+        fix = not opts['dry_run']
+
+        total = 0
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for mal in pool.map(lambda c: _procesar_chunk(c[0], c[1], fix), chunks):
+                total += len(mal)
+                for pk, items, monto, r_items, r_total in mal:
+                    self.stdout.write(f"Alquiler #{pk}: items_count={items}/{r_items}, total={monto}/{r_total}")
+
+        if not total:
+            self.stdout.write(self.style.SUCCESS(f"Totales OK ({len(chunks)} chunks)."))
+        elif fix:
+            self.stdout.write(self.style.SUCCESS(f"{total} alquileres corregidos."))
+        else:
+            self.stdout.write(self.style.WARNING(f"{total} alquileres desalineados (sin --dry-run se corrigen)."))
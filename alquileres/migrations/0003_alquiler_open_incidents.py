@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alquileres', '0002_alter_alquiler_cliente_alter_detalquiler_cantidad_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='alquiler',
+            name='open_incidents',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
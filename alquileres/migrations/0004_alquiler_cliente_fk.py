@@ -0,0 +1,72 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+BATCH = 1000
+
+
+def _norm(texto):
+    return ' '.join((texto or '').split()).lower()
+
+
+def backfill_cliente(apps, schema_editor):
+    """
+    Vincula cada alquiler con su Cliente comparando el texto guardado con
+    "nombre apellido". Solo se asignan coincidencias únicas; el resto queda
+    con cliente=NULL y conserva el texto en cliente_nombre.
+    """
+    Cliente = apps.get_model('clientes', 'Cliente')
+    Alquiler = apps.get_model('alquileres', 'Alquiler')
+
+    por_nombre = {}
+    for pk, nombre, apellido in Cliente.objects.values_list('pk', 'nombre', 'apellido').iterator():
+        clave = _norm(f'{nombre} {apellido}')
+        por_nombre[clave] = None if clave in por_nombre else pk   # None = ambiguo
+
+    ultimo_pk = 0
+    while True:
+        lote = list(
+            Alquiler.objects
+            .filter(pk__gt=ultimo_pk, cliente__isnull=True)
+            .exclude(cliente_nombre='')
+            .order_by('pk')
+            .only('pk', 'cliente_nombre')[:BATCH]
+        )
+        if not lote:
+            break
+        ultimo_pk = lote[-1].pk
+
+        cambios = []
+        for alq in lote:
+            cliente_id = por_nombre.get(_norm(alq.cliente_nombre))
+            if cliente_id:
+                alq.cliente_id = cliente_id
+                cambios.append(alq)
+        Alquiler.objects.bulk_update(cambios, ['cliente'], batch_size=BATCH)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alquileres', '0003_alquiler_open_incidents'),
+        ('clientes', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RenameField(
+            model_name='alquiler',
+            old_name='cliente',
+            new_name='cliente_nombre',
+        ),
+        migrations.AddField(
+            model_name='alquiler',
+            name='cliente',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='alquileres', to='clientes.cliente'),
+        ),
+        migrations.RunPython(backfill_cliente, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='alquiler',
+            index=models.Index(fields=['cliente', 'creado_en'], name='alquiler_cliente_creado_idx'),
+        ),
+    ]
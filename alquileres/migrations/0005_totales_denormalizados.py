@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:32
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, DecimalField, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_totales(apps, schema_editor):
+    Alquiler = apps.get_model('alquileres', 'Alquiler')
+    DetAlquiler = apps.get_model('alquileres', 'DetAlquiler')
+    lineas = DetAlquiler.objects.filter(alquiler=OuterRef('pk')).order_by().values('alquiler')
+    Alquiler.objects.update(
+        items_count=Coalesce(Subquery(lineas.annotate(n=Count('pk')).values('n')), 0),
+        total=Coalesce(
+            Subquery(lineas.annotate(s=Sum(F('cantidad') * F('precio_unit'))).values('s')),
+            Value(Decimal('0')),
+            output_field=DecimalField(max_digits=12, decimal_places=2),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alquileres', '0004_alquiler_cliente_fk'),
+        ('clientes', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='alquiler',
+            name='items_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='alquiler',
+            name='total',
+            field=models.DecimalField(decimal_places=2, default=0, editable=False, max_digits=12),
+        ),
+        migrations.AddIndex(
+            model_name='alquiler',
+            index=models.Index(fields=['total'], name='alquiler_total_idx'),
+        ),
+        migrations.RunPython(backfill_totales, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alquileres', '0006_alquiler_updated_at'),
+        ('clientes', '0002_cliente_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='alquiler',
+            index=models.Index(fields=['-creado_en'], name='alquiler_creado_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alquileres', '0007_alquiler_creado_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='alquiler',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.AddField(
+            model_name='detalquiler',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+    ]
@@ -1,20 +1,219 @@
 # alquileres/models.py
-from django.db import models
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import models, transaction
+from django.db.models import Count, DecimalField, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from myproject.versionado import ModeloVersionado
 from productos.models import Producto  # ajusta import
+from clientes.models import Cliente
+
+CENTAVO = Decimal('0.01')
+
 # ...
 
-class Alquiler(models.Model):
-    cliente   = models.CharField(max_length=200, blank=True)
+class Alquiler(ModeloVersionado):
+    # db_index=False: lo cubre el índice compuesto (cliente, creado_en)
+    cliente   = models.ForeignKey(Cliente, on_delete=models.PROTECT, related_name='alquileres',
+                                  null=True, blank=True, db_index=False)
+    # Nombre del cliente al momento del alquiler (o texto libre si no hay cliente cargado)
+    cliente_nombre = models.CharField(max_length=200, blank=True)
     creado_en = models.DateTimeField(auto_now_add=True)
+    # Última modificación (delta-sync, /api/sync/). Los UPDATE de contadores/totales también la tocan.
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    # Incidentes en estado 'abierto' sobre sus ítems (lo mantiene Incidente.save/delete)
+    open_incidents = models.PositiveIntegerField(default=0, editable=False)
+    # Denormalizados: los mantiene DetAlquiler (save/delete y operaciones bulk)
+    items_count = models.PositiveIntegerField(default=0, editable=False)
+    total       = models.DecimalField(max_digits=12, decimal_places=2, default=0, editable=False)
+    # version (ModeloVersionado): sube con cada save y con cada cambio de sus ítems (ajustar_totales)
+
+    # los mantienen UPDATE ... F() de ítems e incidentes: un save de la cabecera no los pisa
+    DENORMALIZADOS = ('open_incidents', 'items_count', 'total')
+
+    class Meta:
+        indexes = [
+            # historial por cliente: WHERE cliente_id = ? ORDER BY creado_en DESC
+            models.Index(fields=['cliente', 'creado_en'], name='alquiler_cliente_creado_idx'),
+            # listado ordenado por monto
+            models.Index(fields=['total'], name='alquiler_total_idx'),
+            # listado por defecto (ORDER BY creado_en DESC): se recorre el índice, sin ordenar aparte
+            models.Index(fields=['-creado_en'], name='alquiler_creado_idx'),
+        ]
 
     def __str__(self):
         return f'Alquiler #{self.pk}'
 
-class DetAlquiler(models.Model):
+    @transaction.atomic
+    def save(self, *args, **kwargs):
+        # atómico: los receivers de post_save (outbox) escriben en la misma transacción
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [f.name for f in self._meta.concrete_fields
+                                       if not f.primary_key and f.name not in self.DENORMALIZADOS]
+        super().save(*args, **kwargs)
+
+
+def _subtotal(cantidad, precio_unit):
+    return Decimal(cantidad or 0) * Decimal(precio_unit or 0)
+
+
+def ajustar_totales(deltas):
+    """
+    Aplica deltas {alquiler_id: (items, monto)} con UPDATE ... SET x = x + delta (F()),
+    un UPDATE por alquiler afectado. También con delta 0 (p.ej. cambio de producto):
+    el alquiler incluye sus ítems, así que cambian version y updated_at.
+    """
+    for alquiler_id, (items, monto) in deltas.items():
+        Alquiler.objects.filter(pk=alquiler_id).update(
+            items_count=F('items_count') + items,
+            total=F('total') + monto,
+            version=F('version') + 1,
+            updated_at=timezone.now(),
+        )
+
+
+def totales_reales():
+    """ Subconsultas con items_count/total calculados desde DetAlquiler (para annotate/update). """
+    lineas = DetAlquiler.objects.filter(alquiler=OuterRef('pk')).order_by().values('alquiler')
+    return {
+        'items_count': Coalesce(Subquery(lineas.annotate(n=Count('pk')).values('n')), 0),
+        'total': Coalesce(
+            Subquery(lineas.annotate(s=Sum(F('cantidad') * F('precio_unit'))).values('s')),
+            Value(Decimal('0')),
+            output_field=DecimalField(max_digits=12, decimal_places=2),
+        ),
+    }
+
+
+def desalineados(alquileres):
+    """
+    [(pk, items_count, total, items_real, total_real)] de los alquileres del queryset
+    cuyos contadores no coinciden con DetAlquiler (total comparado al centavo).
+    """
+    reales = totales_reales()
+    filas = (alquileres
+             .annotate(real_items=reales['items_count'], real_total=reales['total'])
+             .values_list('pk', 'items_count', 'total', 'real_items', 'real_total'))
+    res = []
+    for pk, items, total, r_items, r_total in filas:
+        total, r_total = Decimal(total).quantize(CENTAVO), Decimal(r_total).quantize(CENTAVO)
+        if items != r_items or total != r_total:
+            res.append((pk, items, total, r_items, r_total))
+    return res
+
+
+def recalcular_totales(alquileres):
+    """
+    Recalcula items_count/total desde DetAlquiler en un solo UPDATE con subconsultas.
+    `alquileres` es un queryset de Alquiler o una lista de ids.
+    """
+    if not isinstance(alquileres, models.QuerySet):
+        alquileres = Alquiler.objects.filter(pk__in=list(alquileres))
+    return alquileres.update(**totales_reales(), version=F('version') + 1, updated_at=timezone.now())
+
+
+class DetAlquilerQuerySet(models.QuerySet):
+    """
+    Operaciones masivas que también mantienen Alquiler.items_count/total.
+    """
+
+    @transaction.atomic
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        deltas = defaultdict(lambda: [0, Decimal('0')])
+        for obj in objs:
+            deltas[obj.alquiler_id][0] += 1
+            deltas[obj.alquiler_id][1] += _subtotal(obj.cantidad, obj.precio_unit)
+        ajustar_totales(deltas)
+        return objs
+
+    @transaction.atomic
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        if not {'alquiler', 'cantidad', 'precio_unit'} & set(fields):
+            return super().bulk_update(objs, fields, *args, **kwargs)
+        ids = {o.alquiler_id for o in objs}
+        if 'alquiler' in fields:
+            ids |= set(self.filter(pk__in=[o.pk for o in objs]).values_list('alquiler_id', flat=True))
+        res = super().bulk_update(objs, fields, *args, **kwargs)
+        recalcular_totales(ids)
+        return res
+
+    @transaction.atomic
+    def update(self, **kwargs):
+        # toda escritura masiva sube la versión (bulk_update también pasa por acá)
+        kwargs.setdefault('version', F('version') + 1)
+        if not {'alquiler', 'alquiler_id', 'cantidad', 'precio_unit'} & set(kwargs):
+            return super().update(**kwargs)
+        ids = set(self.values_list('alquiler_id', flat=True))
+        res = super().update(**kwargs)
+        nuevo = kwargs.get('alquiler_id', kwargs.get('alquiler'))
+        if nuevo is not None:
+            ids.add(getattr(nuevo, 'pk', nuevo))
+        recalcular_totales(ids)
+        return res
+
+    @transaction.atomic
+    def delete(self):
+        deltas = defaultdict(lambda: [0, Decimal('0')])
+        for alquiler_id, cantidad, precio in self.values_list('alquiler_id', 'cantidad', 'precio_unit'):
+            deltas[alquiler_id][0] -= 1
+            deltas[alquiler_id][1] -= _subtotal(cantidad, precio)
+        res = super().delete()
+        ajustar_totales(deltas)
+        return res
+
+    delete.alters_data = True
+    delete.queryset_only = True
+    update.alters_data = True
+
+
+class DetAlquiler(ModeloVersionado):
     alquiler    = models.ForeignKey(Alquiler, on_delete=models.CASCADE, related_name='items')  # <- importante
     producto    = models.ForeignKey(Producto, on_delete=models.PROTECT)
     cantidad    = models.PositiveIntegerField()
     precio_unit = models.DecimalField(max_digits=10, decimal_places=2)
 
+    objects = DetAlquilerQuerySet.as_manager()
+
     def __str__(self):
         return f'#{self.pk} · {self.producto} x{self.cantidad}'
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # valores "de base" para calcular el delta sobre el Alquiler al guardar/borrar
+        instance._en_db = (instance.__dict__.get('alquiler_id'),
+                           _subtotal(instance.__dict__.get('cantidad'), instance.__dict__.get('precio_unit')))
+        return instance
+
+    @transaction.atomic
+    def save(self, *args, **kwargs):
+        if self._state.adding:
+            antes = None
+        elif not hasattr(self, '_en_db'):
+            # instancia sin valores de base conocidos: recalcular desde las líneas
+            super().save(*args, **kwargs)
+            recalcular_totales([self.alquiler_id])
+            return
+        else:
+            antes = self._en_db
+        super().save(*args, **kwargs)
+        despues = (self.alquiler_id, _subtotal(self.cantidad, self.precio_unit))
+
+        deltas = defaultdict(lambda: [0, Decimal('0')])
+        if antes is not None:
+            deltas[antes[0]][0] -= 1
+            deltas[antes[0]][1] -= antes[1]
+        deltas[despues[0]][0] += 1
+        deltas[despues[0]][1] += despues[1]
+        ajustar_totales(deltas)
+        self._en_db = despues
+
+    @transaction.atomic
+    def delete(self, *args, **kwargs):
+        antes = getattr(self, '_en_db', (self.alquiler_id, _subtotal(self.cantidad, self.precio_unit)))
+        res = super().delete(*args, **kwargs)
+        ajustar_totales({antes[0]: (-1, -antes[1])})
+        return res
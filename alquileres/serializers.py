@@ -1,6 +1,5 @@
 # alquileres/serializers.py
 from rest_framework import serializers
-from django.db.models import Count
 from .models import Alquiler, DetAlquiler
 
 class DetAlquilerSerializer(serializers.ModelSerializer):
@@ -8,12 +7,19 @@ class DetAlquilerSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = DetAlquiler
-        fields = ('id', 'alquiler', 'producto', 'producto_nombre', 'cantidad', 'precio_unit')
+        fields = ('id', 'alquiler', 'producto', 'producto_nombre', 'cantidad', 'precio_unit', 'version')
 
 class AlquilerSerializer(serializers.ModelSerializer):
-    items_count = serializers.IntegerField(read_only=True)
     items       = DetAlquilerSerializer(many=True, read_only=True)  # lista de ítems para “ver detalles”
 
     class Meta:
         model = Alquiler
-        fields = ('id', 'cliente', 'creado_en', 'items_count', 'items')
+        fields = ('id', 'cliente', 'cliente_nombre', 'creado_en', 'items_count', 'total', 'open_incidents',
+                  'version', 'items')
+
+    def validate(self, attrs):
+        # Con cliente cargado, el nombre se toma del Cliente (snapshot al guardar)
+        cliente = attrs.get('cliente')
+        if cliente is not None:
+            attrs['cliente_nombre'] = str(cliente)
+        return attrs
@@ -0,0 +1,29 @@
+# alquileres/tareas.py
+from django.db import transaction
+from django.db.models import Max, Min
+
+from jobs.registro import tarea
+from .models import Alquiler, desalineados, recalcular_totales
+
+
+@tarea('alquileres.recalcular_totales')
+def recalcular_totales_job(job):
+    """
+    Corrige items_count/total de los alquileres desalineados, por rangos de pk.
+    Los que ya están bien no se tocan (recalcular_totales sube version y
+    updated_at: daría 409 a las ediciones abiertas y los reenviaría en /api/sync/).
+    """
+    chunk = int(job.payload.get('chunk_size', 5000))
+    rango = Alquiler.objects.aggregate(desde=Min('pk'), hasta=Max('pk'))
+    if rango['desde'] is None:
+        return {'alquileres': 0}
+
+    total = 0
+    inicio, fin = rango['desde'], rango['hasta']
+    for desde in range(inicio, fin + 1, chunk):
+        with transaction.atomic():
+            mal = desalineados(Alquiler.objects.filter(pk__gte=desde, pk__lt=desde + chunk))
+            if mal:
+                total += recalcular_totales([d[0] for d in mal])
+        job.reportar_progreso((desde + chunk - inicio) * 100 // (fin - inicio + 1), f"{total} corregidos")
+    return {'alquileres': total}
@@ -1,3 +1,73 @@
+from decimal import Decimal
+
+from django.contrib.auth.models import User
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from jobs.registro import encolar
+from productos.models import Producto
+from .models import Alquiler, DetAlquiler
+from .tareas import recalcular_totales_job
+
+
+class RecalcularTotalesJobTests(TestCase):
+
+    def setUp(self):
+        producto = Producto.objects.create(nombre='Copa', categoria='cristaleria', precio=10, stock=50)
+        self.bien = Alquiler.objects.create(cliente_nombre='Ana')
+        self.mal = Alquiler.objects.create(cliente_nombre='Beto')
+        for alquiler in (self.bien, self.mal):
+            DetAlquiler.objects.create(alquiler=alquiler, producto=producto, cantidad=3, precio_unit=Decimal('2.50'))
+        Alquiler.objects.filter(pk=self.mal.pk).update(items_count=7, total=0)
+
+    def test_solo_toca_los_desalineados(self):
+        antes = Alquiler.objects.values_list('version', 'updated_at').get(pk=self.bien.pk)
+        job = encolar('alquileres.recalcular_totales', {'chunk_size': 1})
+        self.assertEqual(recalcular_totales_job(job), {'alquileres': 1})
+        self.assertEqual(Alquiler.objects.values_list('version', 'updated_at').get(pk=self.bien.pk), antes)
+        self.mal.refresh_from_db()
+        self.assertEqual((self.mal.items_count, self.mal.total), (1, Decimal('7.50')))
+
+
+class VersionadoTests(TestCase):
+
+    def setUp(self):
+        self.producto = Producto.objects.create(nombre='Copa', categoria='cristaleria', precio=10, stock=50)
+        self.alquiler = Alquiler.objects.create(cliente_nombre='Ana')
+        self.linea = DetAlquiler.objects.create(alquiler=self.alquiler, producto=self.producto,
+                                                cantidad=2, precio_unit=10)
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('ana', 'ana@empresa.com', 'clave'))
+        self.url = f'/api/alquileres/{self.alquiler.pk}/'
+
+    def _version(self):
+        return Alquiler.objects.values_list('version', flat=True).get(pk=self.alquiler.pk)
+
+    def test_if_match_viejo_da_409_con_el_estado_actual(self):
+        version = self._version()
+        resp = self.client.patch(self.url, {'cliente_nombre': 'Beto'}, format='json',
+                                 HTTP_IF_MATCH=f'"{version - 1}"')
+        self.assertEqual(resp.status_code, 409)
+        self.assertEqual(resp.json()['code'], 'version_conflict')
+        self.assertEqual(resp.json()['actual']['cliente_nombre'], 'Ana')
+        self.assertEqual(resp['ETag'], f'"{version}"')
+        self.assertEqual(self._version(), version)
+
+    def test_if_match_debil_se_acepta(self):
+        version = self._version()
+        resp = self.client.patch(self.url, {'cliente_nombre': 'Beto'}, format='json',
+                                 HTTP_IF_MATCH=f'W/"{version}"')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp['ETag'], f'"{version + 1}"')
+        self.assertEqual(self._version(), version + 1)
 
-# Create your tests here.
+    def test_editar_una_linea_sube_la_version_del_alquiler(self):
+        version = self._version()
+        resp = self.client.patch(f'/api/det-alquileres/{self.linea.pk}/', {'cantidad': 5}, format='json')
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(self._version(), version + 1)
+        # quien tenía abierto el alquiler con la versión anterior recibe 409
+        resp = self.client.patch(self.url, {'cliente_nombre': 'Beto'}, format='json',
+                                 HTTP_IF_MATCH=f'"{version}"')
+        self.assertEqual(resp.status_code, 409)
+        self.assertEqual(resp.json()['actual']['total'], '50.00')
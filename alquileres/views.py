@@ -1,38 +1,69 @@
 # alquileres/views.py
+from django.http import FileResponse
 from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.filters import OrderingFilter
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from django.db.models import Count
+from archivo.mixins import IncluirArchivadosMixin
+from archivo.models import AlquilerArchivado, DetAlquilerArchivado
+from myproject.db_router import ReplicaSafeMixin
+from myproject.renderers import PDFRenderer
+from myproject.sparse import SparseFieldsMixin
+from myproject.versionado import VersionadoMixin
+from . import comprobantes
 from .models import Alquiler, DetAlquiler
 from .serializers import AlquilerSerializer, DetAlquilerSerializer
 
-class AlquilerViewSet(viewsets.ModelViewSet):
+class AlquilerViewSet(ReplicaSafeMixin, VersionadoMixin, IncluirArchivadosMixin, SparseFieldsMixin,
+                      viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     serializer_class = AlquilerSerializer
+    # ?ordering=-total / items_count / creado_en (columnas propias, sin JOIN)
+    filter_backends = [OrderingFilter]
+    ordering_fields = ('creado_en', 'total', 'items_count')
+    ordering = ('-creado_en',)
+    throttle_scopes = {'comprobante': 'exportar'}
 
     def get_queryset(self):
-        # Si NO tienes related_name='items', usa Count('detalquiler') como plan B.
+        # items_count y total están denormalizados en Alquiler (no hace falta Count/GROUP BY)
         return (Alquiler.objects
-                .annotate(items_count=Count('items'))
+                .prefetch_related('items__producto')
+                .order_by('-creado_en'))
+
+    def get_archivados_queryset(self):
+        return (AlquilerArchivado.objects
                 .prefetch_related('items__producto')
                 .order_by('-creado_en'))
 
     def destroy(self, request, *args, **kwargs):
         instance = self.get_object()
         # PROHIBIR borrar si hay incidentes abiertos en cualquiera de sus detalles
-        from incidentes.models import Incidente
-        hay_abiertos = Incidente.objects.filter(
-            det_alquiler__alquiler=instance,
-            estado_incidente='abierto'
-        ).exists()
-        if hay_abiertos:
+        if instance.open_incidents > 0:
             return Response(
                 {"detail": "No puede borrarse: existen incidentes abiertos."},
                 status=status.HTTP_409_CONFLICT
             )
         return super().destroy(request, *args, **kwargs)
 
-class DetAlquilerViewSet(viewsets.ModelViewSet):
+    @action(detail=True, methods=['get'], url_path='comprobante.pdf', renderer_classes=[PDFRenderer])
+    def comprobante(self, request, pk=None):
+        """ PDF del alquiler (?tipo=remito: sin precios), cacheado en disco por contenido. """
+        tipo = request.query_params.get('tipo', 'comprobante')
+        if tipo not in comprobantes.TIPOS:
+            raise ValidationError({"tipo": f"Debe ser uno de: {', '.join(comprobantes.TIPOS)}."})
+        try:
+            archivo, _ = comprobantes.abrir_cacheado(int(pk), tipo)
+        except (ValueError, Alquiler.DoesNotExist):
+            raise NotFound()
+        return FileResponse(archivo, content_type='application/pdf',
+                             filename=f"{tipo}-{pk}.pdf", as_attachment=False)
+
+class DetAlquilerViewSet(VersionadoMixin, IncluirArchivadosMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = DetAlquiler.objects.select_related('alquiler', 'producto')
     serializer_class = DetAlquilerSerializer
     permission_classes = [IsAuthenticated]
+
+    def get_archivados_queryset(self):
+        return DetAlquilerArchivado.objects.select_related('alquiler', 'producto')
@@ -0,0 +1,43 @@
+# archivo/management/commands/archive.py
+import time
+from collections import Counter
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from archivo.mover import archivar_lote, candidatos
+
+
+class Command(BaseCommand):
+    help = ("Archiva alquileres sin incidentes abiertos anteriores a --older-than días "
+            "(con sus ítems e incidentes), por lotes cortos.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than', type=int, required=True, metavar='DIAS')
+        parser.add_argument('--lote', type=int, default=200, help='Alquileres por transacción')
+        parser.add_argument('--pausa', type=float, default=0.2,
+                            help='Segundos entre lotes (deja pasar a las escrituras normales)')
+        parser.add_argument('--max-lotes', type=int, default=None)
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **opts):
+        limite = timezone.now() - timedelta(days=opts['older_than'])
+        if opts['dry_run']:
+            self.stdout.write(f"Candidatos anteriores a {limite:%Y-%m-%d}: {candidatos(limite).count()}")
+            return
+
+        totales, lotes, desde = Counter(), 0, 0
+        while opts['max_lotes'] is None or lotes < opts['max_lotes']:
+            desde, movidos = archivar_lote(limite, opts['lote'], desde)
+            if desde is None:
+                break
+            totales.update(movidos)
+            lotes += 1
+            self.stdout.write(f"Lote {lotes}: {movidos['alquileres']} alquileres, "
+                              f"{movidos['items']} ítems, {movidos['incidentes']} incidentes")
+            time.sleep(opts['pausa'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Archivados {totales['alquileres']} alquileres, {totales['items']} ítems, "
+            f"{totales['incidentes']} incidentes en {lotes} lotes."))
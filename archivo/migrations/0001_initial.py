@@ -0,0 +1,67 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('clientes', '0002_cliente_updated_at'),
+        ('productos', '0006_producto_nombre_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AlquilerArchivado',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('cliente_nombre', models.CharField(blank=True, max_length=200)),
+                ('creado_en', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('open_incidents', models.PositiveIntegerField(default=0)),
+                ('items_count', models.PositiveIntegerField(default=0)),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('archivado_en', models.DateTimeField(auto_now_add=True)),
+                ('cliente', models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='alquileres_archivados', to='clientes.cliente')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DetAlquilerArchivado',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('cantidad', models.PositiveIntegerField()),
+                ('precio_unit', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('alquiler', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='archivo.alquilerarchivado')),
+                ('producto', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='detalles_archivados', to='productos.producto')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='IncidenteArchivado',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('fecha_incidente', models.DateTimeField()),
+                ('descripcion', models.TextField(blank=True)),
+                ('estado_incidente', models.CharField(choices=[('abierto', 'Abierto'), ('resuelto', 'Resuelto'), ('anulado', 'Anulado')], max_length=10)),
+                ('tipo_incidente', models.CharField(choices=[('irreparable', 'Daño irreparable (rotura, pérdida)'), ('reparable', 'Daño reparable (suciedad, arreglo)')], max_length=12)),
+                ('cantidad_afectada', models.PositiveIntegerField(default=1)),
+                ('fecha_resolucion', models.DateTimeField(blank=True, null=True)),
+                ('resultado_final', models.CharField(choices=[('sin_accion', 'Sin acción (no vuelve)'), ('reintegrado', 'Reintegrado al stock (reparado)'), ('repuesto', 'Repuesto por compra/alta')], max_length=20)),
+                ('cantidad_repuesta', models.PositiveIntegerField(default=0)),
+                ('det_alquiler', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='incidentes', to='archivo.detalquilerarchivado')),
+            ],
+            options={
+                'ordering': ['-fecha_incidente'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='alquilerarchivado',
+            index=models.Index(fields=['cliente', 'creado_en'], name='alq_arch_cliente_creado_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='alquilerarchivado',
+            index=models.Index(fields=['-creado_en'], name='alq_arch_creado_idx'),
+        ),
+    ]
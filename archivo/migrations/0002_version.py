@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('archivo', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='alquilerarchivado',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='detalquilerarchivado',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
@@ -0,0 +1,76 @@
+# archivo/mixins.py
+from django.db.models import BooleanField, F, Value
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from rest_framework.response import Response
+
+
+class IncluirArchivadosMixin:
+    """
+    Viewsets de lectura: con ?include_archived=1, list y retrieve también
+    consultan las tablas de archivo. Sin el parámetro no se toca el archivo.
+
+    La vista define get_archivados_queryset() sobre el modelo archivado
+    (mismos nombres de campo, así filter_queryset/ordering/?fields= aplican igual).
+
+    El listado combinado se ordena y pagina en la base: un UNION ALL de
+    (pk, archivado, claves de orden) de las dos tablas con ORDER BY/LIMIT, y
+    después se cargan solo los objetos de esa página, cada uno de su tabla.
+    """
+    archivado_param = 'include_archived'
+
+    def incluir_archivados(self):
+        return (self.action in ('list', 'retrieve')
+                and self.request.query_params.get(self.archivado_param) in ('1', 'true'))
+
+    def get_archivados_queryset(self):
+        raise NotImplementedError
+
+    def _claves(self, queryset, archivado, orden):
+        """ (pk, archivado, o0, o1, ...) del queryset, sin orden propio (va en el UNION). """
+        claves = {f'o{i}': F(campo.lstrip('-')) for i, campo in enumerate(orden)}
+        return (queryset.order_by()
+                .annotate(archivado=Value(archivado, output_field=BooleanField()), **claves)
+                .values_list('pk', 'archivado', *claves))
+
+    def list(self, request, *args, **kwargs):
+        if not self.incluir_archivados():
+            return super().list(request, *args, **kwargs)
+        vivos = self.filter_queryset(self.get_queryset())
+        archivados = self.filter_queryset(self.get_archivados_queryset())
+
+        orden = [c for c in (vivos.query.order_by or vivos.model._meta.ordering) if c not in ('pk', '-pk', '?')]
+        # desempate por pk, así la paginación es estable
+        orden_union = [f"{'-' if c.startswith('-') else ''}o{i}" for i, c in enumerate(orden)] + ['pk']
+        claves = (self._claves(vivos, False, orden)
+                  .union(self._claves(archivados, True, orden), all=True)
+                  .order_by(*orden_union))
+
+        page = self.paginate_queryset(claves)
+        filas = list(claves) if page is None else page
+        por_tabla = {False: [], True: []}
+        for pk, archivado, *_ in filas:
+            por_tabla[archivado].append(pk)
+        cargados = {
+            (archivado, obj.pk): obj
+            for archivado, qs in ((False, vivos), (True, archivados)) if por_tabla[archivado]
+            for obj in qs.filter(pk__in=por_tabla[archivado])
+        }
+        objetos = [cargados[(archivado, pk)] for pk, archivado, *_ in filas if (archivado, pk) in cargados]
+
+        serializer = self.get_serializer(objetos, many=True)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
+
+    def get_object(self):
+        try:
+            return super().get_object()
+        except Http404:
+            if not self.incluir_archivados():
+                raise
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        obj = get_object_or_404(self.filter_queryset(self.get_archivados_queryset()),
+                                **{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        self.check_object_permissions(self.request, obj)
+        return obj
@@ -0,0 +1,67 @@
+# archivo/models.py
+"""
+Tablas de archivo: alquileres cerrados viejos con sus ítems e incidentes
+(ver archivo/mover.py y `manage.py archive`).
+
+Mismos nombres de campo e ids que los modelos vivos, así los serializers de
+alquileres/incidentes sirven tal cual (?include_archived=1).
+"""
+from django.db import models
+
+from clientes.models import Cliente
+from incidentes.models import Incidente
+from productos.models import Producto
+
+
+class AlquilerArchivado(models.Model):
+    id             = models.BigIntegerField(primary_key=True)
+    cliente        = models.ForeignKey(Cliente, on_delete=models.PROTECT, related_name='alquileres_archivados',
+                                       null=True, blank=True, db_index=False)
+    cliente_nombre = models.CharField(max_length=200, blank=True)
+    creado_en      = models.DateTimeField()
+    updated_at     = models.DateTimeField()
+    open_incidents = models.PositiveIntegerField(default=0)
+    items_count    = models.PositiveIntegerField(default=0)
+    total          = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    version        = models.PositiveIntegerField(default=1)
+    archivado_en   = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['cliente', 'creado_en'], name='alq_arch_cliente_creado_idx'),
+            models.Index(fields=['-creado_en'], name='alq_arch_creado_idx'),
+        ]
+
+    def __str__(self):
+        return f'Alquiler #{self.pk} (archivado)'
+
+
+class DetAlquilerArchivado(models.Model):
+    id          = models.BigIntegerField(primary_key=True)
+    alquiler    = models.ForeignKey(AlquilerArchivado, on_delete=models.CASCADE, related_name='items')
+    producto    = models.ForeignKey(Producto, on_delete=models.PROTECT, related_name='detalles_archivados')
+    cantidad    = models.PositiveIntegerField()
+    precio_unit = models.DecimalField(max_digits=10, decimal_places=2)
+    version     = models.PositiveIntegerField(default=1)
+
+    def __str__(self):
+        return f'#{self.pk} · {self.producto_id} x{self.cantidad} (archivado)'
+
+
+class IncidenteArchivado(models.Model):
+    id                = models.BigIntegerField(primary_key=True)
+    det_alquiler      = models.ForeignKey(DetAlquilerArchivado, on_delete=models.CASCADE, related_name='incidentes')
+    fecha_incidente   = models.DateTimeField()
+    descripcion       = models.TextField(blank=True)
+    estado_incidente  = models.CharField(max_length=10, choices=Incidente.ESTADOS)
+    tipo_incidente    = models.CharField(max_length=12, choices=Incidente.TIPOS)
+    cantidad_afectada = models.PositiveIntegerField(default=1)
+    fecha_resolucion  = models.DateTimeField(null=True, blank=True)
+    resultado_final   = models.CharField(max_length=20, choices=Incidente.RESULTADOS)
+    cantidad_repuesta = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['-fecha_incidente']
+
+    def __str__(self):
+        return f"Incidente #{self.pk} {self.get_estado_incidente_display()} (archivado)"
@@ -0,0 +1,58 @@
+# archivo/mover.py
+"""
+Archivado por lotes: un alquiler se archiva entero (alquiler + ítems + incidentes)
+cuando es anterior al corte y no tiene incidentes abiertos. Así las FK quedan
+completas de cada lado: lo vivo nunca apunta al archivo ni al revés
+(salvo Producto/Cliente, que siguen vivos y quedan protegidos).
+
+Cada lote es una transacción corta; el comando `archive` pausa entre lotes.
+"""
+from django.db import transaction
+
+from alquileres.models import Alquiler, DetAlquiler
+from incidentes.models import Incidente
+from sincronizacion.models import Tombstone
+from .models import AlquilerArchivado, DetAlquilerArchivado, IncidenteArchivado
+
+
+def _columnas(modelo):
+    return [f.attname for f in modelo._meta.concrete_fields if f.name != 'archivado_en']
+
+
+def candidatos(limite):
+    return Alquiler.objects.filter(creado_en__lt=limite, open_incidents=0)
+
+
+@transaction.atomic
+def archivar_lote(limite, lote, desde_pk=0):
+    """
+    Mueve hasta `lote` alquileres con pk > desde_pk. Devuelve (último pk visto, contadores)
+    o (None, None) si no quedan candidatos.
+    """
+    ids = list(candidatos(limite).filter(pk__gt=desde_pk).order_by('pk').values_list('pk', flat=True)[:lote])
+    if not ids:
+        return None, None
+    ultimo = ids[-1]
+
+    # open_incidents es denormalizado: confirmar contra la tabla antes de mover
+    con_abiertos = set(Incidente.objects.filter(det_alquiler__alquiler_id__in=ids, estado_incidente='abierto')
+                       .values_list('det_alquiler__alquiler_id', flat=True))
+    ids = [i for i in ids if i not in con_abiertos]
+
+    item_ids = list(DetAlquiler.objects.filter(alquiler_id__in=ids).values_list('pk', flat=True))
+    incidente_ids = list(Incidente.objects.filter(det_alquiler_id__in=item_ids).values_list('pk', flat=True))
+    pasos = (
+        (Alquiler.objects.filter(pk__in=ids), AlquilerArchivado),
+        (DetAlquiler.objects.filter(pk__in=item_ids), DetAlquilerArchivado),
+        (Incidente.objects.filter(pk__in=incidente_ids), IncidenteArchivado),
+    )
+    for vivos, archivado in pasos:
+        archivado.objects.bulk_create(archivado(**fila) for fila in vivos.order_by().values(*_columnas(archivado)))
+
+    # DELETE directo de hijos a padres: sin señales ni ajuste de contadores
+    # (el alquiler sale entero); /api/sync/ se entera por tombstones en bloque.
+    for vivos, _ in reversed(pasos):
+        vivos._raw_delete(vivos.db)
+    Tombstone.objects.bulk_create(Tombstone(coleccion='alquileres', objeto_id=pk) for pk in ids)
+
+    return ultimo, {'alquileres': len(ids), 'items': len(item_ids), 'incidentes': len(incidente_ids)}
@@ -0,0 +1,78 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.test import APIClient
+
+from alquileres.models import Alquiler, DetAlquiler
+from alquileres.views import AlquilerViewSet
+from incidentes.models import Incidente
+from productos.models import Producto
+from sincronizacion.models import Tombstone
+from .models import AlquilerArchivado, DetAlquilerArchivado, IncidenteArchivado
+from .mover import archivar_lote
+
+
+class ArchivoTests(TestCase):
+
+    def setUp(self):
+        producto = Producto.objects.create(nombre='Copa', categoria='cristaleria', precio=10, stock=50)
+        ahora = timezone.now()
+        self.alquileres = []
+        for dias in (40, 30, 20, 1):
+            alquiler = Alquiler.objects.create(cliente_nombre=f'Hace {dias} días')
+            DetAlquiler.objects.create(alquiler=alquiler, producto=producto, cantidad=2, precio_unit=10)
+            Alquiler.objects.filter(pk=alquiler.pk).update(creado_en=ahora - timedelta(days=dias))
+            self.alquileres.append(alquiler.pk)
+        self.viejo, self.resuelto, self.abierto, self.nuevo = self.alquileres
+        Incidente.objects.create(det_alquiler=DetAlquiler.objects.get(alquiler_id=self.resuelto),
+                                 estado_incidente='resuelto', resultado_final='reintegrado')
+        Incidente.objects.create(det_alquiler=DetAlquiler.objects.get(alquiler_id=self.abierto))
+        self.corte = ahora - timedelta(days=10)
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('ana', 'ana@empresa.com', 'clave'))
+
+    def test_no_archiva_alquileres_con_incidentes_abiertos(self):
+        # aunque el contador denormalizado diga 0, se confirma contra la tabla
+        Alquiler.objects.filter(pk=self.abierto).update(open_incidents=0)
+        _, contadores = archivar_lote(self.corte, lote=10)
+        self.assertEqual(contadores, {'alquileres': 2, 'items': 2, 'incidentes': 1})
+        self.assertCountEqual(Alquiler.objects.values_list('pk', flat=True), [self.abierto, self.nuevo])
+        self.assertCountEqual(AlquilerArchivado.objects.values_list('pk', flat=True), [self.viejo, self.resuelto])
+        self.assertEqual(DetAlquilerArchivado.objects.count(), 2)
+        self.assertEqual(IncidenteArchivado.objects.get().estado_incidente, 'resuelto')
+        self.assertEqual(Incidente.objects.get().estado_incidente, 'abierto')
+
+    def test_escribe_tombstones_de_los_archivados(self):
+        archivar_lote(self.corte, lote=10)
+        self.assertCountEqual(Tombstone.objects.filter(coleccion='alquileres').values_list('objeto_id', flat=True),
+                              [self.viejo, self.resuelto])
+
+    def test_listado_con_archivados_pagina_en_orden(self):
+        archivar_lote(self.corte, lote=10)
+        with mock.patch.object(AlquilerViewSet, 'pagination_class', LimitOffsetPagination):
+            for orden, esperado in (('-creado_en', [self.nuevo, self.abierto, self.resuelto, self.viejo]),
+                                    ('creado_en', [self.viejo, self.resuelto, self.abierto, self.nuevo])):
+                ids = []
+                for offset in (0, 2):
+                    resp = self.client.get('/api/alquileres/', {'include_archived': 1, 'ordering': orden,
+                                                                'limit': 2, 'offset': offset})
+                    self.assertEqual(resp.status_code, 200)
+                    self.assertEqual(resp.json()['count'], 4)
+                    ids += [a['id'] for a in resp.json()['results']]
+                self.assertEqual(ids, esperado)
+            # sin el parámetro no se toca el archivo
+            resp = self.client.get('/api/alquileres/', {'limit': 10})
+            self.assertEqual([a['id'] for a in resp.json()['results']], [self.nuevo, self.abierto])
+
+    def test_retrieve_cae_al_archivo(self):
+        archivar_lote(self.corte, lote=10)
+        url = f'/api/alquileres/{self.viejo}/'
+        self.assertEqual(self.client.get(url).status_code, 404)
+        resp = self.client.get(url, {'include_archived': 1})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual((resp.json()['id'], resp.json()['total']), (self.viejo, '20.00'))
+        self.assertEqual(len(resp.json()['items']), 1)
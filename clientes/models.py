@@ -11,6 +11,8 @@ class Cliente(models.Model):
   notas      = models.TextField(blank=True)
   activo     = models.BooleanField(default=True)
   creado_en  = models.DateTimeField(auto_now_add=True)
+  # Última modificación (delta-sync, /api/sync/)
+  updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
   def __str__(self):
       return f"{self.nombre} {self.apellido}".strip()
@@ -5,3 +5,11 @@ class ClienteSerializer(serializers.ModelSerializer):
     class Meta:
         model = Cliente
         fields = '__all__'
+
+
+class ResumenClienteSerializer(serializers.Serializer):
+    """ Agregados de alquileres por cliente (ver clientes.views.resumen_alquileres) """
+    cliente         = serializers.IntegerField()
+    alquileres      = serializers.IntegerField()
+    total_facturado = serializers.DecimalField(max_digits=14, decimal_places=2)
+    ultimo_alquiler = serializers.DateTimeField(allow_null=True)
@@ -1,15 +1,76 @@
 # clientes/views.py
 from rest_framework import viewsets
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from rest_framework.response import Response
+from decimal import Decimal
+from django.db.models import Count, DecimalField, Max, Sum, Value
+from django.db.models.functions import Coalesce
+from myproject.db_router import ReplicaSafeMixin
+from myproject.sparse import SparseFieldsMixin
+from alquileres.models import Alquiler
+from alquileres.serializers import AlquilerSerializer
+from archivo.models import AlquilerArchivado
 from .models import Cliente
-from .serializers import ClienteSerializer
+from .serializers import ClienteSerializer, ResumenClienteSerializer
 
-class ClienteViewSet(viewsets.ModelViewSet):
+
+def _agregados(qs):
+    return (qs.filter(cliente__isnull=False)
+              .values('cliente')
+              .annotate(alquileres=Count('id'),
+                        total_facturado=Coalesce(Sum('total'), Value(Decimal('0')),
+                                                 output_field=DecimalField(max_digits=14, decimal_places=2)),
+                        ultimo_alquiler=Max('creado_en'))
+              .order_by('cliente'))
+
+
+def resumen_alquileres(**filtros):
+    """
+    Agregados por cliente: cantidad de alquileres, total facturado y fecha del último.
+    Una consulta agrupada sobre los vivos y otra sobre el archivo (archivar no
+    cambia el resumen); se combinan por cliente.
+    """
+    resumen = {r['cliente']: r for r in _agregados(Alquiler.objects.filter(**filtros))}
+    for r in _agregados(AlquilerArchivado.objects.filter(**filtros)):
+        vivo = resumen.setdefault(r['cliente'], r)
+        if vivo is not r:
+            vivo['alquileres'] += r['alquileres']
+            vivo['total_facturado'] += r['total_facturado']
+            vivo['ultimo_alquiler'] = max(vivo['ultimo_alquiler'], r['ultimo_alquiler'])
+    return [resumen[c] for c in sorted(resumen)]
+
+
+class ClienteViewSet(ReplicaSafeMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Cliente.objects.order_by('-creado_en')
     serializer_class = ClienteSerializer
+    replica_actions = ('list', 'alquileres', 'resumen')
+    throttle_scopes = {'resumen': 'reporte'}
 
     def get_permissions(self):
         # leer SIEMPRE autenticado; crear también autenticado; editar/borrar solo admin
-        if self.action in ['list', 'retrieve', 'create']:
+        if self.action in ['list', 'retrieve', 'create', 'alquileres', 'resumen']:
             return [IsAuthenticated()]
         return [IsAuthenticated(), IsAdminUser()]
+
+    @action(detail=True, methods=['get'])
+    def alquileres(self, request, pk=None):
+        """ Historial de alquileres del cliente (índice cliente_id, creado_en) + resumen. """
+        cliente = self.get_object()
+        qs = (Alquiler.objects
+              .filter(cliente=cliente)
+              .prefetch_related('items__producto')
+              .order_by('-creado_en'))
+        resumen = next(iter(resumen_alquileres(cliente=cliente)), None) or {
+            "cliente": cliente.pk, "alquileres": 0, "total_facturado": Decimal('0.00'), "ultimo_alquiler": None,
+        }
+        return Response({
+            "cliente": cliente.pk,
+            "resumen": ResumenClienteSerializer(resumen).data,
+            "alquileres": AlquilerSerializer(qs, many=True, context=self.get_serializer_context()).data,
+        })
+
+    @action(detail=False, methods=['get'])
+    def resumen(self, request):
+        """ Agregados de todos los clientes (una consulta agrupada por tabla). """
+        return Response(ResumenClienteSerializer(resumen_alquileres(), many=True).data)
@@ -0,0 +1,52 @@
+# dashboard/management/commands/reporte_productos.py
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from dashboard.reportes import np, parse_agrupar, reporte_numpy, reporte_sql
+
+
+class Command(BaseCommand):
+    help = "Genera el reporte de productos; con --verificar compara el motor NumPy contra el SQL."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--desde')
+        parser.add_argument('--hasta')
+        parser.add_argument('--agrupar', default='categoria')
+        parser.add_argument('--verificar', action='store_true')
+
+    def handle(self, *args, **opts):
+        try:
+            hasta = parse_date(opts['hasta']) if opts['hasta'] else timezone.localdate()
+            desde = parse_date(opts['desde']) if opts['desde'] else hasta - timedelta(days=365)
+        except (TypeError, ValueError):
+            desde = hasta = None
+        if not desde or not hasta:
+            raise CommandError("Fechas inválidas (YYYY-MM-DD).")
+        try:
+            dims = parse_agrupar(opts['agrupar'])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        t0 = time.perf_counter()
+        por_sql = reporte_sql(desde, hasta, dims)
+        t_sql = time.perf_counter() - t0
+
+        if np is None:
+            filas = por_sql
+            self.stdout.write("NumPy no instalado: se usa el motor SQL.")
+        else:
+            t0 = time.perf_counter()
+            filas = reporte_numpy(desde, hasta, dims)
+            t_np = time.perf_counter() - t0
+            self.stdout.write(f"SQL: {t_sql * 1000:.1f} ms · NumPy: {t_np * 1000:.1f} ms")
+            if opts['verificar'] and filas != por_sql:
+                raise CommandError("El motor NumPy no coincide con el SQL.")
+
+        for fila in filas:
+            self.stdout.write(str(fila))
+        if opts['verificar'] and np is not None:
+            self.stdout.write(self.style.SUCCESS(f"OK: {len(filas)} filas idénticas."))
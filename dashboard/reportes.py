@@ -0,0 +1,238 @@
+# dashboard/reportes.py
+"""
+Reporte de utilización y facturación de productos.
+
+Métricas por grupo (categoria / producto / mes, o combinaciones):
+  unidades, ingresos, veces_alquilado, incidentes por tipo_incidente,
+  tasa de incidentes (incidentes / veces_alquilado) y rotación (veces_alquilado / stock).
+
+Motor columnar: se leen las columnas una sola vez con values_list().iterator(),
+se pasan a arrays de NumPy y se agrega vectorizado (np.unique + bincount/reduceat).
+Los montos se manejan en centavos (int64) para que el resultado sea exacto.
+Sin NumPy instalado se usa el equivalente SQL (reporte_sql), que da lo mismo.
+
+Se leen las tablas vivas y las de archivo (archivo/models.py): archivar
+alquileres viejos no cambia los reportes de esos períodos.
+"""
+from itertools import chain
+from datetime import date
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import TruncMonth
+
+from alquileres.models import DetAlquiler
+from archivo.models import DetAlquilerArchivado, IncidenteArchivado
+from incidentes.models import Incidente
+from productos.models import Producto
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depende del entorno
+    np = None
+
+DIMENSIONES = ('categoria', 'producto', 'mes')
+TIPOS = tuple(t for t, _ in Incidente.TIPOS)
+CATEGORIAS = tuple(c for c, _ in Producto.CATEGORIAS)
+CENTAVO = Decimal('0.01')
+# (líneas, incidentes): vivos y archivados, mismos nombres de campo e ids disjuntos
+TABLAS = ((DetAlquiler, Incidente), (DetAlquilerArchivado, IncidenteArchivado))
+
+
+def parse_agrupar(valor):
+    """ 'categoria,mes' -> ('categoria', 'mes') en orden canónico. Lanza ValueError. """
+    pedidas = {v.strip() for v in (valor or 'categoria').split(',') if v.strip()}
+    invalidas = pedidas - set(DIMENSIONES)
+    if invalidas or not pedidas:
+        raise ValueError(f"agrupar inválido: {', '.join(sorted(invalidas)) or valor!r}. "
+                         f"Opciones: {', '.join(DIMENSIONES)}")
+    return tuple(d for d in DIMENSIONES if d in pedidas)
+
+
+def _lineas(desde, hasta, modelo=DetAlquiler):
+    return (modelo.objects
+            .filter(alquiler__creado_en__date__gte=desde, alquiler__creado_en__date__lte=hasta)
+            .annotate(mes=TruncMonth('alquiler__creado_en')))
+
+
+def _incidentes(desde, hasta, modelo=Incidente):
+    return (modelo.objects
+            .order_by()
+            .filter(det_alquiler__alquiler__creado_en__date__gte=desde,
+                    det_alquiler__alquiler__creado_en__date__lte=hasta)
+            .annotate(mes=TruncMonth('det_alquiler__alquiler__creado_en')))
+
+
+def _stock_y_nombres():
+    stock_prod, stock_cat, nombres = {}, dict.fromkeys(CATEGORIAS, 0), {}
+    for pk, nombre, categoria, stock in Producto.objects.values_list('pk', 'nombre', 'categoria', 'stock'):
+        stock_prod[pk] = stock
+        stock_cat[categoria] = stock_cat.get(categoria, 0) + stock
+        nombres[pk] = nombre
+    return stock_prod, stock_cat, nombres
+
+
+def _filas(dims, datos):
+    """
+    datos: {clave: (unidades, ingresos_centavos, veces, [incidentes por TIPOS])}
+    clave: tupla con los valores de `dims` (producto=id, categoria=str, mes='YYYY-MM').
+    """
+    stock_prod, stock_cat, nombres = _stock_y_nombres()
+    stock_total = sum(stock_prod.values())
+    filas = []
+    for clave in sorted(datos):
+        unidades, centavos, veces, incs = datos[clave]
+        veces, incs = int(veces), [int(n) for n in incs]
+        fila = dict(zip(dims, clave))
+        if 'producto' in dims:
+            fila['producto_nombre'] = nombres.get(fila['producto'], '')
+            stock = stock_prod.get(fila['producto'], 0)
+        elif 'categoria' in dims:
+            stock = stock_cat.get(fila['categoria'], 0)
+        else:
+            stock = stock_total
+        fila.update({
+            'unidades': int(unidades),
+            'ingresos': (Decimal(int(centavos)) / 100).quantize(CENTAVO),
+            'veces_alquilado': veces,
+            'incidentes': dict(zip(TIPOS, incs)),
+            'tasa_incidentes': {t: round(n / veces, 4) if veces else None for t, n in zip(TIPOS, incs)},
+            'rotacion': round(veces / stock, 4) if stock else None,
+        })
+        filas.append(fila)
+    return filas
+
+
+def _mes_str(mes):
+    return mes.strftime('%Y-%m') if mes else None
+
+
+# ---------------------------------------------------------------------------
+# Motor NumPy
+# ---------------------------------------------------------------------------
+def reporte_numpy(desde, hasta, dims):
+    cat_idx = {c: i for i, c in enumerate(CATEGORIAS)}
+    tipo_idx = {t: i for i, t in enumerate(TIPOS)}
+
+    # 1) columnas de las líneas del período (una sola pasada por tabla)
+    ids, prods, cats, meses, cants, precios = [], [], [], [], [], []
+    filas = chain.from_iterable(
+        _lineas(desde, hasta, lineas)
+        .order_by('pk')
+        .values_list('pk', 'producto_id', 'producto__categoria', 'mes', 'cantidad', 'precio_unit')
+        .iterator(chunk_size=5000)
+        for lineas, _ in TABLAS
+    )
+    mes_codigos = {}
+    for pk, prod, cat, mes, cant, precio in filas:
+        ids.append(pk)
+        prods.append(prod)
+        cats.append(cat_idx.get(cat, -1))
+        meses.append(mes_codigos.setdefault(_mes_str(mes), len(mes_codigos)))
+        cants.append(cant)
+        precios.append(int(precio * 100))
+    if not ids:
+        return []
+
+    # cada tabla viene ordenada por pk; juntas se reordenan para el searchsorted del paso 3
+    ids = np.asarray(ids, dtype=np.int64)
+    por_pk = np.argsort(ids, kind='stable')
+    ids = ids[por_pk]
+    cants = np.asarray(cants, dtype=np.int64)[por_pk]
+    centavos = cants * np.asarray(precios, dtype=np.int64)[por_pk]
+    columnas = {
+        'producto': np.asarray(prods, dtype=np.int64)[por_pk],
+        'categoria': np.asarray(cats, dtype=np.int64)[por_pk],
+        'mes': np.asarray(meses, dtype=np.int64)[por_pk],
+    }
+
+    # 2) grupos: una fila por combinación de dimensiones
+    claves, inv = np.unique(np.column_stack([columnas[d] for d in dims]), axis=0, return_inverse=True)
+    inv = inv.ravel()
+    n_grupos = len(claves)
+
+    veces = np.bincount(inv, minlength=n_grupos)
+    orden = np.argsort(inv, kind='stable')
+    cortes = np.concatenate(([0], np.cumsum(veces)[:-1]))
+    unidades = np.add.reduceat(cants[orden], cortes)
+    ingresos = np.add.reduceat(centavos[orden], cortes)
+
+    # 3) incidentes: se ubican por det_alquiler_id dentro de `ids` (ordenado)
+    incs = np.zeros((n_grupos, len(TIPOS)), dtype=np.int64)
+    det_ids, tipos = [], []
+    incidentes = chain.from_iterable(
+        _incidentes(desde, hasta, modelo).values_list('det_alquiler_id', 'tipo_incidente').iterator()
+        for _, modelo in TABLAS
+    )
+    for det_id, tipo in incidentes:
+        if tipo in tipo_idx:
+            det_ids.append(det_id)
+            tipos.append(tipo_idx[tipo])
+    if det_ids:
+        det_ids = np.asarray(det_ids, dtype=np.int64)
+        pos = np.minimum(np.searchsorted(ids, det_ids), len(ids) - 1)
+        ok = ids[pos] == det_ids   # por si cambió algo entre las dos lecturas
+        incs = np.bincount(inv[pos[ok]] * len(TIPOS) + np.asarray(tipos, dtype=np.int64)[ok],
+                           minlength=n_grupos * len(TIPOS)).reshape(n_grupos, len(TIPOS))
+
+    # 4) decodificar claves
+    mes_de_codigo = {v: k for k, v in mes_codigos.items()}
+    decodificar = {
+        'producto': int,
+        'categoria': lambda c: CATEGORIAS[c] if c >= 0 else None,
+        'mes': lambda c: mes_de_codigo[int(c)],
+    }
+    datos = {}
+    for g, clave in enumerate(claves):
+        k = tuple(decodificar[d](v) for d, v in zip(dims, clave))
+        datos[k] = (unidades[g], ingresos[g], veces[g], incs[g])
+    return _filas(dims, datos)
+
+
+# ---------------------------------------------------------------------------
+# Equivalente SQL (referencia / fallback)
+# ---------------------------------------------------------------------------
+def reporte_sql(desde, hasta, dims):
+    campos = {'producto': 'producto_id', 'categoria': 'producto__categoria', 'mes': 'mes'}
+    campos_inc = {'producto': 'det_alquiler__producto_id', 'categoria': 'det_alquiler__producto__categoria',
+                  'mes': 'mes'}
+
+    def _clave(row, mapa):
+        return tuple(_mes_str(row[mapa[d]]) if d == 'mes' else row[mapa[d]] for d in dims)
+
+    # una consulta agrupada por tabla; los grupos de vivos y archivados se suman acá
+    por_clave, datos = {}, {}
+    for lineas, incidentes in TABLAS:
+        incs = (_incidentes(desde, hasta, incidentes)
+                .values(*[campos_inc[d] for d in dims])
+                .annotate(**{f'inc_{t}': Count('pk', filter=Q(tipo_incidente=t)) for t in TIPOS}))
+        for r in incs:
+            previos = por_clave.get(_clave(r, campos_inc), [0] * len(TIPOS))
+            por_clave[_clave(r, campos_inc)] = [n + r[f'inc_{t}'] for n, t in zip(previos, TIPOS)]
+
+        grupos = (_lineas(desde, hasta, lineas)
+                  .values(*[campos[d] for d in dims])
+                  .annotate(unidades=Sum('cantidad'),
+                            ingresos=Sum(F('cantidad') * F('precio_unit')),
+                            veces=Count('pk'))
+                  .order_by())
+        for r in grupos:
+            k = _clave(r, campos)
+            centavos = (Decimal(r['ingresos']) * 100).quantize(Decimal(1))
+            unidades, previos, veces, _ = datos.get(k, (0, 0, 0, None))
+            datos[k] = (unidades + r['unidades'], previos + centavos, veces + r['veces'], None)
+
+    datos = {k: (u, c, v, por_clave.get(k, [0] * len(TIPOS))) for k, (u, c, v, _) in datos.items()}
+    return _filas(dims, datos)
+
+
+def reporte_productos(desde: date, hasta: date, dims, usar_cache=True):
+    """ Punto de entrada: motor NumPy si está disponible, cacheado por período. """
+    motor = reporte_numpy if np is not None else reporte_sql
+    if not usar_cache:
+        return motor(desde, hasta, dims)
+    key = f"reportes:productos:{desde.isoformat()}:{hasta.isoformat()}:{','.join(dims)}"
+    ttl = getattr(settings, 'REPORTES_CACHE_TTL', 300)
+    return cache.get_or_set(key, lambda: motor(desde, hasta, dims), timeout=ttl)
@@ -0,0 +1,23 @@
+# dashboard/tareas.py
+from datetime import timedelta
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from jobs.registro import tarea
+from .reportes import parse_agrupar, reporte_productos
+
+
+@tarea('reportes.productos')
+def reporte_productos_job(job):
+    """ Precalcula el reporte de productos; el resultado queda en job.resultado. """
+    hasta = parse_date(job.payload.get('hasta') or '') or timezone.localdate()
+    desde = parse_date(job.payload.get('desde') or '') or hasta - timedelta(days=365)
+    dims = parse_agrupar(job.payload.get('agrupar'))
+    job.reportar_progreso(10, 'Calculando')
+    return {
+        'desde': desde,
+        'hasta': hasta,
+        'agrupar': list(dims),
+        'resultados': reporte_productos(desde, hasta, dims),
+    }
@@ -3,9 +3,20 @@ from django.shortcuts import render
 # Create your views here.
 from rest_framework.views import APIView
 from rest_framework.response import Response
+import json
+from datetime import timedelta
+from django.http import FileResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.permissions import IsAuthenticated
+from myproject.db_router import ReplicaSafeMixin
+from empleados.permissions import EsUsuarioAdministrador
+from myproject.profiler import listar_perfiles, ruta_perfil
+from myproject.throttling import almacen, contadores_rechazos
+from .reportes import parse_agrupar, reporte_productos
 
-class MetricsSummaryView(APIView):
+class MetricsSummaryView(ReplicaSafeMixin, APIView):
     permission_classes = [IsAuthenticated]
     def get(self, request):
         # TODO: reemplace con consultas reales
@@ -16,7 +27,7 @@ class MetricsSummaryView(APIView):
             "incidentes_abiertos": 2,
         })
 
-class RecentActivityView(APIView):
+class RecentActivityView(ReplicaSafeMixin, APIView):
     permission_classes = [IsAuthenticated]
     def get(self, request):
         # TODO: reemplace con datos reales
@@ -25,3 +36,76 @@ class RecentActivityView(APIView):
             {"tone":"warn", "title":"Incidente reportado", "ref":"#A0897", "time":"Hace 30 minutos", "badge":"Alta prioridad"},
         ]
         return Response({"items": items})
+
+
+class ReporteProductosView(ReplicaSafeMixin, APIView):
+    """
+    GET /api/reportes/productos/?desde=YYYY-MM-DD&hasta=YYYY-MM-DD&agrupar=categoria|producto|mes
+    (agrupar admite combinaciones separadas por coma, p.ej. categoria,mes)
+    """
+    permission_classes = [IsAuthenticated, EsUsuarioAdministrador]
+    throttle_scope = 'reporte'
+
+    def _fecha(self, nombre, default):
+        valor = self.request.query_params.get(nombre)
+        if not valor:
+            return default
+        try:
+            fecha = parse_date(valor)
+        except ValueError:
+            fecha = None
+        if fecha is None:
+            raise ValidationError({nombre: "Fecha inválida (formato YYYY-MM-DD)."})
+        return fecha
+
+    def get(self, request):
+        hasta = self._fecha('hasta', timezone.localdate())
+        desde = self._fecha('desde', hasta - timedelta(days=365))
+        if desde > hasta:
+            raise ValidationError({"desde": "No puede ser posterior a 'hasta'."})
+        try:
+            dims = parse_agrupar(request.query_params.get('agrupar'))
+        except ValueError as exc:
+            raise ValidationError({"agrupar": str(exc)})
+
+        return Response({
+            "desde": desde,
+            "hasta": hasta,
+            "agrupar": list(dims),
+            "resultados": reporte_productos(desde, hasta, dims),
+        })
+
+
+class PerfilesView(APIView):
+    """ GET /api/perfiles/ -> capturas del profiler (myproject/profiler.py), más nuevas primero. """
+    permission_classes = [IsAuthenticated, EsUsuarioAdministrador]
+
+    def get(self, request):
+        return Response(listar_perfiles())
+
+
+class PerfilDetalleView(APIView):
+    """
+    GET /api/perfiles/<id>/         -> metadata + línea de tiempo SQL
+    GET /api/perfiles/<id>/folded/  -> stacks colapsados (flamegraph.pl / speedscope)
+    """
+    permission_classes = [IsAuthenticated, EsUsuarioAdministrador]
+
+    def get(self, request, perfil_id, formato='json'):
+        ruta = ruta_perfil(perfil_id, '.folded' if formato == 'folded' else '.json')
+        if ruta is None:
+            raise NotFound("Perfil inexistente (puede haber rotado).")
+        if formato == 'folded':
+            response = FileResponse(open(ruta, 'rb'), content_type='text/plain; charset=utf-8')
+            response['Content-Disposition'] = f'attachment; filename="{perfil_id}.folded"'
+            return response
+        with open(ruta, encoding='utf-8') as f:
+            return Response(json.load(f))
+
+
+class ThrottleEstadoView(APIView):
+    """ GET /api/metrics/throttle/ -> rechazos por scope desde que existe el almacén de buckets. """
+    permission_classes = [IsAuthenticated, EsUsuarioAdministrador]
+
+    def get(self, request):
+        return Response({"almacen": almacen().nombre, "rechazos": contadores_rechazos()})
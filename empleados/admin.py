@@ -3,10 +3,12 @@ from django.contrib import admin
 # Register your models here.
 # empleados/admin.py
 from django.contrib import admin
+from myproject.admin_rendimiento import ModelAdminRapido
 from .models import Empleado
 
 @admin.register(Empleado)
-class EmpleadoAdmin(admin.ModelAdmin):
+class EmpleadoAdmin(ModelAdminRapido):
     list_display  = ('id_empleados', 'apellido', 'nombre', 'dni', 'telefono', 'fecha_ingreso', 'fecha_egreso', 'activo')
     list_filter   = ('activo', 'fecha_ingreso', 'fecha_egreso')
-    search_fields = ('apellido', 'nombre', 'dni')
+    search_fields = ('^apellido', '^nombre', '=dni')
+    raw_id_fields = ('usuario',)
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class EmpleadosConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'empleados'
+
+    def ready(self):
+        # receivers que revocan tokens al dar de baja
+        from . import senales  # noqa: F401
@@ -21,3 +21,15 @@ class Empleado(models.Model):
 
     def __str__(self):
         return f"{self.apellido}, {self.nombre} ({self.dni})"
+
+    @property
+    def de_baja(self):
+        return not self.activo or self.fecha_egreso is not None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # estado "de base" para revocar tokens solo al pasar a baja (empleados/senales.py)
+        instance._de_baja_en_db = (not instance.__dict__.get('activo', True)
+                                   or instance.__dict__.get('fecha_egreso') is not None)
+        return instance
@@ -0,0 +1,14 @@
+# empleados/senales.py
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from accounts.revocacion import revocar_usuario
+from .models import Empleado
+
+
+@receiver(post_save, sender=Empleado)
+def empleado_guardado(sender, instance: Empleado, created: bool, **kwargs):
+    """ Baja (activo=False o fecha_egreso) => sus JWT dejan de valer. """
+    if instance.de_baja and not getattr(instance, '_de_baja_en_db', False):
+        revocar_usuario(instance.usuario_id)
+    instance._de_baja_en_db = instance.de_baja
@@ -36,6 +36,8 @@ class EmpleadoSerializer(serializers.ModelSerializer):
             'rol', 'rol_display',
         )
         read_only_fields = ('id', 'id_empleados', 'rol', 'rol_display')
+        # columnas que usan los SerializerMethodField (para ?fields=, ver myproject/sparse.py)
+        columnas_de = {'rol': ('usuario__perfil__rol',), 'rol_display': ('usuario__perfil__rol',)}
 
     def get_rol(self, obj):
         perfil = getattr(obj.usuario, 'perfil', None)
@@ -1,6 +1,7 @@
 from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
 
+from myproject.sparse import SparseFieldsMixin
 from .models import Empleado
 from .permissions import EsUsuarioAdministrador
 from .serializers import (
@@ -10,7 +11,7 @@ from .serializers import (
 )
 
 
-class EmpleadoViewSet(viewsets.ModelViewSet):
+class EmpleadoViewSet(SparseFieldsMixin, viewsets.ModelViewSet):
     """
     CRUD de empleados.
     - Lista/Detalle devuelven EmpleadoSerializer (incluye 'id' para el frontend)
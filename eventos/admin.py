@@ -0,0 +1,9 @@
+# eventos/admin.py
+from django.contrib import admin
+from .models import Evento
+
+@admin.register(Evento)
+class EventoAdmin(admin.ModelAdmin):
+    list_display = ('id', 'tipo', 'creado_en')
+    list_filter = ('tipo',)
+    readonly_fields = ('tipo', 'datos', 'creado_en')
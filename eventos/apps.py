@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class EventosConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'eventos'
+
+    def ready(self):
+        # receivers que publican cambios de incidentes/alquileres/stock
+        from . import senales  # noqa: F401
@@ -0,0 +1,104 @@
+# eventos/broadcaster.py
+"""
+Eventos de cambio en tiempo real (SSE).
+
+publicar(tipo, datos)
+    Inserta un Evento al confirmarse la transacción. La tabla hace de canal
+    entre procesos: funciona igual con 1 o N workers ASGI, sin Redis.
+
+Broadcaster (uno por proceso/event loop)
+    Una sola tarea lee la tabla cada EVENTOS_POLL_INTERVAL segundos
+    (id > último visto) y reparte a la cola de cada conexión abierta.
+    Las conexiones no consultan la base: esperan en su cola (conexión ociosa barata).
+    Sin conexiones, la tarea se detiene.
+"""
+import asyncio
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import Evento
+
+COLA_MAX = 200      # eventos pendientes por conexión; si se llena, el cliente debe resincronizar
+LOTE_MAX = 500      # filas por lectura de la tabla
+
+
+def publicar(tipo, datos=None):
+    """ Publica un evento cuando (y si) se confirma la transacción actual. """
+    def _insertar():
+        evento = Evento.objects.create(tipo=tipo, datos=datos or {})
+        # limpieza ocasional: la tabla solo sirve para fan-out y reconexiones recientes
+        if evento.pk % 500 == 0:
+            horas = getattr(settings, 'EVENTOS_RETENCION_HORAS', 24)
+            Evento.objects.filter(creado_en__lt=timezone.now() - timedelta(hours=horas)).delete()
+    transaction.on_commit(_insertar)
+
+
+def publicar_varios(eventos):
+    """ [(tipo, datos), ...] en un solo INSERT al confirmarse la transacción (operaciones masivas). """
+    if eventos:
+        transaction.on_commit(lambda: Evento.objects.bulk_create(
+            [Evento(tipo=tipo, datos=datos or {}) for tipo, datos in eventos]))
+
+
+def eventos_desde(ultimo_id, limite=LOTE_MAX):
+    return list(Evento.objects.filter(pk__gt=ultimo_id).order_by('pk')
+                .values('id', 'tipo', 'datos')[:limite])
+
+
+def ultimo_id():
+    return Evento.objects.aggregate(m=Max('pk'))['m'] or 0
+
+
+class Broadcaster:
+    def __init__(self):
+        self._colas = set()
+        self._tarea = None
+        self._loop = None
+        self.ultimo = None
+
+    async def suscribir(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # otro event loop (tests, recarga): empezar de cero
+            self._colas, self._tarea, self._loop = set(), None, loop
+        if self._tarea is None or self._tarea.done():
+            ultimo = await sync_to_async(ultimo_id)()
+            if self._tarea is None or self._tarea.done():   # otra conexión pudo arrancarla mientras
+                self.ultimo = ultimo
+                self._tarea = loop.create_task(self._leer_tabla())
+        cola = asyncio.Queue(maxsize=COLA_MAX)
+        self._colas.add(cola)
+        return cola
+
+    def desuscribir(self, cola):
+        self._colas.discard(cola)
+
+    async def _leer_tabla(self):
+        intervalo = getattr(settings, 'EVENTOS_POLL_INTERVAL', 1.0)
+        leer = sync_to_async(eventos_desde)
+        while self._colas:
+            try:
+                nuevos = await leer(self.ultimo)
+            except Exception:
+                # la base puede fallar puntualmente; se reintenta en la próxima vuelta
+                nuevos = []
+            for evento in nuevos:
+                self.ultimo = evento['id']
+                for cola in list(self._colas):
+                    try:
+                        cola.put_nowait(evento)
+                    except asyncio.QueueFull:
+                        # cliente lento: se le corta el stream y reconecta con Last-Event-ID
+                        self._colas.discard(cola)
+                        cola.desbordada = True
+            if len(nuevos) < LOTE_MAX:
+                await asyncio.sleep(intervalo)
+        self._tarea = None
+
+
+broadcaster = Broadcaster()
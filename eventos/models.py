@@ -0,0 +1,20 @@
+# eventos/models.py
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+class Evento(models.Model):
+    """
+    Tabla de notificaciones: cada proceso del server lee las filas nuevas
+    (id > último visto) y las reparte a sus conexiones SSE.
+    El id es también el `id:` del evento SSE (Last-Event-ID al reconectar).
+    """
+    tipo      = models.CharField(max_length=50)    # 'incidente.creado', 'producto.stock', ...
+    datos     = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    creado_en = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ['id']
+
+    def __str__(self):
+        return f"Evento #{self.pk} {self.tipo}"
@@ -0,0 +1,41 @@
+# eventos/senales.py
+"""
+Cambios que se publican como eventos SSE (ver broadcaster.publicar):
+  incidente.creado / incidente.resuelto, alquiler.creado, producto.stock
+"""
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from alquileres.models import Alquiler
+from incidentes.models import Incidente
+from productos.models import Producto
+from .broadcaster import publicar
+
+
+@receiver(post_save, sender=Incidente)
+def incidente_guardado(sender, instance: Incidente, created: bool, **kwargs):
+    datos = {'id': instance.pk, 'det_alquiler': instance.det_alquiler_id,
+             'estado': instance.estado_incidente}
+    if created:
+        publicar('incidente.creado', datos)
+        return
+    # _abierto_en_db todavía tiene el estado previo (se actualiza después del post_save)
+    _, estaba_abierto = getattr(instance, '_abierto_en_db', (None, False))
+    if estaba_abierto and instance.estado_incidente == 'resuelto':
+        publicar('incidente.resuelto', datos)
+
+
+@receiver(post_save, sender=Alquiler)
+def alquiler_guardado(sender, instance: Alquiler, created: bool, **kwargs):
+    if created:
+        publicar('alquiler.creado', {'id': instance.pk, 'cliente': instance.cliente_id,
+                                     'cliente_nombre': instance.cliente_nombre})
+
+
+@receiver(post_save, sender=Producto)
+def producto_guardado(sender, instance: Producto, created: bool, update_fields=None, **kwargs):
+    if update_fields is not None and 'stock' not in update_fields:
+        return
+    if created or instance.stock != getattr(instance, '_stock_en_db', instance.stock):
+        publicar('producto.stock', {'id': instance.pk, 'stock': instance.stock})
+    instance._stock_en_db = instance.stock
@@ -0,0 +1,36 @@
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .models import Evento
+
+
+@override_settings(EVENTOS_POLL_INTERVAL=0.05, EVENTOS_WSGI_DURACION=0.3)
+class StreamWSGITests(TestCase):
+
+    def setUp(self):
+        self.token = str(AccessToken.for_user(User.objects.create_user('ana', 'ana@empresa.com', 'clave')))
+
+    def _leer(self, **extra):
+        resp = self.client.get(reverse('eventos_stream'), {'token': self.token, **extra})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp['Content-Type'], 'text/event-stream')
+        return b''.join(resp.streaming_content).decode()
+
+    def test_termina_y_deja_el_id_para_reconectar(self):
+        previo = Evento.objects.create(tipo='producto.stock', datos={'id': 1, 'stock': 3})
+        cuerpo = self._leer()
+        # solo lo nuevo (sin Last-Event-ID no se reenvía lo viejo) y cierra con el último id visto
+        self.assertNotIn('event: producto.stock', cuerpo)
+        self.assertTrue(cuerpo.endswith(f'id: {previo.pk}\n\n'))
+
+    def test_reconexion_reenvia_lo_perdido_filtrando_tipos(self):
+        Evento.objects.create(tipo='producto.stock', datos={'id': 1, 'stock': 3})
+        creado = Evento.objects.create(tipo='incidente.creado', datos={'id': 7})
+        cuerpo = self._leer(ultimo=0, tipos='incidente.creado')
+        self.assertIn(f'id: {creado.pk}\nevent: incidente.creado\ndata: {{"id":7}}\n\n', cuerpo)
+        self.assertNotIn('producto.stock', cuerpo)
+
+    def test_sin_token_401(self):
+        self.assertEqual(self.client.get(reverse('eventos_stream')).status_code, 401)
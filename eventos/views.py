@@ -0,0 +1,120 @@
+# eventos/views.py
+import asyncio
+import json
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import JsonResponse, StreamingHttpResponse
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+from accounts.revocacion import JWTAuthenticationRevocable
+
+from .broadcaster import broadcaster, eventos_desde, ultimo_id
+
+
+def _usuario(request):
+    """
+    JWT por header Authorization o por ?token= (EventSource no permite headers).
+    Devuelve el usuario o None.
+    """
+    auth = JWTAuthenticationRevocable()
+    crudo = request.GET.get('token')
+    try:
+        if crudo:
+            token = auth.get_validated_token(crudo)
+            return auth.get_user(token)
+        res = auth.authenticate(request)
+        return res[0] if res else None
+    except (InvalidToken, TokenError, AuthenticationFailed):
+        return None
+
+
+def _sse(evento):
+    datos = json.dumps(evento['datos'], ensure_ascii=False, separators=(',', ':'))
+    return f"id: {evento['id']}\nevent: {evento['tipo']}\ndata: {datos}\n\n".encode()
+
+
+async def _stream(desde_id, tipos):
+    heartbeat = getattr(settings, 'EVENTOS_HEARTBEAT', 15)
+    cola = await broadcaster.suscribir()
+    hasta = broadcaster.ultimo          # lo posterior llega por la cola
+    try:
+        yield b"retry: 3000\n: conectado\n\n"
+
+        # reconexión: reenviar lo que se perdió (tabla con retención limitada)
+        if desde_id is not None and desde_id < hasta:
+            for evento in await sync_to_async(eventos_desde)(desde_id):
+                if evento['id'] > hasta:
+                    break
+                if not tipos or evento['tipo'] in tipos:
+                    yield _sse(evento)
+
+        while True:
+            if getattr(cola, 'desbordada', False) and cola.empty():
+                return   # cliente demasiado lento: que reconecte con Last-Event-ID
+            try:
+                evento = await asyncio.wait_for(cola.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                # comentario SSE: mantiene viva la conexión a través de proxies
+                yield b": ping\n\n"
+                continue
+            if not tipos or evento['tipo'] in tipos:
+                yield _sse(evento)
+    finally:
+        broadcaster.desuscribir(cola)
+
+
+def _stream_wsgi(desde_id, tipos):
+    """
+    Variante síncrona para WSGI (runserver, gunicorn sync): Django no puede servir un
+    iterador async sin ASGI. Ocupa un thread, así que lee la tabla ella misma y corta
+    a los EVENTOS_WSGI_DURACION segundos; EventSource reconecta solo. Cada ping lleva
+    `id:` (evento sin data) para que la reconexión siga desde ahí sin perder nada.
+    """
+    intervalo = getattr(settings, 'EVENTOS_POLL_INTERVAL', 1.0)
+    heartbeat = getattr(settings, 'EVENTOS_HEARTBEAT', 15)
+    fin = time.monotonic() + getattr(settings, 'EVENTOS_WSGI_DURACION', 60)
+    ultimo = ultimo_id() if desde_id is None else desde_id
+    ping = time.monotonic() + heartbeat
+    yield b"retry: 3000\n: conectado\n\n"
+    while time.monotonic() < fin:
+        for evento in eventos_desde(ultimo):
+            ultimo = evento['id']
+            if not tipos or evento['tipo'] in tipos:
+                yield _sse(evento)
+                ping = time.monotonic() + heartbeat
+        if time.monotonic() >= ping:
+            yield f"id: {ultimo}\n: ping\n\n".encode()
+            ping = time.monotonic() + heartbeat
+        time.sleep(intervalo)
+    yield f"id: {ultimo}\n\n".encode()
+
+
+async def stream(request):
+    """
+    GET /api/eventos/?token=<access>[&tipos=incidente.creado,producto.stock]
+    Stream SSE con eventos de cambio. Bajo ASGI (myproject/asgi.py) cada conexión es
+    una corrutina ociosa; bajo WSGI se sirve _stream_wsgi (conexiones acotadas).
+    """
+    usuario = await sync_to_async(_usuario)(request)
+    if usuario is None or not usuario.is_active:
+        return JsonResponse({'detail': 'Credenciales inválidas.'}, status=401)
+
+    ultimo = request.headers.get('Last-Event-ID') or request.GET.get('ultimo')
+    try:
+        desde_id = int(ultimo) if ultimo else None
+    except ValueError:
+        desde_id = None
+    tipos = {t for t in request.GET.get('tipos', '').split(',') if t}
+
+    if isinstance(request, ASGIRequest):
+        contenido = _stream(desde_id, tipos)
+    else:
+        contenido = _stream_wsgi(desde_id, tipos)
+    response = StreamingHttpResponse(contenido, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'   # nginx: no bufferear
+    return response
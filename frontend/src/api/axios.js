@@ -33,4 +33,16 @@ axios.interceptors.response.use(
   }
 );
 
+// logout: revoca refresh + access en el backend (no bloquea la salida si falla)
+export const revocarTokens = () => {
+  const refresh = get('refresh_token');
+  const access = get('access_token');
+  if (!refresh) return Promise.resolve();
+  return axios
+    .post('/api/token/revocar/', { refresh }, {
+      headers: access ? { Authorization: `Bearer ${access}` } : {},
+    })
+    .catch(() => {});
+};
+
 export default axios;
@@ -0,0 +1,36 @@
+import { useEffect, useRef } from 'react';
+
+const API_BASE = process.env.REACT_APP_API_BASE || 'http://localhost:8000';
+
+const getToken = () => localStorage.getItem('access_token') || sessionStorage.getItem('access_token');
+
+/**
+ * Suscripción al stream SSE /api/eventos/ (una conexión ociosa en vez de polling).
+ * `tipos`: ej. ['incidente.creado', 'incidente.resuelto']. `onEvento(tipo, datos)`.
+ * Los eventos seguidos se agrupan (`esperaMs`) para no refrescar varias veces.
+ * EventSource reconecta solo y manda Last-Event-ID para no perder eventos.
+ */
+export default function useEventos(tipos, onEvento, esperaMs = 500) {
+  const handler = useRef(onEvento);
+  handler.current = onEvento;
+  const clave = tipos.join(',');
+
+  useEffect(() => {
+    const token = getToken();
+    if (!token || typeof EventSource === 'undefined') return undefined;
+
+    const params = new URLSearchParams({ token, tipos: clave });
+    const es = new EventSource(`${API_BASE}/api/eventos/?${params}`);
+    let timer = null;
+    let ultimo = null;
+
+    const recibir = (ev) => {
+      ultimo = [ev.type, JSON.parse(ev.data || '{}')];
+      clearTimeout(timer);
+      timer = setTimeout(() => handler.current(...ultimo), esperaMs);
+    };
+    clave.split(',').forEach(t => es.addEventListener(t, recibir));
+
+    return () => { clearTimeout(timer); es.close(); };
+  }, [clave, esperaMs]);
+}
@@ -1,5 +1,6 @@
 import { NavLink, useNavigate } from 'react-router-dom';
 import { useAuth } from '../context/AuthContext';
+import { revocarTokens } from '../api/axios';
 import logo from '../assets/logo.png';
 import {
   Home, Users, Boxes, Truck, FileText, LogOut, ShieldCheck,
@@ -18,6 +19,7 @@ export default function Sidebar() {
   );
 
   const handleLogout = () => {
+    revocarTokens();
     ['access_token', 'refresh_token'].forEach(k => {
       localStorage.removeItem(k);
       sessionStorage.removeItem(k);
@@ -1,6 +1,6 @@
 import { createContext, useContext, useEffect, useMemo, useState } from 'react';
 import { useLocation, useNavigate } from 'react-router-dom';
-import axios from '../api/axios';
+import axios, { revocarTokens } from '../api/axios';
 
 const AuthContext = createContext();
 
@@ -28,6 +28,7 @@ export function AuthProvider({ children }) {
 
   // logout reusable (no recarga la página)
   const logout = () => {
+    revocarTokens();
     ['access_token', 'refresh_token'].forEach((k) => {
       localStorage.removeItem(k);
       sessionStorage.removeItem(k);
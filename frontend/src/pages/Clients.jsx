@@ -25,7 +25,10 @@ export default function Clients() {
 
   const fetchList = async () => {
     try {
-      const { data } = await axios.get('/api/clientes/');
+      // solo las columnas del listado (sin notas)
+      const { data } = await axios.get('/api/clientes/', { params: {
+        fields: 'id,nombre,apellido,documento,telefono,email',
+      }});
       setRows(Array.isArray(data) ? data : (data.results || []));
     } catch {
       /* noop */
@@ -1,6 +1,7 @@
 import { useEffect, useState } from 'react';
 import Layout from '../components/Layout';
 import axios from '../api/axios';
+import useEventos from '../api/eventos';
 import { DollarSign, Boxes, Hourglass, AlertTriangle, ChevronRight } from 'lucide-react';
 
 const Stat = ({ Icon, title, value }) => (
@@ -32,14 +33,17 @@ export default function Dashboard(){
   const [stats, setStats] = useState(null);
   const [activity, setActivity] = useState([]);
 
-  useEffect(() => {
-    (async () => {
-      const m = await axios.get('/api/metrics/summary/');
-      setStats(m.data);
-      const a = await axios.get('/api/activity/recent/');
-      setActivity(a.data.items);
-    })();
-  }, []);
+  const cargar = async () => {
+    const m = await axios.get('/api/metrics/summary/');
+    setStats(m.data);
+    const a = await axios.get('/api/activity/recent/');
+    setActivity(a.data.items);
+  };
+
+  useEffect(() => { cargar(); }, []);
+
+  // refrescar solo cuando el server avisa un cambio (SSE), sin polling
+  useEventos(['incidente.creado', 'incidente.resuelto', 'alquiler.creado', 'producto.stock'], cargar, 1000);
 
   return (
     <Layout>
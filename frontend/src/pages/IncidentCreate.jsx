@@ -132,7 +132,7 @@ export default function IncidentCreate(){
               <option value="">— Seleccionar alquiler —</option>
               {alquileres.map(a=>(
                 <option key={a.id} value={a.id}>
-                  #{a.id} · {a.cliente || 'sin cliente'}
+                  #{a.id} · {a.cliente_nombre || 'sin cliente'}
                 </option>
               ))}
             </select>
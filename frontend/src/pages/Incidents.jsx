@@ -2,6 +2,7 @@ import { useEffect, useMemo, useState } from 'react';
 import { Link } from 'react-router-dom';
 import Layout from '../components/Layout';
 import axios from '../api/axios';
+import useEventos from '../api/eventos';
 import { useAuth } from '../context/AuthContext';
 import { Search, CheckCircle2, AlertTriangle } from 'lucide-react';
 
@@ -32,6 +33,7 @@ export default function Incidents(){
   };
 
   useEffect(()=>{ fetchList(); }, []);
+  useEventos(['incidente.creado', 'incidente.resuelto'], fetchList);
 
   const filtered = useMemo(() => {
     const t = q.trim().toLowerCase();
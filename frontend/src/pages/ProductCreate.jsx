@@ -20,6 +20,8 @@ export default function ProductCreate(){
   const [precio, setPrecio] = useState('');
   const [stock, setStock] = useState('');
   const [imagenUrl, setImagenUrl] = useState('');
+  const [archivo, setArchivo] = useState(null);
+  const [thumb, setThumb] = useState('');
   const [activo, setActivo] = useState(true);
 
   const [loading, setLoading] = useState(false);
@@ -37,6 +39,7 @@ export default function ProductCreate(){
         setPrecio(String(data.precio || ''));
         setStock(String(data.stock || ''));
         setImagenUrl(data.imagen_url || '');
+        setThumb(data.imagenes?.['320']?.webp || data.imagen_thumb || '');
         setActivo(Boolean(data.activo));
       } catch {
         setMsg('No se pudo cargar el producto.');
@@ -65,6 +68,14 @@ export default function ProductCreate(){
     return e;
   };
 
+  // Archivo opcional: el backend genera las miniaturas en segundo plano (job)
+  const subirImagen = async (productoId) => {
+    if (!archivo) return;
+    const fd = new FormData();
+    fd.append('imagen', archivo);
+    await axios.post(`/api/productos/${productoId}/imagen/`, fd);
+  };
+
   const onSubmit = async (e) => {
     e.preventDefault();
     setMsg('');
@@ -84,10 +95,12 @@ export default function ProductCreate(){
         activo,
       };
       if (!isEdit) {
-        await axios.post('/api/productos/', payload);
+        const { data } = await axios.post('/api/productos/', payload);
+        await subirImagen(data.id);
         navigate('/productos', { replace:true, state: { created:true, name: nombre } });
       } else {
         await axios.patch(`/api/productos/${id}/`, payload);
+        await subirImagen(id);
         navigate('/productos', { replace:true, state: { updated:true, name: nombre } });
       }
     } catch (err) {
@@ -165,9 +178,17 @@ export default function ProductCreate(){
             </label>
             {errs.imagen_url && <div className="error-text">{errs.imagen_url}</div>}
 
+            <label className="underline-field" style={{gridColumn:'1 / span 1'}}>
+              <input
+                type="file"
+                accept="image/jpeg,image/png,image/webp,image/gif"
+                onChange={e=>setArchivo(e.target.files?.[0] || null)}
+              />
+            </label>
+
             <div style={{border:'1px dashed #333', borderRadius:12, minHeight:160, display:'grid', placeItems:'center', overflow:'hidden'}}>
-              {imagenUrl
-                ? <img src={imagenUrl} alt="preview" style={{width:'100%', maxHeight:240, objectFit:'contain'}} />
+              {(thumb || imagenUrl)
+                ? <img src={thumb || imagenUrl} alt="preview" style={{width:'100%', maxHeight:240, objectFit:'contain'}} />
                 : <span className="muted">Preview de la imagen</span>}
             </div>
           </div>
@@ -26,7 +26,10 @@ export default function Products(){
 
   const fetchList = async () => {
     try {
-      const { data } = await axios.get('/api/productos/');
+      // solo las columnas del listado (?fields= recorta respuesta y consulta)
+      const { data } = await axios.get('/api/productos/', { params: {
+        fields: 'id,nombre,descripcion,categoria_display,precio,stock,imagen_url,imagen_thumb',
+      }});
       setRows(Array.isArray(data) ? data : (data.results || []));
       setErr('');
     } catch {
@@ -125,8 +128,8 @@ export default function Products(){
               {!loading && q.trim() && !err && filtered.map(r => (
                 <tr key={r.id}>
                   <td>
-                    {r.imagen_url
-                      ? <img src={r.imagen_url} alt="" style={{width:44, height:44, objectFit:'cover', borderRadius:8, border:'1px solid #222'}} />
+                    {(r.imagen_thumb || r.imagen_url)
+                      ? <img src={r.imagen_thumb || r.imagen_url} alt="" loading="lazy" style={{width:44, height:44, objectFit:'cover', borderRadius:8, border:'1px solid #222'}} />
                       : <span className="muted">—</span>
                     }
                   </td>
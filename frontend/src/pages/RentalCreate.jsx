@@ -134,11 +134,8 @@ export default function RentalCreate() {
 
     try {
       setSaving(true);
-      const cli = clientes.find(c => c.id === Number(clienteId));
-      const nombreCliente = cli ? `${cli.nombre} ${cli.apellido ?? ''}`.trim() : '';
-
-      // 1) crear cabecera
-      const { data: cab } = await axios.post('/api/alquileres/', { cliente: nombreCliente });
+      // 1) crear cabecera (el backend toma el nombre del cliente)
+      const { data: cab } = await axios.post('/api/alquileres/', { cliente: Number(clienteId) });
 
       // 2) crear ítems
       for (const it of items) {
@@ -23,6 +23,7 @@ export default function RentalEdit(){
   const [loading, setLoading] = useState(true);
   const [saving,  setSaving]  = useState(false);
   const [msg,     setMsg]     = useState('');
+  const [version, setVersion] = useState(null); // versión del alquiler al cargar (If-Match al guardar)
 
   // cargar datos iniciales
   useEffect(()=>{
@@ -41,10 +42,9 @@ export default function RentalEdit(){
         setClientes(arrC);
         // cabecera
         const a = cab.data;
-        setClienteTexto(a.cliente || '');
-        // intentar preseleccionar cliente por coincidencia exacta "Nombre Apellido"
-        const match = arrC.find(c => `${c.nombre} ${c.apellido || ''}`.trim().toLowerCase() === (a.cliente || '').trim().toLowerCase());
-        if (match) setClienteId(String(match.id));
+        setVersion(a.version ?? null);
+        if (a.cliente) setClienteId(String(a.cliente));
+        else setClienteTexto(a.cliente_nombre || '');
 
         // items actuales del alquiler
         const its = (a.items || []).map(x => ({
@@ -53,6 +53,7 @@ export default function RentalEdit(){
           producto_nombre: x.producto_nombre,
           cantidad: x.cantidad,
           precio_unit: x.precio_unit,
+          version: x.version,
           _dirty: false,
           _deleted: false,
         }));
@@ -109,26 +110,27 @@ export default function RentalEdit(){
     }finally{ setSaving(false); }
   };
 
+  // guardado condicional: si otro usuario cambió el registro, el backend responde 409
+  const ifMatch = (v) => (v ? { headers: { 'If-Match': `"${v}"` } } : undefined);
+  const esConflicto = (err) => err?.response?.status === 409 && err?.response?.data?.code === 'version_conflict';
+
   const onSubmit = async (e) => {
     e.preventDefault(); setMsg('');
     try{
       setSaving(true);
 
-      // nombre final del cliente que guardará la cabecera
-      const cli = clientes.find(c => c.id === Number(clienteId));
-      const nombreCliente = cli
-        ? `${cli.nombre} ${cli.apellido || ''}`.trim()
-        : (clienteTexto || '').trim();
-
-      // 1) actualizar cabecera (solo texto del cliente)
-      await axios.patch(`/api/alquileres/${id}/`, { cliente: nombreCliente });
+      // 1) actualizar cabecera: cliente cargado o, si no hay, texto libre
+      await axios.patch(`/api/alquileres/${id}/`, clienteId
+        ? { cliente: Number(clienteId) }
+        : { cliente: null, cliente_nombre: (clienteTexto || '').trim() }, ifMatch(version));
 
       // 2) reconciliar ítems: delete / patch / post
       for(const it of items){
         if (it._deleted && it.id){
           try{
-            await axios.delete(`/api/det-alquileres/${it.id}/`);
+            await axios.delete(`/api/det-alquileres/${it.id}/`, ifMatch(it.version));
           }catch(e){
+            if(esConflicto(e)) throw e;
             if(e?.response?.status === 409){
               setMsg('Un ítem no puede borrarse: tiene incidentes abiertos.');
             }else{
@@ -144,7 +146,7 @@ export default function RentalEdit(){
             producto: it.producto,
             cantidad: Number(it.cantidad),
             precio_unit: String(it.precio_unit)
-          });
+          }, ifMatch(it.version));
         } else { // create
           await axios.post('/api/det-alquileres/', {
             alquiler: Number(id),
@@ -157,6 +159,10 @@ export default function RentalEdit(){
 
       navigate('/alquileres', { replace:true, state:{ updated:true, id } });
     }catch(e){
+      if (esConflicto(e)){
+        setMsg('Otro usuario modificó este alquiler mientras lo editabas. Recargá la página para ver sus cambios antes de guardar.');
+        return;
+      }
       const m = e?.response?.data ? JSON.stringify(e.response.data) : e.message;
       setMsg(`No se pudo guardar. ${m}`);
     }finally{
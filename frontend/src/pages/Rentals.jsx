@@ -43,7 +43,7 @@ export default function Rentals(){
     const t = q.trim().toLowerCase();
     if(!t) return rows;
     return rows.filter(r =>
-      [r.id, r.cliente, r.creado_en].filter(Boolean)
+      [r.id, r.cliente_nombre, r.creado_en].filter(Boolean)
         .some(v => String(v).toLowerCase().includes(t))
     );
   }, [rows, q]);
@@ -113,7 +113,7 @@ export default function Rentals(){
               {!loading && filtered.map(r=>(
                 <tr key={r.id}>
                   <td>#{r.id}</td>
-                  <td>{r.cliente || '—'}</td>
+                  <td>{r.cliente_nombre || '—'}</td>
                   <td className="muted">
                     {r.creado_en ? new Date(r.creado_en).toLocaleString() : '—'}
                   </td>
@@ -0,0 +1,57 @@
+# incidentes/management/commands/check_open_incidents.py
+from django.core.management.base import BaseCommand
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from alquileres.models import Alquiler
+from incidentes.models import Incidente
+from productos.models import Producto
+
+
+def _conteo_real(campo):
+    """ Subquery: incidentes abiertos agrupados por det_alquiler__<campo> """
+    return Coalesce(
+        Subquery(
+            Incidente.objects
+            .filter(estado_incidente='abierto', **{f'det_alquiler__{campo}': OuterRef('pk')})
+            .values(f'det_alquiler__{campo}')
+            .annotate(n=Count('pk'))
+            .values('n'),
+            output_field=IntegerField(),
+        ),
+        0,
+    )
+
+
+class Command(BaseCommand):
+    help = "Verifica (y con --fix repara) los contadores open_incidents de Producto y Alquiler."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fix', action='store_true', help='Corregir los contadores desalineados')
+
+    def handle(self, *args, **opts):
+        total = 0
+        for model, campo in ((Producto, 'producto'), (Alquiler, 'alquiler')):
+            desalineados = list(
+                model.objects
+                .annotate(real=_conteo_real(campo))
+                .exclude(open_incidents=F('real'))
+                .values_list('pk', 'open_incidents', 'real')
+            )
+            total += len(desalineados)
+            for pk, guardado, real in desalineados:
+                self.stdout.write(f"{model.__name__} #{pk}: open_incidents={guardado}, real={real}")
+
+            if opts['fix'] and desalineados:
+                # se recalcula en el mismo UPDATE por si cambió algo desde la lectura
+                model.objects.filter(pk__in=[d[0] for d in desalineados]).update(
+                    open_incidents=_conteo_real(campo), updated_at=timezone.now()
+                )
+
+        if not total:
+            self.stdout.write(self.style.SUCCESS("Contadores open_incidents OK."))
+        elif opts['fix']:
+            self.stdout.write(self.style.SUCCESS(f"{total} contadores corregidos."))
+        else:
+            self.stdout.write(self.style.WARNING(f"{total} contadores desalineados (usar --fix)."))
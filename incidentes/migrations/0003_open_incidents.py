@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:28
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_open_incidents(apps, schema_editor):
+    Incidente = apps.get_model('incidentes', 'Incidente')
+    Producto = apps.get_model('productos', 'Producto')
+    Alquiler = apps.get_model('alquileres', 'Alquiler')
+
+    abiertos = Incidente.objects.filter(estado_incidente='abierto')
+    for row in abiertos.values('det_alquiler__producto').annotate(n=Count('pk')):
+        Producto.objects.filter(pk=row['det_alquiler__producto']).update(open_incidents=row['n'])
+    for row in abiertos.values('det_alquiler__alquiler').annotate(n=Count('pk')):
+        Alquiler.objects.filter(pk=row['det_alquiler__alquiler']).update(open_incidents=row['n'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alquileres', '0003_alquiler_open_incidents'),
+        ('productos', '0003_producto_open_incidents'),
+        ('incidentes', '0002_incidente_cantidad_afectada_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='incidente',
+            index=models.Index(condition=models.Q(('estado_incidente', 'abierto')), fields=['det_alquiler'], name='incidente_abierto_det_idx'),
+        ),
+        migrations.RunPython(backfill_open_incidents, migrations.RunPython.noop),
+    ]
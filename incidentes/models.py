@@ -1,7 +1,14 @@
 # incidentes/models.py
+from collections import defaultdict
+
 from django.db import models, transaction
+from django.db.models import Case, F, Q, Value, When
 from django.core.exceptions import ValidationError
-from alquileres.models import DetAlquiler
+from django.utils import timezone
+from alquileres.models import Alquiler, DetAlquiler
+from outbox.mensajes import incidente_resuelto
+from outbox.registro import registrar_varios
+from productos.models import Producto
 
 class Incidente(models.Model):
     ESTADOS = (
@@ -35,15 +42,58 @@ class Incidente(models.Model):
 
     class Meta:
         ordering = ['-fecha_incidente']
+        indexes = [
+            # índice parcial: solo incidentes abiertos (guards de borrado, validaciones)
+            models.Index(
+                fields=['det_alquiler'],
+                condition=Q(estado_incidente='abierto'),
+                name='incidente_abierto_det_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"Incidente #{self.pk} {self.get_estado_incidente_display()}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # estado "de base" para saber si cambia el conteo de abiertos al guardar
+        instance._abierto_en_db = (instance.__dict__.get('det_alquiler_id'),
+                                   instance.__dict__.get('estado_incidente') == 'abierto')
+        return instance
+
+    def _ajustar_open_incidents(self, det_id, delta):
+        """
+        Suma `delta` a Producto.open_incidents y Alquiler.open_incidents del detalle.
+        UPDATE con F() → atómico y dentro de la misma transacción que el incidente.
+        """
+        if self.det_alquiler_id == det_id:
+            prod_id, alq_id = self.det_alquiler.producto_id, self.det_alquiler.alquiler_id
+        else:
+            prod_id, alq_id = DetAlquiler.objects.values_list('producto_id', 'alquiler_id').get(pk=det_id)
+        ahora = timezone.now()
+        Producto.objects.filter(pk=prod_id).update(open_incidents=F('open_incidents') + delta, updated_at=ahora)
+        Alquiler.objects.filter(pk=alq_id).update(open_incidents=F('open_incidents') + delta, updated_at=ahora)
+
+    def _sync_open_incidents(self, antes, despues):
+        """ antes/despues: (det_alquiler_id, es_abierto) """
+        if antes == despues:
+            return
+        if antes[1]:
+            self._ajustar_open_incidents(antes[0], -1)
+        if despues[1]:
+            self._ajustar_open_incidents(despues[0], +1)
+
     @transaction.atomic
     def save(self, *args, **kwargs):
         is_create = self._state.adding
+        antes = (None, False) if is_create else getattr(self, '_abierto_en_db', (None, False))
         super().save(*args, **kwargs)
 
+        despues = (self.det_alquiler_id, self.estado_incidente == 'abierto')
+        self._sync_open_incidents(antes, despues)
+        self._abierto_en_db = despues
+
         # Al CREAR: sacar del stock lo afectado (queda fuera de servicio)
         if is_create:
             prod = self.det_alquiler.producto
@@ -51,13 +101,20 @@ class Incidente(models.Model):
             if prod.stock < qty:
                 raise ValidationError("Stock insuficiente para registrar el incidente.")
             prod.stock = prod.stock - qty
-            prod.save(update_fields=['stock'])
+            prod.save(update_fields=['stock', 'updated_at'])
+
+    @transaction.atomic
+    def delete(self, *args, **kwargs):
+        antes = getattr(self, '_abierto_en_db', (self.det_alquiler_id, self.estado_incidente == 'abierto'))
+        res = super().delete(*args, **kwargs)
+        self._sync_open_incidents(antes, (None, False))
+        return res
 
     def _devolver_reintegrado(self):
         """ Devuelve al stock lo afectado (caso reparable). """
         prod = self.det_alquiler.producto
         prod.stock = prod.stock + self.cantidad_afectada
-        prod.save(update_fields=['stock'])
+        prod.save(update_fields=['stock', 'updated_at'])
 
     def _devolver_repuesto(self):
         """ Suma al stock lo que se repuso (normalmente = afectada, pero puede variar). """
@@ -65,4 +122,69 @@ class Incidente(models.Model):
             raise ValidationError("Para resultado 'repuesto' debe informar cantidad_repuesta > 0.")
         prod = self.det_alquiler.producto
         prod.stock = prod.stock + self.cantidad_repuesta
-        prod.save(update_fields=['stock'])
+        prod.save(update_fields=['stock', 'updated_at'])
+
+
+def _case_por_pk(valores):
+    """ CASE id WHEN k THEN v ... ELSE 0 END (enteros) """
+    return Case(*[When(pk=k, then=Value(v)) for k, v in valores.items()],
+                default=Value(0), output_field=models.IntegerField())
+
+
+@transaction.atomic
+def resolver_en_lote(resoluciones):
+    """
+    Cierra varios incidentes abiertos en un número fijo de consultas.
+    resoluciones: {incidente_id: (resultado_final, cantidad_repuesta)} ya validadas
+    (ver ResolucionLoteSerializer).
+
+      1 UPDATE de incidentes (CASE por id para resultado/cantidad_repuesta)
+      1 UPDATE de productos: stock += devuelto, open_incidents -= cerrados (CASE por producto)
+      1 UPDATE de alquileres: open_incidents -= cerrados (CASE por alquiler)
+
+    Devuelve la cantidad cerrada. Si alguno ya no está abierto, ValidationError y no se cierra ninguno.
+    """
+    ids = list(resoluciones)
+    filas = (Incidente.objects.select_for_update()
+             .filter(pk__in=ids, estado_incidente='abierto')
+             .values_list('pk', 'cantidad_afectada', 'det_alquiler__producto_id', 'det_alquiler__alquiler_id',
+                          'det_alquiler_id', 'det_alquiler__precio_unit'))
+
+    stock, abiertos_prod, abiertos_alq = defaultdict(int), defaultdict(int), defaultdict(int)
+    cerrados = []
+    for pk, afectada, prod_id, alq_id, det_id, precio in filas:
+        cerrados.append((pk, alq_id, det_id, prod_id, afectada, precio))
+        resultado, repuesta = resoluciones[pk]
+        if resultado == 'reintegrado':
+            stock[prod_id] += afectada
+        elif resultado == 'repuesto':
+            stock[prod_id] += repuesta
+        abiertos_prod[prod_id] += 1
+        abiertos_alq[alq_id] += 1
+    if len(cerrados) != len(ids):
+        raise ValidationError("Algunos incidentes ya no están abiertos; no se cerró ninguno.")
+
+    ahora = timezone.now()
+    Incidente.objects.filter(pk__in=ids).update(
+        estado_incidente='resuelto',
+        fecha_resolucion=ahora,
+        resultado_final=Case(*[When(pk=k, then=Value(r)) for k, (r, _) in resoluciones.items()],
+                             output_field=models.CharField()),
+        cantidad_repuesta=_case_por_pk({k: c for k, (_, c) in resoluciones.items()}),
+    )
+    Producto.objects.filter(pk__in=list(abiertos_prod)).update(
+        stock=F('stock') + _case_por_pk(stock),
+        open_incidents=F('open_incidents') - _case_por_pk(abiertos_prod),
+        updated_at=ahora,
+    )
+    Alquiler.objects.filter(pk__in=list(abiertos_alq)).update(
+        open_incidents=F('open_incidents') - _case_por_pk(abiertos_alq),
+        updated_at=ahora,
+    )
+    # cargos para el sistema contable (outbox), en la misma transacción
+    registrar_varios([
+        incidente_resuelto(pk, alq_id, det_id, prod_id, resoluciones[pk][0], afectada,
+                           resoluciones[pk][1], precio, ahora)
+        for pk, alq_id, det_id, prod_id, afectada, precio in cerrados
+    ])
+    return len(cerrados)
@@ -129,3 +129,51 @@ class IncidenteSerializer(serializers.ModelSerializer):
 
         instance.save()
         return instance
+
+
+# ---------- cierre masivo (IncidenteViewSet.resolver) ----------
+class ResolucionItemSerializer(serializers.Serializer):
+    id                = serializers.IntegerField()
+    resultado_final   = serializers.ChoiceField(choices=Incidente.RESULTADOS)
+    cantidad_repuesta = serializers.IntegerField(min_value=0, required=False, default=0)
+
+
+class ResolucionLoteSerializer(serializers.Serializer):
+    """
+    {"incidentes": [{id, resultado_final, cantidad_repuesta}, ...]}
+    Valida todo con UNA consulta (mismas reglas de cierre que IncidenteSerializer).
+    """
+    incidentes = ResolucionItemSerializer(many=True, allow_empty=False, max_length=500)
+
+    def validate_incidentes(self, items):
+        ids = [it['id'] for it in items]
+        if len(set(ids)) != len(ids):
+            raise serializers.ValidationError('Hay incidentes repetidos.')
+
+        actuales = {
+            pk: (estado, tipo, afectada)
+            for pk, estado, tipo, afectada in Incidente.objects.filter(pk__in=ids)
+            .values_list('pk', 'estado_incidente', 'tipo_incidente', 'cantidad_afectada')
+        }
+        errores = {}
+        for it in items:
+            pk, res, rep = it['id'], it['resultado_final'], it['cantidad_repuesta']
+            if pk not in actuales:
+                errores[pk] = 'No existe.'
+                continue
+            estado, tipo, afectada = actuales[pk]
+            if estado != 'abierto':
+                errores[pk] = 'No está abierto.'
+            elif tipo == 'irreparable' and res == 'reintegrado':
+                errores[pk] = "Un incidente irreparable no puede marcarse como 'reintegrado'."
+            elif res == 'repuesto' and not 0 < rep <= afectada:
+                errores[pk] = f"'cantidad_repuesta' debe estar entre 1 y {afectada} para 'repuesto'."
+            elif rep > afectada:
+                errores[pk] = 'No puede reponerse más de lo afectado.'
+        if errores:
+            raise serializers.ValidationError({str(k): v for k, v in errores.items()})
+        return items
+
+    def resoluciones(self):
+        return {it['id']: (it['resultado_final'], it['cantidad_repuesta'])
+                for it in self.validated_data['incidentes']}
@@ -0,0 +1,14 @@
+# incidentes/tareas.py
+from io import StringIO
+
+from django.core.management import call_command
+
+from jobs.registro import tarea
+
+
+@tarea('incidentes.recalcular_open_incidents')
+def recalcular_open_incidents_job(job):
+    """ Verifica y corrige Producto/Alquiler.open_incidents. """
+    salida = StringIO()
+    call_command('check_open_incidents', fix=True, stdout=salida)
+    return {'salida': salida.getvalue().splitlines()}
@@ -1,12 +1,61 @@
-from rest_framework import viewsets
+from django.core.exceptions import ValidationError as DjangoValidationError
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
-from .models import Incidente
-from .serializers import IncidenteSerializer
+from rest_framework.response import Response
+from archivo.mixins import IncluirArchivadosMixin
+from archivo.models import IncidenteArchivado
+from empleados.permissions import EsUsuarioAdministrador
+from eventos.broadcaster import publicar_varios
+from myproject.db_router import ReplicaSafeMixin
+from myproject.sparse import SparseFieldsMixin
+from .models import Incidente, resolver_en_lote
+from .serializers import IncidenteSerializer, ResolucionLoteSerializer
 from .permissions import IncidentePermiso
 
-class IncidenteViewSet(viewsets.ModelViewSet):
+class IncidenteViewSet(ReplicaSafeMixin, IncluirArchivadosMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Incidente.objects.select_related(
         'det_alquiler', 'det_alquiler__producto'
     ).all()
     serializer_class = IncidenteSerializer
     permission_classes = [IsAuthenticated, IncidentePermiso]
+
+    def get_queryset(self):
+        return self._por_detalle(super().get_queryset())
+
+    def get_archivados_queryset(self):
+        return self._por_detalle(IncidenteArchivado.objects.select_related('det_alquiler', 'det_alquiler__producto'))
+
+    def _por_detalle(self, qs):
+        # ?det_alquiler=<id> (alta de incidentes: ver los existentes del detalle)
+        det = self.request.query_params.get('det_alquiler')
+        if det and det.isdigit():
+            qs = qs.filter(det_alquiler_id=int(det))
+        return qs
+
+    @action(detail=False, methods=['post'], url_path='resolver',
+            permission_classes=[IsAuthenticated, EsUsuarioAdministrador])
+    def resolver(self, request):
+        """
+        Cierre masivo: {"incidentes": [{id, resultado_final, cantidad_repuesta}, ...]}
+        Todo o nada; stock y contadores se actualizan con un UPDATE agrupado por producto.
+        """
+        lote = ResolucionLoteSerializer(data=request.data)
+        lote.is_valid(raise_exception=True)
+        resoluciones = lote.resoluciones()
+        try:
+            cerrados = resolver_en_lote(resoluciones)
+        except DjangoValidationError as exc:
+            return Response({'detail': exc.messages[0]}, status=status.HTTP_409_CONFLICT)
+
+        incidentes = list(self.get_queryset().filter(pk__in=list(resoluciones)))
+        productos = {i.det_alquiler.producto for i in incidentes}
+        publicar_varios(
+            [('incidente.resuelto', {'id': i.pk, 'det_alquiler': i.det_alquiler_id, 'estado': i.estado_incidente})
+             for i in incidentes]
+            + [('producto.stock', {'id': p.pk, 'stock': p.stock}) for p in productos]
+        )
+        return Response({
+            'resueltos': cerrados,
+            'incidentes': IncidenteSerializer(incidentes, many=True, context=self.get_serializer_context()).data,
+        })
@@ -0,0 +1,9 @@
+# jobs/admin.py
+from django.contrib import admin
+from .models import Job
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'tipo', 'estado', 'progreso', 'intentos', 'creado_en', 'terminado_en')
+    list_filter = ('estado', 'tipo')
+    readonly_fields = ('creado_en', 'iniciado_en', 'terminado_en')
@@ -0,0 +1,69 @@
+# jobs/management/commands/run_workers.py
+import multiprocessing
+import os
+import signal
+import socket
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from jobs.worker import loop
+
+_detener = False
+
+
+def _interrumpir(signum, frame):
+    raise KeyboardInterrupt
+
+
+def _proceso(worker_id, poll, una_vez, hijo=False):
+    def _on_term(signum, frame):
+        global _detener
+        _detener = True   # termina el job en curso y sale
+
+    signal.signal(signal.SIGTERM, _on_term)
+    # en los hijos el Ctrl+C lo maneja el padre (los termina con SIGTERM);
+    # con un solo proceso, Ctrl+C hace la misma parada ordenada
+    signal.signal(signal.SIGINT, signal.SIG_IGN if hijo else _on_term)
+    try:
+        loop(worker_id, poll=poll, una_vez=una_vez, detener=lambda: _detener)
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = "Ejecuta workers de la cola de jobs (base de datos, sin broker externo)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=2, help='Cantidad de procesos worker')
+        parser.add_argument('--poll', type=float, default=2.0, help='Segundos entre consultas con la cola vacía')
+        parser.add_argument('--once', action='store_true', help='Procesar lo pendiente y salir')
+
+    def handle(self, *args, **opts):
+        base = f"{socket.gethostname()}:{os.getpid()}"
+        n = max(1, opts['concurrency'])
+        self.stdout.write(f"Iniciando {n} worker(s) [{base}]")
+
+        if n == 1:
+            _proceso(f"{base}:0", opts['poll'], opts['once'])
+            return
+
+        # las conexiones abiertas no deben heredarse entre procesos
+        connections.close_all()
+        procesos = [
+            multiprocessing.Process(target=_proceso, args=(f"{base}:{i}", opts['poll'], opts['once'], True),
+                                    name=f"worker-{i}")
+            for i in range(n)
+        ]
+        for p in procesos:
+            p.start()
+        signal.signal(signal.SIGTERM, _interrumpir)
+        try:
+            for p in procesos:
+                p.join()
+        except KeyboardInterrupt:
+            self.stdout.write("Deteniendo workers (terminan el job en curso)...")
+            for p in procesos:
+                p.terminate()
+            for p in procesos:
+                p.join()
@@ -0,0 +1,60 @@
+# jobs/models.py
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    ESTADOS = (
+        ('pendiente', 'Pendiente'),
+        ('en_curso',  'En curso'),
+        ('ok',        'Terminado'),
+        ('error',     'Error'),
+    )
+
+    tipo          = models.CharField(max_length=100)     # nombre registrado con @tarea(...)
+    payload       = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
+    estado        = models.CharField(max_length=10, choices=ESTADOS, default='pendiente')
+
+    intentos      = models.PositiveIntegerField(default=0)
+    max_intentos  = models.PositiveIntegerField(default=3)
+    disponible_en = models.DateTimeField(default=timezone.now)   # backoff entre reintentos
+
+    progreso      = models.PositiveSmallIntegerField(default=0)  # 0-100
+    mensaje       = models.CharField(max_length=255, blank=True)
+    resultado     = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    error         = models.TextField(blank=True)
+
+    worker        = models.CharField(max_length=100, blank=True)
+    lease_hasta   = models.DateTimeField(null=True, blank=True)  # si vence, otro worker lo retoma
+
+    creado_por    = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='jobs')
+    creado_en     = models.DateTimeField(auto_now_add=True)
+    iniciado_en   = models.DateTimeField(null=True, blank=True)
+    terminado_en  = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-creado_en']
+        indexes = [
+            # dequeue: WHERE estado='pendiente' AND disponible_en <= now ORDER BY disponible_en
+            models.Index(fields=['estado', 'disponible_en'], name='job_cola_idx'),
+        ]
+
+    def __str__(self):
+        return f"Job #{self.pk} {self.tipo} ({self.get_estado_display()})"
+
+    def reportar_progreso(self, progreso, mensaje=''):
+        """
+        Actualiza progreso/mensaje y renueva el lease (el worker además lo
+        renueva solo con su heartbeat). UPDATE directo para no pisar otros campos.
+        """
+        self.progreso = max(0, min(100, int(progreso)))
+        self.mensaje = (mensaje or '')[:255]
+        self.lease_hasta = timezone.now() + timedelta(seconds=settings.JOBS_LEASE_SECONDS)
+        Job.objects.filter(pk=self.pk).update(
+            progreso=self.progreso, mensaje=self.mensaje, lease_hasta=self.lease_hasta
+        )
@@ -0,0 +1,37 @@
+# jobs/registro.py
+"""
+Registro de tareas para la cola de jobs.
+
+    # <app>/tareas.py
+    from jobs.registro import tarea
+
+    @tarea('alquileres.recalcular_totales')
+    def recalcular(job):
+        ...
+        job.reportar_progreso(50, 'mitad')
+        return {'corregidos': 3}     # queda en job.resultado
+
+    # encolar desde una vista
+    job = encolar('alquileres.recalcular_totales', {'chunk_size': 5000}, usuario=request.user)
+"""
+from .models import Job
+
+TAREAS = {}
+
+
+def tarea(nombre):
+    def decorador(fn):
+        TAREAS[nombre] = fn
+        return fn
+    return decorador
+
+
+def encolar(nombre, payload=None, usuario=None, max_intentos=3):
+    if nombre not in TAREAS:
+        raise KeyError(f"Tarea no registrada: {nombre}")
+    return Job.objects.create(
+        tipo=nombre,
+        payload=payload or {},
+        max_intentos=max_intentos,
+        creado_por=usuario if getattr(usuario, 'is_authenticated', False) else None,
+    )
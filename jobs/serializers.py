@@ -0,0 +1,39 @@
+# jobs/serializers.py
+from rest_framework import serializers
+from .models import Job
+from .registro import TAREAS, encolar
+
+
+class JobSerializer(serializers.ModelSerializer):
+    estado_display = serializers.CharField(source='get_estado_display', read_only=True)
+
+    class Meta:
+        model = Job
+        fields = (
+            'id', 'tipo', 'payload',
+            'estado', 'estado_display',
+            'progreso', 'mensaje', 'resultado', 'error',
+            'intentos', 'max_intentos', 'disponible_en',
+            'creado_en', 'iniciado_en', 'terminado_en',
+        )
+        read_only_fields = fields
+
+
+class JobCreacionSerializer(serializers.Serializer):
+    tipo         = serializers.CharField(max_length=100)
+    payload      = serializers.JSONField(required=False, default=dict)
+    max_intentos = serializers.IntegerField(required=False, default=3, min_value=1, max_value=10)
+
+    def validate_tipo(self, v):
+        if v not in TAREAS:
+            raise serializers.ValidationError(f"Tarea desconocida. Opciones: {', '.join(sorted(TAREAS))}")
+        return v
+
+    def create(self, validated_data):
+        request = self.context.get('request')
+        return encolar(validated_data['tipo'], validated_data.get('payload'),
+                       usuario=getattr(request, 'user', None),
+                       max_intentos=validated_data['max_intentos'])
+
+    def to_representation(self, instance):
+        return JobSerializer(instance).data
@@ -0,0 +1,36 @@
+import time
+
+from django.test import TransactionTestCase, override_settings
+
+from .models import Job
+from .registro import TAREAS, encolar
+from .worker import ejecutar, reclamar
+
+
+@override_settings(JOBS_LEASE_SECONDS=1, JOBS_HEARTBEAT_SECONDS=0.1)
+class HeartbeatTests(TransactionTestCase):
+
+    def setUp(self):
+        self.leases = []
+
+        def lenta(job):
+            # no llama a reportar_progreso: el lease lo renueva el worker
+            for _ in range(5):
+                time.sleep(0.3)
+                self.leases.append(Job.objects.values_list('lease_hasta', flat=True).get(pk=job.pk))
+            self.otro = reclamar('w2')   # ya pasó más que el lease
+            return {'ok': True}
+
+        TAREAS['tests.lenta'] = lenta
+        self.addCleanup(TAREAS.pop, 'tests.lenta')
+
+    def test_job_largo_no_pierde_el_lease(self):
+        encolar('tests.lenta')
+        job = reclamar('w1')
+        self.assertTrue(ejecutar(job, 'w1'))
+        # más largo que el lease y ningún otro worker lo retomó
+        self.assertIsNone(self.otro)
+        self.assertEqual(self.leases, sorted(self.leases))
+        self.assertGreater(self.leases[-1], self.leases[0])
+        job.refresh_from_db()
+        self.assertEqual((job.estado, job.intentos), ('ok', 1))
@@ -0,0 +1,40 @@
+# jobs/views.py
+from rest_framework import mixins, status, viewsets
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from empleados.permissions import EsUsuarioAdministrador
+from myproject.sparse import SparseFieldsMixin
+from .models import Job
+from .serializers import JobSerializer, JobCreacionSerializer
+
+
+class JobViewSet(SparseFieldsMixin, mixins.CreateModelMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    Estado de tareas en segundo plano (el frontend hace polling a /api/jobs/{id}/).
+    - GET: el creador del job o un administrador
+    - POST: solo administradores (encola una tarea registrada)
+    """
+    serializer_class = JobSerializer
+
+    def get_permissions(self):
+        if self.action == 'create':
+            return [IsAuthenticated(), EsUsuarioAdministrador()]
+        return [IsAuthenticated()]
+
+    def get_queryset(self):
+        qs = Job.objects.all()
+        if not EsUsuarioAdministrador().has_permission(self.request, self):
+            qs = qs.filter(creado_por=self.request.user)
+        return qs
+
+    def get_serializer_class(self):
+        if self.action == 'create':
+            return JobCreacionSerializer
+        return JobSerializer
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
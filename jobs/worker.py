@@ -0,0 +1,129 @@
+# jobs/worker.py
+"""
+Loop de los workers de la cola (ver manage.py run_workers).
+
+Dequeue seguro entre procesos sin broker: "claim-by-update".
+Cada worker elige candidatos y los toma con
+    UPDATE jobs_job SET estado='en_curso', ... WHERE id=? AND estado='pendiente'
+Solo uno de los UPDATE concurrentes afecta la fila; el resto prueba el siguiente.
+
+Mientras corre el handler, un thread de heartbeat renueva el lease cada
+JOBS_HEARTBEAT_SECONDS (no depende de que la tarea llame a reportar_progreso):
+un job largo no vence mientras su worker siga vivo, y si el proceso muere el
+lease vence solo y otro worker lo retoma.
+"""
+import logging
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, connection
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+from .registro import TAREAS
+
+logger = logging.getLogger(__name__)
+
+
+def _liberar_vencidos(ahora):
+    """ Jobs 'en_curso' cuyo worker murió (lease vencido): reintentar o marcar error. """
+    vencidos = Job.objects.filter(estado='en_curso', lease_hasta__lt=ahora)
+    vencidos.filter(intentos__gte=F('max_intentos')).update(
+        estado='error', error='Lease vencido (worker caído).', terminado_en=ahora, lease_hasta=None
+    )
+    vencidos.update(estado='pendiente', worker='', lease_hasta=None)
+
+
+def reclamar(worker_id):
+    ahora = timezone.now()
+    _liberar_vencidos(ahora)
+
+    candidatos = list(
+        Job.objects
+        .filter(estado='pendiente', disponible_en__lte=ahora)
+        .order_by('disponible_en', 'pk')
+        .values_list('pk', flat=True)[:10]
+    )
+    for pk in candidatos:
+        tomado = Job.objects.filter(pk=pk, estado='pendiente').update(
+            estado='en_curso',
+            worker=worker_id,
+            intentos=F('intentos') + 1,
+            iniciado_en=ahora,
+            lease_hasta=ahora + timedelta(seconds=settings.JOBS_LEASE_SECONDS),
+        )
+        if tomado:
+            return Job.objects.get(pk=pk)
+    return None
+
+
+def _renovar_lease(mio, detener):
+    try:
+        while not detener.wait(settings.JOBS_HEARTBEAT_SECONDS):
+            try:
+                if not mio.update(lease_hasta=timezone.now() + timedelta(seconds=settings.JOBS_LEASE_SECONDS)):
+                    logger.warning("Heartbeat: el job ya no es de este worker, se deja de renovar")
+                    return
+            except DatabaseError:
+                # p. ej. SQLite bloqueada por la transacción del handler: se reintenta en el próximo latido
+                logger.warning("Heartbeat: no se pudo renovar el lease", exc_info=True)
+    finally:
+        connection.close()   # conexión propia del thread
+
+
+@contextmanager
+def heartbeat(mio):
+    """ Renueva el lease de `mio` (queryset del job en curso) en un thread mientras dure el bloque. """
+    detener = threading.Event()
+    hilo = threading.Thread(target=_renovar_lease, args=(mio, detener), name='jobs-heartbeat', daemon=True)
+    hilo.start()
+    try:
+        yield
+    finally:
+        detener.set()
+        hilo.join()
+
+
+def ejecutar(job, worker_id):
+    # solo el worker dueño del job puede cerrarlo
+    mio = Job.objects.filter(pk=job.pk, worker=worker_id, estado='en_curso')
+    try:
+        fn = TAREAS.get(job.tipo)
+        if fn is None:
+            raise LookupError(f"Tarea no registrada: {job.tipo}")
+        with heartbeat(mio):
+            resultado = fn(job)
+    except Exception:
+        error = traceback.format_exc()
+        ahora = timezone.now()
+        logger.warning("Job #%s (%s) falló (intento %s/%s)", job.pk, job.tipo, job.intentos, job.max_intentos)
+        if job.intentos < job.max_intentos:
+            # backoff exponencial: base, 2*base, 4*base, ...
+            espera = settings.JOBS_BACKOFF_BASE * 2 ** (job.intentos - 1)
+            mio.update(estado='pendiente', error=error, worker='', lease_hasta=None,
+                       disponible_en=ahora + timedelta(seconds=espera))
+        else:
+            mio.update(estado='error', error=error, lease_hasta=None, terminado_en=ahora)
+        return False
+
+    mio.update(estado='ok', progreso=100, resultado=resultado, error='',
+               lease_hasta=None, terminado_en=timezone.now())
+    return True
+
+
+def loop(worker_id, poll=2.0, una_vez=False, detener=lambda: False):
+    """ Procesa jobs hasta que `detener()` sea True (o la cola quede vacía con una_vez). """
+    while not detener():
+        close_old_connections()
+        job = reclamar(worker_id)
+        if job is None:
+            if una_vez:
+                return
+            time.sleep(poll)
+            continue
+        ejecutar(job, worker_id)
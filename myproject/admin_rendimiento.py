@@ -0,0 +1,117 @@
+# myproject/admin_rendimiento.py
+"""
+Piezas para que el admin siga siendo usable con tablas grandes.
+
+- ConteoEstimadoPaginator: sin filtros usa la estimación del motor
+  (pg_class.reltuples / information_schema / MAX(rowid) en SQLite) si supera
+  ADMIN_CONTEO_EXACTO_MAX filas; con filtros cuenta con tope (COUNT sobre LIMIT).
+- ModelAdminRapido: usa ese paginator, no pide el conteo total extra del changelist
+  y permite buscar números por columnas indexadas (search_id_fields) en vez de
+  icontains/CAST sobre la tabla entera.
+- Los search_fields '^campo' (prefijo sin distinguir mayúsculas) se buscan como
+  rango sobre LOWER(campo), que sí usa un índice funcional Index(Lower('campo'));
+  el istartswith de Django (LIKE en SQLite, UPPER(..) LIKE en PostgreSQL) no
+  puede usar un índice btree común.
+"""
+import copy
+
+from django.conf import settings
+from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.db.models.lookups import GreaterThanOrEqual, LessThan, StartsWith
+from django.utils.functional import cached_property
+
+# LOWER() de SQLite solo cambia letras ASCII: el texto buscado se baja igual
+_ASCII_MINUSCULAS = str.maketrans('ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')
+
+
+def q_prefijo(campo, texto, using='default'):
+    """
+    Q de "campo empieza con texto" sin distinguir mayúsculas, sobre LOWER(campo):
+    LOWER(campo) >= 'tex' AND LOWER(campo) < 'tey' (rango por el índice) y
+    LIKE 'tex%' para descartar lo que el rango deja pasar con collations no binarias.
+    """
+    if connections[using].vendor == 'sqlite':
+        texto = texto.translate(_ASCII_MINUSCULAS)
+    else:
+        texto = texto.lower()
+    expr = Lower(campo)
+    q = Q(GreaterThanOrEqual(expr, texto), StartsWith(expr, texto))
+    if ord(texto[-1]) < 0x10FFFF:
+        q &= Q(LessThan(expr, texto[:-1] + chr(ord(texto[-1]) + 1)))
+    return q
+
+
+def _estimar_filas(model, using):
+    conn = connections[using]
+    tabla = model._meta.db_table
+    with conn.cursor() as cursor:
+        if conn.vendor == 'postgresql':
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [tabla])
+        elif conn.vendor == 'mysql':
+            cursor.execute("SELECT table_rows FROM information_schema.tables "
+                           "WHERE table_schema = DATABASE() AND table_name = %s", [tabla])
+        elif conn.vendor == 'sqlite':
+            # sin estadísticas: el rowid máximo es una búsqueda en el índice (ignora borrados)
+            cursor.execute(f'SELECT MAX(rowid) FROM {conn.ops.quote_name(tabla)}')
+        else:
+            return None
+        fila = cursor.fetchone()
+    return int(fila[0]) if fila and fila[0] is not None and fila[0] >= 0 else None
+
+
+class ConteoEstimadoPaginator(Paginator):
+    @cached_property
+    def count(self):
+        qs = self.object_list
+        limite = getattr(settings, 'ADMIN_CONTEO_EXACTO_MAX', 10000)
+        if not hasattr(qs, 'query'):
+            return super().count
+        if not qs.query.where:
+            estimado = _estimar_filas(qs.model, qs.db)
+            if estimado is not None and estimado > limite:
+                return estimado
+            return qs.count()
+        # filtrado: contar como mucho `limite` filas; más allá se muestra el tope
+        return qs.order_by()[:limite].count()
+
+
+class ModelAdminRapido(admin.ModelAdmin):
+    paginator = ConteoEstimadoPaginator
+    show_full_result_count = False   # evita un COUNT(*) extra sobre toda la tabla
+    list_per_page = 50
+    # búsqueda numérica (ej. "1234") por igualdad en columnas indexadas: ('pk', 'alquiler_id', ...);
+    # también se prueban los search_fields '=' (códigos de solo dígitos, ej. "7790001")
+    search_id_fields = ()
+
+    def get_search_results(self, request, queryset, search_term):
+        term = search_term.strip()
+        campos = self.get_search_fields(request)
+        if term.isdigit() and self.search_id_fields:
+            q = Q()
+            for campo in self.search_id_fields:
+                q |= Q(**{campo: int(term)})
+            # '=' es iexact; con dígitos equivale a la igualdad exacta, que sí usa el índice
+            for campo in campos:
+                if campo.startswith('='):
+                    q |= Q(**{campo[1:]: term})
+            return queryset.filter(q), False
+        prefijos = [c[1:] for c in campos if c.startswith('^')]
+        if not term or not prefijos:
+            return super().get_search_results(request, queryset, search_term)
+
+        q = Q()
+        for campo in prefijos:
+            q |= q_prefijo(campo, term, queryset.db)
+        resultado, duplicados = queryset.filter(q), False
+        resto = [c for c in campos if not c.startswith('^')]
+        # el autocomplete (widgets de FK) busca solo por prefijo, que es lo que usa índice
+        if resto and getattr(request.resolver_match, 'url_name', None) != 'autocomplete':
+            sin_prefijos = copy.copy(self)
+            sin_prefijos.search_fields = resto
+            otros, duplicados = admin.ModelAdmin.get_search_results(sin_prefijos, request, queryset, search_term)
+            resultado = resultado | otros
+        return resultado, duplicados
@@ -13,4 +13,6 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'myproject.settings')
 
+# Necesario para el stream SSE (/api/eventos/): cada conexión abierta es una
+# corrutina ociosa y no ocupa un thread. Ej.: uvicorn myproject.asgi:application
 application = get_asgi_application()
@@ -0,0 +1,87 @@
+# myproject/db_router.py
+"""
+Ruteo de lecturas entre la base principal ('default') y una réplica ('replica').
+
+- Por defecto TODO va a 'default' (escrituras y lecturas que siguen a una escritura).
+- Solo las lecturas marcadas como "replica-safe" (reportes, métricas, listados)
+  se mandan a 'replica', y solo si ese alias está configurado en DATABASES.
+- Dentro de una transacción abierta en 'default' nunca se lee de la réplica,
+  así un flujo "escribo y vuelvo a leer" ve sus propios cambios.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+REPLICA_ALIAS = 'replica'
+
+# ContextVar (y no threading.local) para que también funcione bajo ASGI
+_usar_replica = ContextVar('usar_replica', default=False)
+
+
+def replica_configurada() -> bool:
+    return REPLICA_ALIAS in settings.DATABASES
+
+
+@contextmanager
+def usar_replica(activo: bool = True):
+    """
+    Marca las lecturas del bloque como aptas para la réplica.
+        with usar_replica():
+            Alquiler.objects.count()
+    """
+    token = _usar_replica.set(bool(activo))
+    try:
+        yield
+    finally:
+        _usar_replica.reset(token)
+
+
+class PrimaryReplicaRouter:
+    """ Router para DATABASE_ROUTERS. """
+
+    def db_for_read(self, model, **hints):
+        # Objetos ya cargados: seguir en la base de la que vinieron
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            return instance._state.db
+
+        if not _usar_replica.get() or not replica_configurada():
+            return 'default'
+
+        # read-after-write: si hay transacción en curso, leer del primario
+        if connections['default'].in_atomic_block:
+            return 'default'
+        return REPLICA_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # primario y réplica tienen los mismos datos
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return None
+
+
+class ReplicaSafeMixin:
+    """
+    Mixin para vistas DRF. Las acciones de solo lectura listadas en
+    `replica_actions` corren con usar_replica() activo.
+    En APIView sin acciones (p.ej. dashboard) aplica a todo GET/HEAD.
+    """
+    replica_actions = ('list',)
+
+    def _lectura_apta_replica(self, request) -> bool:
+        if request.method not in ('GET', 'HEAD'):
+            return False
+        action_map = getattr(self, 'action_map', None)
+        if action_map is None:
+            return True
+        return action_map.get(request.method.lower()) in self.replica_actions
+
+    def dispatch(self, request, *args, **kwargs):
+        with usar_replica(self._lectura_apta_replica(request)):
+            return super().dispatch(request, *args, **kwargs)
@@ -0,0 +1,17 @@
+# myproject/media.py
+"""
+Servir MEDIA_ROOT desde Django. Los archivos de productos/ tienen nombre = hash
+del contenido, así que pueden cachearse para siempre (immutable).
+En producción conviene que lo sirva el web server con el mismo header.
+"""
+from django.conf import settings
+from django.views.static import serve
+
+CACHE_INMUTABLE = 'public, max-age=31536000, immutable'
+
+
+def serve_media(request, path):
+    response = serve(request, path, document_root=settings.MEDIA_ROOT)
+    if path.startswith('productos/'):
+        response['Cache-Control'] = CACHE_INMUTABLE
+    return response
@@ -0,0 +1,166 @@
+# myproject/middleware.py
+"""
+Compresión gzip/brotli negociada por Accept-Encoding.
+
+Configurable en settings:
+  COMPRESSION_MIN_SIZE       bytes mínimos para comprimir (respuestas no-streaming)
+  COMPRESSION_PATH_PREFIXES  solo se comprimen las rutas con estos prefijos
+  COMPRESSION_CONTENT_TYPES  tipos de contenido permitidos (sin parámetros)
+  COMPRESSION_GZIP_LEVEL     1-9
+  COMPRESSION_BROTLI_QUALITY 0-11 (solo si el paquete `brotli` está instalado)
+
+Las respuestas streaming (exportes) se comprimen por bloques, sin armar el body completo.
+HTML no se comprime: no se agrega relleno aleatorio contra BREACH (como el
+GZipMiddleware de Django), y las páginas con token CSRF quedan fuera.
+"""
+import gzip
+import zlib
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.regex_helper import _lazy_re_compile
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depende del entorno
+    brotli = None
+
+DEFAULT_PATH_PREFIXES = ('/api/',)
+DEFAULT_CONTENT_TYPES = (
+    'application/json',
+    'text/csv',
+    'text/plain',
+)
+
+_accept_re = _lazy_re_compile(r'\s*([^\s;,]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?')
+
+
+def _aceptadas(accept_encoding: str) -> dict:
+    """ 'gzip, br;q=0.8' -> {'gzip': 1.0, 'br': 0.8} """
+    res = {}
+    for parte in accept_encoding.split(','):
+        m = _accept_re.match(parte)
+        if not m:
+            continue
+        try:
+            q = float(m.group(2)) if m.group(2) else 1.0
+        except ValueError:
+            q = 0.0
+        res[m.group(1).lower()] = q
+    return res
+
+
+class _GzipCodec:
+    nombre = 'gzip'
+
+    def __init__(self, level):
+        self.level = level
+
+    def comprimir(self, data: bytes) -> bytes:
+        return gzip.compress(data, compresslevel=self.level, mtime=0)
+
+    def compresor(self):
+        # wbits 16+MAX_WBITS => formato gzip (con header/trailer)
+        obj = zlib.compressobj(self.level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        return (lambda b: obj.compress(b) + obj.flush(zlib.Z_SYNC_FLUSH)), obj.flush
+
+
+class _BrotliCodec:
+    nombre = 'br'
+
+    def __init__(self, quality):
+        self.quality = quality
+
+    def comprimir(self, data: bytes) -> bytes:
+        return brotli.compress(data, quality=self.quality)
+
+    def compresor(self):
+        obj = brotli.Compressor(quality=self.quality)
+        return (lambda b: obj.process(b) + obj.flush()), obj.finish
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.min_size = getattr(settings, 'COMPRESSION_MIN_SIZE', 1024)
+        self.path_prefixes = tuple(getattr(settings, 'COMPRESSION_PATH_PREFIXES', DEFAULT_PATH_PREFIXES))
+        self.content_types = frozenset(
+            getattr(settings, 'COMPRESSION_CONTENT_TYPES', DEFAULT_CONTENT_TYPES)
+        )
+        self.gzip = _GzipCodec(getattr(settings, 'COMPRESSION_GZIP_LEVEL', 6))
+        self.brotli = (
+            _BrotliCodec(getattr(settings, 'COMPRESSION_BROTLI_QUALITY', 5))
+            if brotli is not None else None
+        )
+
+    def _elegir_codec(self, request):
+        """ El de mayor q (>0) entre los disponibles; a igual q, brotli. """
+        aceptadas = _aceptadas(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        comodin = aceptadas.get('*', 0)
+        candidatos = [(aceptadas.get('gzip', comodin), 0, self.gzip)]
+        if self.brotli:
+            candidatos.append((aceptadas.get('br', comodin), 1, self.brotli))
+        q, _, codec = max(candidatos, key=lambda c: c[:2])
+        return codec if q > 0 else None
+
+    def process_response(self, request, response):
+        if response.has_header('Content-Encoding') or response.status_code < 200 \
+                or response.status_code in (204, 304):
+            return response
+
+        if not request.path.startswith(self.path_prefixes):
+            return response
+
+        content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type not in self.content_types:
+            return response
+
+        if not response.streaming and len(response.content) < self.min_size:
+            return response
+
+        # A partir de acá la respuesta depende de Accept-Encoding
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        codec = self._elegir_codec(request)
+        if codec is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = self._comprimir_async(codec, response.streaming_content)
+            else:
+                response.streaming_content = self._comprimir_stream(codec, response.streaming_content)
+            del response.headers['Content-Length']
+        else:
+            comprimido = codec.comprimir(response.content)
+            if len(comprimido) >= len(response.content):
+                return response
+            response.content = comprimido
+            response.headers['Content-Length'] = str(len(comprimido))
+
+        # un ETag fuerte ya no corresponde al body comprimido
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+
+        response.headers['Content-Encoding'] = codec.nombre
+        return response
+
+    @staticmethod
+    def _comprimir_stream(codec, chunks):
+        procesar, terminar = codec.compresor()
+        for chunk in chunks:
+            data = procesar(chunk)
+            if data:
+                yield data
+        yield terminar()
+
+    @staticmethod
+    async def _comprimir_async(codec, chunks):
+        procesar, terminar = codec.compresor()
+        async for chunk in chunks:
+            data = procesar(chunk)
+            if data:
+                yield data
+        yield terminar()
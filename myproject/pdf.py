@@ -0,0 +1,81 @@
+# myproject/pdf.py
+"""
+PDF mínimo sin dependencias: texto monoespaciado (Courier), A4, una o más
+páginas, streams comprimidos. Alcanza para comprobantes y remitos que se
+arman con un template de texto (alquileres/comprobantes.py).
+
+    pdf = documento_pdf(paginar(lineas), titulo='Remito 123')
+"""
+import zlib
+
+ANCHO, ALTO = 595, 842          # A4 en puntos
+MARGEN = 40
+TAMANO = 9                       # Courier 9pt: 0.6 * 9 = 5.4pt por carácter
+INTERLINEA = 11
+COLUMNAS = int((ANCHO - 2 * MARGEN) / (0.6 * TAMANO))      # 95
+LINEAS_POR_PAGINA = int((ALTO - 2 * MARGEN) / INTERLINEA)  # 69
+
+
+def paginar(lineas, por_pagina=LINEAS_POR_PAGINA):
+    """ Corta en páginas; un form feed (\\f) fuerza salto de página. """
+    paginas, actual = [], []
+    for linea in lineas:
+        if linea.startswith('\f'):
+            paginas.append(actual)
+            actual, linea = [], linea[1:]
+        actual.append(linea[:COLUMNAS])
+        if len(actual) == por_pagina:
+            paginas.append(actual)
+            actual = []
+    if actual or not paginas:
+        paginas.append(actual)
+    return paginas
+
+
+def _texto(s):
+    crudo = s.encode('cp1252', errors='replace')
+    return crudo.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)')
+
+
+def _contenido(lineas):
+    partes = [b'BT /F1 %d Tf %d TL %d %d Td' % (TAMANO, INTERLINEA, MARGEN, ALTO - MARGEN - TAMANO)]
+    for linea in lineas:
+        partes.append(b'(' + _texto(linea) + b') Tj T*')
+    partes.append(b'ET')
+    return zlib.compress(b'\n'.join(partes))
+
+
+def documento_pdf(paginas, titulo=''):
+    objetos = []   # cuerpo de cada objeto; el número es índice + 1
+
+    def agregar(cuerpo):
+        objetos.append(cuerpo)
+        return len(objetos)
+
+    catalogo = agregar(None)
+    raiz_paginas = agregar(None)
+    fuente = agregar(b'<< /Type /Font /Subtype /Type1 /BaseFont /Courier /Encoding /WinAnsiEncoding >>')
+    hijos = []
+    for lineas in paginas:
+        stream = _contenido(lineas)
+        contenido = agregar(b'<< /Length %d /Filter /FlateDecode >>\nstream\n' % len(stream) + stream + b'\nendstream')
+        hijos.append(agregar(
+            b'<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] /Resources << /Font << /F1 %d 0 R >> >> '
+            b'/Contents %d 0 R >>' % (raiz_paginas, ANCHO, ALTO, fuente, contenido)))
+    objetos[catalogo - 1] = b'<< /Type /Catalog /Pages %d 0 R >>' % raiz_paginas
+    objetos[raiz_paginas - 1] = b'<< /Type /Pages /Kids [%s] /Count %d >>' % (
+        b' '.join(b'%d 0 R' % h for h in hijos), len(hijos))
+    info = agregar(b'<< /Title (' + _texto(titulo) + b') /Producer (myproject.pdf) >>')
+
+    salida = bytearray(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+    posiciones = []
+    for numero, cuerpo in enumerate(objetos, start=1):
+        posiciones.append(len(salida))
+        salida += b'%d 0 obj\n' % numero + cuerpo + b'\nendobj\n'
+    xref = len(salida)
+    salida += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objetos) + 1)
+    for pos in posiciones:
+        salida += b'%010d 00000 n \n' % pos
+    salida += b'trailer\n<< /Size %d /Root %d 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (
+        len(objetos) + 1, catalogo, info, xref)
+    return bytes(salida)
@@ -0,0 +1,110 @@
+# myproject/planes.py
+"""
+Captura de SQL + plan de ejecución, para los tests de regresión de planes
+(myproject/tests_planes.py).
+
+    with CapturaSQL() as captura:
+        client.get('/api/alquileres/')
+    for consulta in captura.planes():
+        consulta.scans_completos()   # {tabla: índice o None} leídas enteras
+
+Soporta SQLite (EXPLAIN QUERY PLAN) y PostgreSQL (EXPLAIN). Un recorrido
+completo de un índice (SCAN t USING INDEX i / Index Scan sin Index Cond)
+también cuenta como scan completo.
+"""
+import re
+
+from django.db import connections
+
+# SCAN t | SCAN t USING [COVERING] INDEX i | SCAN t USING INTEGER PRIMARY KEY
+_SCAN_SQLITE = re.compile(r'^SCAN (\w+)(?: AS \w+)?(?: USING (?:COVERING )?INDEX (\w+)| USING (INTEGER PRIMARY KEY))?$')
+_SCAN_PG = re.compile(r'Seq Scan on (\w+)')
+_INDEX_SCAN_PG = re.compile(r'Index (?:Only )?Scan (?:Backward )?using (\w+) on (\w+)')
+# alias de Django en subconsultas/joins repetidos: FROM "tabla" U0 / INNER JOIN "tabla" T3
+_ALIAS = re.compile(r'(?:FROM|JOIN) "(\w+)" (?:AS )?"?([A-Z]\d+)"?')
+_PARAMS_SEGUIDOS = re.compile(r'%s(?:, %s)+')
+
+
+class Consulta:
+    def __init__(self, sql, params, plan, vendor):
+        self.sql, self.params, self.plan, self.vendor = sql, params, plan, vendor
+
+    def scans_completos(self):
+        """ {tabla: índice recorrido entero, o None si se lee la tabla} de lo que el plan recorre completo. """
+        alias = dict((a, t) for t, a in _ALIAS.findall(self.sql))
+        scans = {}
+        if self.vendor == 'postgresql':
+            for i, linea in enumerate(self.plan):
+                m = _SCAN_PG.search(linea)
+                if m:
+                    scans[m.group(1)] = None
+                m = _INDEX_SCAN_PG.search(linea)
+                if m and not self._con_condicion_pg(i):
+                    scans.setdefault(m.group(2), m.group(1))
+        else:
+            for linea in self.plan:
+                m = _SCAN_SQLITE.search(linea.strip())
+                if m:
+                    scans[alias.get(m.group(1), m.group(1))] = m.group(2) or m.group(3)
+        return scans
+
+    def _con_condicion_pg(self, i):
+        # los detalles del nodo (Index Cond, Filter, ...) siguen hasta el próximo "->"
+        for linea in self.plan[i + 1:]:
+            if '->' in linea:
+                return False
+            if 'Index Cond' in linea:
+                return True
+        return False
+
+    def sql_normalizado(self):
+        # IN (%s, %s, ... %s) -> IN (%s, ...) para que el snapshot no dependa del volumen
+        return _PARAMS_SEGUIDOS.sub('%s, ...', self.sql)
+
+    def __str__(self):
+        return '\n'.join([self.sql_normalizado()] + [f'  {linea}' for linea in self.plan])
+
+
+def explicar(sql, params, using='default'):
+    conn = connections[using]
+    with conn.cursor() as cursor:
+        if conn.vendor == 'sqlite':
+            cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+            filas = cursor.fetchall()
+            profundidad = {0: -1}
+            lineas = []
+            for id_, padre, _, detalle in filas:
+                profundidad[id_] = profundidad.get(padre, -1) + 1
+                lineas.append('  ' * profundidad[id_] + detalle)
+            return lineas
+        if conn.vendor == 'postgresql':
+            cursor.execute('EXPLAIN (COSTS OFF) ' + sql, params)
+            return [fila[0] for fila in cursor.fetchall()]
+    raise NotImplementedError(f'EXPLAIN no soportado para {conn.vendor}')
+
+
+class CapturaSQL:
+    """ Registra (sql, params) de cada SELECT/UPDATE/DELETE ejecutado en el bloque. """
+    VERBOS = ('SELECT', 'UPDATE', 'DELETE')
+
+    def __init__(self, using='default'):
+        self.using = using
+        self.ejecutadas = []
+
+    def __call__(self, execute, sql, params, many, context):
+        if not many and sql.lstrip().upper().startswith(self.VERBOS):
+            self.ejecutadas.append((sql, tuple(params or ())))
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        self._wrapper = connections[self.using].execute_wrapper(self)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self._wrapper.__exit__(*exc)
+
+    def planes(self):
+        vendor = connections[self.using].vendor
+        return [Consulta(sql, params, explicar(sql, params, self.using), vendor)
+                for sql, params in self.ejecutadas]
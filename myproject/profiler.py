@@ -0,0 +1,189 @@
+# myproject/profiler.py
+"""
+Profiler de requests a demanda.
+
+Se activa si:
+  - un administrador (EsUsuarioAdministrador) manda el header `X-Profile: 1`, o
+  - random() < PROFILER_SAMPLE_RATE (0 por defecto = nunca).
+Si no, el middleware solo mira un header y un float: costo ~0.
+
+Durante el request:
+  - un thread muestrea la pila del thread del request cada PROFILER_INTERVALO_MS
+    y arma stacks colapsados ("mod:func;mod:func N"), el formato de entrada
+    de flamegraph.pl / speedscope;
+  - un execute_wrapper registra la línea de tiempo de SQL.
+
+Se guarda en PROFILER_DIR como <id>.folded + <id>.json, con un máximo de
+PROFILER_MAX_PERFILES (los más viejos se borran). Listado: /api/perfiles/.
+"""
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+
+from accounts.revocacion import JWTAuthenticationRevocable
+from empleados.permissions import EsUsuarioAdministrador
+
+HEADER = 'HTTP_X_PROFILE'
+SQL_MAX = 2000   # consultas registradas por perfil
+
+
+def _dir():
+    return settings.PROFILER_DIR
+
+
+class _Muestreador(threading.Thread):
+    def __init__(self, thread_id, intervalo):
+        super().__init__(name='profiler', daemon=True)
+        self.objetivo, self.intervalo = thread_id, intervalo
+        self.pilas = Counter()
+        self.muestras = 0
+        self._fin = threading.Event()
+
+    def run(self):
+        propio = threading.get_ident()
+        while not self._fin.wait(self.intervalo):
+            frame = sys._current_frames().get(self.objetivo)
+            if frame is None or self.objetivo == propio:
+                continue
+            pila = []
+            while frame is not None:
+                pila.append(f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_qualname}")
+                frame = frame.f_back
+            self.pilas[';'.join(reversed(pila))] += 1
+            self.muestras += 1
+
+    def detener(self):
+        self._fin.set()
+        self.join()
+
+
+class _LineaSQL:
+    def __init__(self, t0):
+        self.t0, self.consultas = t0, []
+
+    def __call__(self, execute, sql, params, many, context):
+        inicio = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            if len(self.consultas) < SQL_MAX:
+                fin = time.perf_counter()
+                self.consultas.append({
+                    'alias': context['connection'].alias,
+                    'inicio_ms': round((inicio - self.t0) * 1000, 3),
+                    'duracion_ms': round((fin - inicio) * 1000, 3),
+                    'sql': sql[:1000],
+                })
+
+
+def _es_admin(request):
+    user = getattr(request, 'user', None)
+    if not getattr(user, 'is_authenticated', False):
+        try:
+            res = JWTAuthenticationRevocable().authenticate(request)
+        except (InvalidToken, TokenError, AuthenticationFailed):
+            return False
+        user = res[0] if res else None
+    return bool(user) and EsUsuarioAdministrador().has_permission(SimpleNamespace(user=user), None)
+
+
+def _guardar(perfil, pilas):
+    carpeta = _dir()
+    os.makedirs(carpeta, exist_ok=True)
+    base = os.path.join(carpeta, perfil['id'])
+    with open(base + '.folded', 'w', encoding='utf-8') as f:
+        f.writelines(f'{pila} {n}\n' for pila, n in pilas.most_common())
+    with open(base + '.json', 'w', encoding='utf-8') as f:
+        json.dump(perfil, f, ensure_ascii=False)
+
+    # ring buffer: quedarse con los últimos N
+    ids = sorted(n[:-5] for n in os.listdir(carpeta) if n.endswith('.json'))
+    for viejo in ids[:-settings.PROFILER_MAX_PERFILES]:
+        for ext in ('.json', '.folded'):
+            try:
+                os.remove(os.path.join(carpeta, viejo + ext))
+            except FileNotFoundError:
+                pass
+
+
+def listar_perfiles():
+    carpeta = _dir()
+    if not os.path.isdir(carpeta):
+        return []
+    perfiles = []
+    for nombre in sorted(os.listdir(carpeta), reverse=True):
+        if nombre.endswith('.json'):
+            try:
+                with open(os.path.join(carpeta, nombre), encoding='utf-8') as f:
+                    perfil = json.load(f)
+            except (OSError, ValueError):
+                continue   # rotado/escribiéndose
+            perfil.pop('sql', None)
+            perfiles.append(perfil)
+    return perfiles
+
+
+def ruta_perfil(perfil_id, ext):
+    """ Path del archivo o None (perfil_id se valida: solo dígitos y '-'). """
+    if not perfil_id or not all(c.isdigit() or c == '-' for c in perfil_id):
+        return None
+    ruta = os.path.join(_dir(), perfil_id + ext)
+    return ruta if os.path.exists(ruta) else None
+
+
+class ProfilerMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        motivo = None
+        if HEADER in request.META and _es_admin(request):
+            motivo = 'header'
+        elif settings.PROFILER_SAMPLE_RATE and random.random() < settings.PROFILER_SAMPLE_RATE:
+            motivo = 'muestreo'
+        if motivo is None:
+            return self.get_response(request)
+        return self._perfilar(request, motivo)
+
+    def _perfilar(self, request, motivo):
+        t0 = time.perf_counter()
+        muestreador = _Muestreador(threading.get_ident(), settings.PROFILER_INTERVALO_MS / 1000)
+        linea = _LineaSQL(t0)
+        muestreador.start()
+        try:
+            with connections['default'].execute_wrapper(linea):
+                response = self.get_response(request)
+        finally:
+            muestreador.detener()
+        duracion = time.perf_counter() - t0
+
+        perfil_id = f"{time.time_ns()}-{os.getpid()}"
+        user = getattr(request, 'user', None)
+        _guardar({
+            'id': perfil_id,
+            'creado_en': timezone.now().isoformat(),
+            'motivo': motivo,
+            'metodo': request.method,
+            'path': request.get_full_path()[:500],
+            'status': response.status_code,
+            'usuario': user.get_username() if getattr(user, 'is_authenticated', False) else None,
+            'duracion_ms': round(duracion * 1000, 3),
+            'muestras': muestreador.muestras,
+            'intervalo_ms': settings.PROFILER_INTERVALO_MS,
+            'sql_cantidad': len(linea.consultas),
+            'sql_total_ms': round(sum(c['duracion_ms'] for c in linea.consultas), 3),
+            'sql': linea.consultas,
+        }, muestreador.pilas)
+        response['X-Profile-Id'] = perfil_id
+        return response
@@ -0,0 +1,101 @@
+# myproject/renderers.py
+"""
+Renderer/parser JSON rápidos para DRF.
+
+Usan orjson si está instalado; si no, caen al JSONRenderer/JSONParser de DRF
+(json de la stdlib) con el mismo encoder, así la salida es la misma en ambos casos:
+  - Decimal  -> string (igual que los DecimalField de los serializers)
+  - datetime aware -> ISO 8601 en la zona horaria actual (America/Argentina/Buenos_Aires)
+  - lazy strings (gettext_lazy) -> str
+
+PDFRenderer: para acciones que devuelven PDF (comprobante de alquiler).
+"""
+import datetime
+import decimal
+
+from django.utils import timezone
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende del entorno
+    orjson = None
+
+
+class FastJSONEncoder(encoders.JSONEncoder):
+    """ Encoder de DRF con Decimal como string y datetimes en hora local. """
+
+    def default(self, obj):
+        if isinstance(obj, decimal.Decimal):
+            return str(obj)
+        if isinstance(obj, datetime.datetime) and timezone.is_aware(obj):
+            obj = timezone.localtime(obj)
+        return super().default(obj)
+
+
+_default = FastJSONEncoder().default
+
+if orjson is not None:
+    # datetimes pasan por _default para respetar el formato de DRF ('Z', hora local)
+    _ORJSON_OPTS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+
+class FastJSONRenderer(JSONRenderer):
+    encoder_class = FastJSONEncoder
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # orjson solo indenta a 2; para ?indent=N (API navegable) usamos el de DRF
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=_default, option=_ORJSON_OPTS)
+        except orjson.JSONEncodeError:
+            # tipos raros (enteros > 64 bits, etc.): que decida el encoder de DRF
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # igual que DRF: JSON que sea subconjunto estricto de JavaScript
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+
+class FastJSONParser(JSONParser):
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding') or 'utf-8'
+        if orjson is None or encoding.lower().replace('_', '-') not in ('utf-8', 'utf8'):
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
+
+
+class PDFRenderer(BaseRenderer):
+    """
+    Para acciones que devuelven PDF (?format=pdf / Accept: application/pdf).
+    El éxito ya viene como bytes o FileResponse; los errores (404, 429...) se
+    devuelven como JSON aunque se haya negociado PDF.
+    """
+    media_type = 'application/pdf'
+    format = 'pdf'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, bytes):
+            return data
+        response = (renderer_context or {}).get('response')
+        if response is not None:
+            response['Content-Type'] = 'application/json'
+        return FastJSONRenderer().render(data, 'application/json', renderer_context)
@@ -1,5 +1,7 @@
+import os
 from pathlib import Path
 from datetime import timedelta
+from corsheaders.defaults import default_headers
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -27,10 +29,19 @@ INSTALLED_APPS = [
     'incidentes',
     'alquileres',
     'clientes',
+    'jobs',
+    'eventos',
+    'sincronizacion',
+    'archivo',
+    'outbox',
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+
+    # gzip/brotli negociado (listados JSON grandes, exportes streaming)
+    'myproject.middleware.CompressionMiddleware',
+
     'django.contrib.sessions.middleware.SessionMiddleware',
 
     # CORS (debe ir antes de CommonMiddleware)
@@ -39,10 +50,27 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+
+    # profiling a demanda (X-Profile de un admin o muestreo); ver myproject/profiler.py
+    'myproject.profiler.ProfilerMiddleware',
+
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# --- Compresión de respuestas (myproject.middleware.CompressionMiddleware) ---
+COMPRESSION_MIN_SIZE = 1024
+# solo la API y sin text/html: las páginas con token CSRF (admin, login, API
+# navegable) no se comprimen, que sin relleno aleatorio quedarían expuestas a BREACH
+COMPRESSION_PATH_PREFIXES = ('/api/',)
+COMPRESSION_CONTENT_TYPES = (
+    'application/json',
+    'text/csv',
+    'text/plain',
+)
+COMPRESSION_GZIP_LEVEL = 6
+COMPRESSION_BROTLI_QUALITY = 5   # requiere `pip install brotli`; sin él, solo gzip
+
 ROOT_URLCONF = 'myproject.urls'
 
 TEMPLATES = [
@@ -63,27 +91,75 @@ TEMPLATES = [
 WSGI_APPLICATION = 'myproject.wsgi.application'
 
 # --- Base de datos: por ahora SQLite (más abajo te paso MySQL) ---
+# Conexiones persistentes: se reutilizan entre requests en vez de abrir una
+# por request. CONN_HEALTH_CHECKS descarta las que el server haya cerrado.
+# (Con MySQL/Postgres, alinear DB_CONN_MAX_AGE con el wait_timeout del server.)
+DB_CONN_MAX_AGE = int(os.environ.get('DB_CONN_MAX_AGE', '60'))
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Réplica de lectura para reportes/listados (opcional).
+# Local: DB_REPLICA_NAME=/ruta/replica.sqlite3 (copia de db.sqlite3).
+if os.environ.get('DB_REPLICA_NAME'):
+    DATABASES['replica'] = {
+        'ENGINE': os.environ.get('DB_REPLICA_ENGINE', 'django.db.backends.sqlite3'),
+        'NAME': os.environ['DB_REPLICA_NAME'],
+        'HOST': os.environ.get('DB_REPLICA_HOST', ''),
+        'PORT': os.environ.get('DB_REPLICA_PORT', ''),
+        'USER': os.environ.get('DB_REPLICA_USER', ''),
+        'PASSWORD': os.environ.get('DB_REPLICA_PASSWORD', ''),
+        'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': True,
+        # en tests la réplica es la misma base que default
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['myproject.db_router.PrimaryReplicaRouter']
+
 # --- DRF + JWT ---
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # JWTAuthentication + revocación (accounts/revocacion.py)
+        'accounts.revocacion.JWTAuthenticationRevocable',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    # token buckets por usuario y scope (myproject/throttling.py)
+    'DEFAULT_THROTTLE_CLASSES': (
+        'myproject.throttling.ScopedBucketThrottle',
+    ),
+    'DEFAULT_THROTTLE_RATES': {
+        'detalle': '600/min',
+        'escritura': '120/min',
+        'listado': '120/min',
+        'reporte': '20/min',
+        'exportar': '10/min',
+    },
+    # JSON con orjson si está instalado (fallback a json de la stdlib)
+    'DEFAULT_RENDERER_CLASSES': (
+        'myproject.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'myproject.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
 }
 
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
     'AUTH_HEADER_TYPES': ('Bearer',),
+    'TOKEN_REFRESH_SERIALIZER': 'accounts.revocacion.TokenRefreshRevocableSerializer',
 }
 
 # --- Internacionalización ---
@@ -95,16 +171,88 @@ USE_TZ = True
 # --- Static ---
 STATIC_URL = 'static/'
 
+# --- Media (imágenes subidas de productos) ---
+MEDIA_URL = '/media/'
+MEDIA_ROOT = BASE_DIR / 'media'
+PRODUCTOS_IMAGEN_MAX_BYTES = 10 * 1024 * 1024
+PRODUCTOS_THUMB_SIZES = (96, 320, 800)   # lado máximo en px de cada miniatura
+PRODUCTOS_IMPORTACION_LOTE = 1000         # filas por upsert en la importación de catálogo (CSV)
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # --- CORS para tu React local ---
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
 ]
+# concurrencia optimista (myproject/versionado.py): el front lee ETag y manda If-Match
+CORS_ALLOW_HEADERS = (*default_headers, 'if-match')
+CORS_EXPOSE_HEADERS = ['ETag']
+
+# --- Cola de jobs (app jobs, workers: manage.py run_workers) ---
+JOBS_LEASE_SECONDS = 300   # sin heartbeat en este tiempo, el job vuelve a la cola
+JOBS_HEARTBEAT_SECONDS = 60   # el worker renueva el lease del job en curso (thread aparte)
+JOBS_BACKOFF_BASE = 10     # segundos; reintentos a 10s, 20s, 40s...
+
+# --- Eventos SSE (app eventos, /api/eventos/; mejor con ASGI: uvicorn myproject.asgi:application) ---
+EVENTOS_POLL_INTERVAL = 1.0     # segundos entre lecturas de la tabla de eventos (una por proceso)
+EVENTOS_HEARTBEAT = 15          # segundos sin eventos antes de mandar un ping
+EVENTOS_RETENCION_HORAS = 24    # cuánto se guardan para reconexiones con Last-Event-ID
+EVENTOS_WSGI_DURACION = 60      # bajo WSGI cada stream ocupa un thread: se corta y el cliente reconecta
+
+# --- Delta-sync (/api/sync/) ---
+SYNC_MARGEN_SEGUNDOS = 5     # se relee este margen antes del token (commits tardíos)
+SYNC_TOMBSTONES_DIAS = 30    # tokens más viejos => sync completo
+
+# Admin: por encima de esto el changelist muestra conteos estimados (myproject/admin_rendimiento.py)
+ADMIN_CONTEO_EXACTO_MAX = 10000
+
+# --- Outbox hacia el sistema contable (app outbox, manage.py run_outbox) ---
+OUTBOX_TRANSPORTE = os.environ.get('OUTBOX_TRANSPORTE', 'outbox.transportes.LogTransporte')
+OUTBOX_HTTP_URL = os.environ.get('OUTBOX_HTTP_URL', 'http://127.0.0.1:8765/')   # outbox_receptor en local
+OUTBOX_HTTP_TOKEN = os.environ.get('OUTBOX_HTTP_TOKEN', '')
+OUTBOX_HTTP_TIMEOUT = 10       # segundos
+OUTBOX_LOTE = 50               # mensajes por envío
+OUTBOX_MAX_INTENTOS = 10       # después queda en 'error' y frena su agregado
+OUTBOX_BACKOFF_BASE = 5        # segundos; 5, 10, 20, ... hasta OUTBOX_BACKOFF_MAX
+OUTBOX_BACKOFF_MAX = 900
+OUTBOX_RETENCION_DIAS = 7      # enviados más viejos se borran
+
+# --- Comprobantes PDF (alquileres/comprobantes.py, manage.py comprobantes_del_dia) ---
+COMPROBANTES_DIR = BASE_DIR / 'comprobantes'   # cache en disco, un archivo por (alquiler, tipo, contenido)
 
-CACHES = {
-    "default": {
-        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
-        "LOCATION": "auth-rate-limit",
+# --- Revocación de JWT (accounts/revocacion.py) ---
+REVOCACION_REFRESCO_SEGUNDOS = 5     # cada cuánto cada proceso lee revocaciones nuevas
+REVOCACION_BLOOM_BITS = 2 ** 20      # 128 KB por proceso; ~1% de falsos positivos con 100k claves
+REVOCACION_BLOOM_HASHES = 7
+REVOCACION_BLOOM_CAPACIDAD = 100_000 # pasado esto el filtro se rearma solo con las vigentes
+
+# --- Throttling (myproject/throttling.py) ---
+THROTTLE_REDIS_URL = os.environ.get('REDIS_URL')            # buckets en Redis (script Lua)
+THROTTLE_SQLITE_PATH = BASE_DIR / 'throttle.sqlite3'         # si no: SQLite local compartido por los workers
+
+# --- Profiler a demanda (myproject/profiler.py, /api/perfiles/) ---
+PROFILER_DIR = BASE_DIR / 'perfiles'   # ring buffer de capturas (.folded + .json)
+PROFILER_MAX_PERFILES = 50             # se borran las más viejas
+PROFILER_SAMPLE_RATE = 0.0             # fracción de requests perfilados sin header (0 = solo a demanda)
+PROFILER_INTERVALO_MS = 5              # cada cuánto se muestrea la pila (~ sys.getswitchinterval())
+
+# Reportes (dashboard/reportes.py): segundos que se cachea cada período
+REPORTES_CACHE_TTL = 300
+
+# Cache compartida entre workers (bloqueo de login, reportes): Redis si hay REDIS_URL,
+# si no archivos locales (antes LocMemCache: cada proceso contaba los intentos por su lado)
+REDIS_URL = os.environ.get('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": BASE_DIR / '.cache',
+        }
     }
-}
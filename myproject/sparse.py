@@ -0,0 +1,168 @@
+# myproject/sparse.py
+"""
+Sparse fieldsets: ?fields=id,nombre,precio en list/retrieve.
+
+- La respuesta solo incluye esos campos (menos payload y menos trabajo del serializer).
+- El queryset se recorta en función de los campos pedidos:
+    .only(...)             solo las columnas necesarias (también las de tablas unidas)
+    .select_related(...)   solo los JOIN que esos campos usan
+    .prefetch_related(...) solo los prefetch de relaciones pedidas (p.ej. items)
+
+Cómo se resuelve cada campo del serializer:
+  - source 'a.b.c'           -> columna a__b__c (JOIN por a y a__b)
+  - source 'get_X_display'   -> columna X
+  - serializer anidado       -> sus propios campos (FK/1-1) o prefetch (many=True)
+  - SerializerMethodField / source='*' -> hay que declararlo en Meta.columnas_de:
+        class Meta:
+            columnas_de = {'imagen_thumb': ('imagen_thumbs', 'imagen_url')}
+    Si algún campo no se puede resolver se deja el queryset como estaba
+    (igual se recorta la salida).
+"""
+import re
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+
+_display_re = re.compile(r'get_(\w+)_display')
+
+
+class _SinResolver(Exception):
+    pass
+
+
+class _Plan:
+    def __init__(self):
+        self.columnas, self.select, self.prefetch = set(), set(), set()
+
+    def ruta(self, model, path, relacion_completa=False):
+        """ Agrega lo necesario para leer `path` (a__b__c) desde `model`. """
+        partes = path.split('__')
+        recorrido = []
+        for i, nombre in enumerate(partes):
+            if nombre == 'pk':
+                return
+            try:
+                campo = model._meta.get_field(nombre)
+            except FieldDoesNotExist:
+                m = _display_re.fullmatch(nombre)
+                if not m or i != len(partes) - 1:
+                    raise _SinResolver(path)
+                campo = model._meta.get_field(m.group(1))
+            recorrido.append(campo.name)
+            actual = '__'.join(recorrido)
+
+            if campo.is_relation and (campo.many_to_many or campo.one_to_many):
+                # lo que cuelga de acá lo trae el prefetch
+                self.prefetch.add(actual)
+                return
+            if campo.is_relation and (i < len(partes) - 1 or relacion_completa):
+                # JOIN; sin columnas pedidas de la tabla unida, only() la trae completa
+                self.select.add(actual)
+                self.columnas.add(actual)
+                model = campo.related_model
+                continue
+            if not campo.concrete:
+                raise _SinResolver(path)
+            self.columnas.add(actual)
+
+    def serializer(self, serializer, model, prefijo=''):
+        declaradas = getattr(getattr(serializer, 'Meta', None), 'columnas_de', {})
+        for campo in serializer.fields.values():
+            if campo.write_only:
+                continue
+            nombre = campo.field_name
+            if nombre in declaradas:
+                for path in declaradas[nombre]:
+                    self.ruta(model, prefijo + path)
+                continue
+            if campo.source == '*':
+                raise _SinResolver(nombre)
+            path = prefijo + campo.source.replace('.', '__')
+
+            if isinstance(campo, (serializers.ListSerializer, serializers.ManyRelatedField)):
+                self.ruta(model, path)
+            elif isinstance(campo, serializers.BaseSerializer):
+                # FK/1-1 anidado: JOIN + solo las columnas del serializer anidado
+                self.ruta(model, path, relacion_completa=True)
+                self.serializer(campo, model, prefijo=path + '__')
+            elif isinstance(campo, serializers.RelatedField) \
+                    and not isinstance(campo, serializers.PrimaryKeyRelatedField):
+                self.ruta(model, path, relacion_completa=True)
+            else:
+                self.ruta(model, path)
+
+
+def _lookup(p):
+    return p.prefetch_to if isinstance(p, Prefetch) else p
+
+
+def plan_consulta(serializer, model):
+    """ _Plan con columnas/JOIN/prefetch que necesita `serializer`, o None si no se puede. """
+    plan = _Plan()
+    try:
+        plan.serializer(serializer, model)
+    except _SinResolver:
+        return None
+    return plan
+
+
+def aplicar_plan(qs, plan):
+    # prefetch originales que cuelgan de relaciones pedidas (conservan sus sub-lookups)
+    def cubre(p, r):
+        return _lookup(p) == r or _lookup(p).startswith(r + '__')
+
+    conservar = [p for p in qs._prefetch_related_lookups if any(cubre(p, r) for r in plan.prefetch)]
+    faltan = [r for r in plan.prefetch if not any(cubre(p, r) for p in conservar)]
+    qs = qs.select_related(None).prefetch_related(None)
+    if plan.select:
+        qs = qs.select_related(*sorted(plan.select))
+    if conservar or faltan:
+        qs = qs.prefetch_related(*conservar, *sorted(faltan))
+    return qs.only(*sorted(plan.columnas or {'pk'}))
+
+
+class SparseFieldsMixin:
+    """
+    Mixin para viewsets DRF: ?fields=a,b,c en las acciones de `sparse_actions`.
+    Campos desconocidos -> 400.
+    """
+    sparse_actions = ('list', 'retrieve')
+    sparse_param = 'fields'
+
+    def campos_pedidos(self):
+        if hasattr(self, '_campos_pedidos'):
+            return self._campos_pedidos
+        self._campos_pedidos = None
+        crudo = self.request.query_params.get(self.sparse_param) if self.request else None
+        if crudo and self.action in self.sparse_actions:
+            pedidos = list(dict.fromkeys(c.strip() for c in crudo.split(',') if c.strip()))
+            disponibles = self.get_serializer_class()(context=self.get_serializer_context()).fields
+            invalidos = [c for c in pedidos if c not in disponibles or disponibles[c].write_only]
+            if invalidos or not pedidos:
+                raise ValidationError({self.sparse_param: (
+                    f"Campos inválidos: {', '.join(invalidos) or repr(crudo)}. "
+                    f"Opciones: {', '.join(n for n, f in disponibles.items() if not f.write_only)}"
+                )})
+            self._campos_pedidos = tuple(pedidos)
+        return self._campos_pedidos
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        campos = self.campos_pedidos()
+        if campos:
+            destino = getattr(serializer, 'child', serializer)
+            for nombre in list(destino.fields):
+                if nombre not in campos:
+                    destino.fields.pop(nombre)
+        return serializer
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        campos = self.campos_pedidos()
+        if not campos:
+            return queryset
+        serializer = self.get_serializer()
+        plan = plan_consulta(serializer, queryset.model)
+        return aplicar_plan(queryset, plan) if plan is not None else queryset
@@ -0,0 +1,28 @@
+from unittest import skipIf
+
+from django.test import RequestFactory, SimpleTestCase
+
+from .middleware import CompressionMiddleware, brotli
+
+
+class ElegirCodecTests(SimpleTestCase):
+
+    def setUp(self):
+        self.middleware = CompressionMiddleware(lambda request: None)
+
+    def _codec(self, accept_encoding):
+        request = RequestFactory().get('/api/productos/', HTTP_ACCEPT_ENCODING=accept_encoding)
+        codec = self.middleware._elegir_codec(request)
+        return codec and codec.nombre
+
+    @skipIf(brotli is None, "brotli no instalado")
+    def test_gana_el_q_mayor_y_empata_brotli(self):
+        self.assertEqual(self._codec('gzip;q=1, br;q=0.1'), 'gzip')
+        self.assertEqual(self._codec('gzip;q=0.5, br;q=0.8'), 'br')
+        self.assertEqual(self._codec('gzip, br'), 'br')
+        self.assertEqual(self._codec('gzip, *;q=0.2'), 'gzip')
+
+    def test_sin_codec_aceptado(self):
+        self.assertIsNone(self._codec(''))
+        self.assertIsNone(self._codec('gzip;q=0, br;q=0'))
+        self.assertIsNone(self._codec('identity'))
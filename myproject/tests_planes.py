@@ -0,0 +1,175 @@
+# myproject/tests_planes.py
+"""
+Regresión de planes de consulta en las acciones más usadas.
+
+Con datos de volumen (PLANES_VOLUMEN), cada test captura el SQL de una acción,
+le pide el plan al motor y falla si alguna tabla con más de PLANES_FILAS_MIN
+filas se recorre completa (tabla o índice entero). Los planes quedan como
+snapshot en myproject/planes/<test>.<motor>.txt para revisarlos en los PR; si
+cambian a propósito, o falta el snapshot de un test o motor nuevo:
+
+    ACTUALIZAR_PLANES=1 python manage.py test myproject.tests_planes
+"""
+import difflib
+import os
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from alquileres.models import Alquiler, DetAlquiler
+from clientes.models import Cliente
+from incidentes.models import Incidente
+from productos.models import Producto
+from myproject.planes import CapturaSQL
+
+PLANES_DIR = Path(__file__).resolve().parent / 'planes'
+PLANES_FILAS_MIN = 1000
+PLANES_VOLUMEN = {'clientes': 500, 'productos': 300, 'alquileres': 3000, 'items': 3, 'usuarios': 1500}
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class PlanesConsultasTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        v = PLANES_VOLUMEN
+        cls.admin = User.objects.create_superuser('admin', 'admin@empresa.com', 'clave-admin')
+        User.objects.bulk_create(
+            User(username=f'user{i}', email=f'user{i}@empresa.com') for i in range(v['usuarios'])
+        )
+        clientes = Cliente.objects.bulk_create(Cliente(nombre=f'Cliente {i}') for i in range(v['clientes']))
+        productos = Producto.objects.bulk_create(
+            Producto(nombre=f'Producto {i:04d}', categoria='vajilla', precio=100, stock=10 ** 6)
+            for i in range(v['productos'])
+        )
+        alquileres = Alquiler.objects.bulk_create(
+            Alquiler(cliente=clientes[i % len(clientes)], cliente_nombre=f'Cliente {i % len(clientes)}')
+            for i in range(v['alquileres'])
+        )
+        detalles = DetAlquiler.objects.bulk_create(
+            DetAlquiler(alquiler=a, producto=productos[(i * 7 + j) % len(productos)], cantidad=10, precio_unit=5)
+            for i, a in enumerate(alquileres) for j in range(v['items'])
+        )
+        Incidente.objects.bulk_create(
+            Incidente(det_alquiler=d, cantidad_afectada=1,
+                      estado_incidente='abierto' if i % 10 == 0 else 'resuelto')
+            for i, d in enumerate(detalles[::2])
+        )
+        # producto y alquiler sin movimientos, para las acciones de borrado
+        cls.producto_libre = Producto.objects.create(nombre='Sin uso', categoria='vajilla', precio=1)
+        cls.alquiler_libre = Alquiler.objects.create(cliente_nombre='Sin ítems')
+        # y con un incidente abierto (por save(), que mantiene los contadores de las guardas)
+        cls.producto_con_abierto = Producto.objects.create(nombre='Con incidente', categoria='vajilla',
+                                                           precio=1, stock=10)
+        cls.alquiler_con_abierto = Alquiler.objects.create(cliente_nombre='Con incidente')
+        Incidente.objects.create(
+            det_alquiler=DetAlquiler.objects.create(alquiler=cls.alquiler_con_abierto,
+                                                    producto=cls.producto_con_abierto, cantidad=2, precio_unit=1),
+            cantidad_afectada=1,
+        )
+        cls.det = detalles[len(detalles) // 2]
+        with connection.cursor() as cursor:
+            if connection.vendor == 'sqlite':
+                cursor.execute('ANALYZE')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    # ---------- utilidades ----------
+    def _filas(self, tabla):
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT COUNT(*) FROM {connection.ops.quote_name(tabla)}')
+            return cursor.fetchone()[0]
+
+    def assertPlanesConIndice(self, nombre, captura, listados=()):
+        """
+        listados: tablas que la acción lee enteras a propósito (listado sin filtro ni
+        paginación); no se marcan, y cómo se recorren queda fijado en el snapshot.
+        """
+        planes = captura.planes()
+        self.assertTrue(planes, 'No se capturó ninguna consulta')
+
+        grandes = []
+        for consulta in planes:
+            for tabla, indice in consulta.scans_completos().items():
+                if tabla in listados:
+                    continue
+                if self._filas(tabla) > PLANES_FILAS_MIN:
+                    grandes.append(f'{tabla} ({indice or "sin índice"}): {consulta.sql_normalizado()}')
+        self._comparar_snapshot(nombre, planes)
+        self.assertFalse(grandes, 'Scan completo sobre tablas grandes:\n' + '\n'.join(grandes))
+
+    def _comparar_snapshot(self, nombre, planes):
+        texto = f'# {nombre} ({connection.vendor})\n\n' + '\n\n'.join(str(p) for p in planes) + '\n'
+        archivo = PLANES_DIR / f'{nombre}.{connection.vendor}.txt'
+        if os.environ.get('ACTUALIZAR_PLANES'):
+            PLANES_DIR.mkdir(exist_ok=True)
+            archivo.write_text(texto, encoding='utf-8')
+            return
+        if not archivo.exists():
+            self.fail(f'Falta el snapshot {archivo.name} (generarlo con ACTUALIZAR_PLANES=1 y revisarlo):\n{texto}')
+        guardado = archivo.read_text(encoding='utf-8')
+        if guardado != texto:
+            diff = ''.join(difflib.unified_diff(
+                guardado.splitlines(True), texto.splitlines(True), str(archivo), 'actual'))
+            self.fail(f'El plan cambió (ACTUALIZAR_PLANES=1 si es intencional):\n{diff}')
+
+    # ---------- acciones ----------
+    def test_listado_alquileres(self):
+        # el listado real (Rentals.jsx): todos los alquileres con sus ítems y productos anidados.
+        # Sin paginación lee enteras alquileres (por alquiler_creado_idx, sin sort) y sus ítems
+        with CapturaSQL() as captura:
+            r = self.client.get('/api/alquileres/')
+        self.assertEqual(r.status_code, 200)
+        self.assertTrue(any(a['items'] for a in r.json()[:5]))
+        self.assertPlanesConIndice('listado_alquileres', captura,
+                                   listados=('alquileres_alquiler', 'alquileres_detalquiler'))
+
+    def test_incidentes_por_detalle(self):
+        with CapturaSQL() as captura:
+            r = self.client.get('/api/incidentes/', {'det_alquiler': self.det.pk})
+        self.assertEqual(r.status_code, 200)
+        self.assertTrue(all(i['det_alquiler'] == self.det.pk for i in r.json()))
+        self.assertPlanesConIndice('incidentes_por_detalle', captura)
+
+    def test_guardia_borrar_producto_con_incidentes(self):
+        # Producto.delete() rechaza el borrado (contador open_incidents)
+        with CapturaSQL() as captura:
+            r = self.client.delete(f'/api/productos/{self.producto_con_abierto.pk}/')
+        self.assertEqual(r.status_code, 409, r.content)
+        self.assertTrue(Producto.objects.filter(pk=self.producto_con_abierto.pk).exists())
+        self.assertPlanesConIndice('guardia_borrar_producto', captura)
+
+    def test_guardia_borrar_alquiler_con_incidentes(self):
+        # AlquilerViewSet.destroy rechaza el borrado
+        with CapturaSQL() as captura:
+            r = self.client.delete(f'/api/alquileres/{self.alquiler_con_abierto.pk}/')
+        self.assertEqual(r.status_code, 409, r.content)
+        self.assertTrue(Alquiler.objects.filter(pk=self.alquiler_con_abierto.pk).exists())
+        self.assertPlanesConIndice('guardia_borrar_alquiler', captura)
+
+    def test_borrar_producto(self):
+        with CapturaSQL() as captura:
+            r = self.client.delete(f'/api/productos/{self.producto_libre.pk}/')
+        self.assertEqual(r.status_code, 204)
+        self.assertPlanesConIndice('borrar_producto', captura)
+
+    def test_borrar_alquiler(self):
+        with CapturaSQL() as captura:
+            r = self.client.delete(f'/api/alquileres/{self.alquiler_libre.pk}/')
+        self.assertEqual(r.status_code, 204)
+        self.assertPlanesConIndice('borrar_alquiler', captura)
+
+    def test_login_por_email(self):
+        usuario = User.objects.get(username='user7')
+        usuario.set_password('clave-123')
+        usuario.save(update_fields=['password'])
+        with CapturaSQL() as captura:
+            r = APIClient().post('/api/token/', {'username': 'USER7@empresa.com', 'password': 'clave-123'},
+                                 format='json')
+        self.assertEqual(r.status_code, 200, r.content)
+        self.assertPlanesConIndice('login_por_email', captura)
@@ -0,0 +1,194 @@
+# myproject/throttling.py
+"""
+Throttling por usuario y por scope con token buckets atómicos compartidos
+entre workers.
+
+Scopes (REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'], formato DRF "N/periodo":
+capacidad N de ráfaga, se repone a N por período):
+  listado    list de los viewsets y acciones de colección (GET detail=False)
+  detalle    retrieve y acciones GET sobre un objeto
+  escritura  POST/PUT/PATCH/DELETE
+  reporte    reportes/agregados (throttle_scope / throttle_scopes de la vista)
+  exportar   exportes y descargas pesadas
+
+Una vista fija el suyo con `throttle_scope = 'reporte'`, o por acción con
+`throttle_scopes = {'resumen': 'reporte'}`.
+
+Almacén: Redis (THROTTLE_REDIS_URL, script Lua) si está configurado y el
+paquete redis instalado; si no, un SQLite local (THROTTLE_SQLITE_PATH,
+BEGIN IMMEDIATE), compartido por los workers de la misma máquina.
+Los rechazos se cuentan por scope (contadores_rechazos(), /api/metrics/throttle/).
+Si el almacén falla (SQLite bloqueado más de 5 s, Redis caído) el request pasa
+sin throttle y queda un warning en el log: nunca un 500 por el throttling.
+"""
+import logging
+import random
+import sqlite3
+import threading
+import time
+
+from django.conf import settings
+from rest_framework.throttling import BaseThrottle, SimpleRateThrottle
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - opcional
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+# errores del almacén: el request pasa igual (fail-open)
+ERRORES_ALMACEN = (sqlite3.Error,) + ((redis.RedisError,) if redis is not None else ())
+_AVISO_CADA = 60   # segundos entre warnings por proceso, para no inundar el log
+_ultimo_aviso = 0.0
+
+_LUA_BUCKET = """
+local cap, tasa, ahora = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local b = redis.call('HMGET', KEYS[1], 't', 'ts')
+local tokens = tonumber(b[1]) or cap
+local ts = tonumber(b[2]) or ahora
+tokens = math.min(cap, tokens + math.max(0, ahora - ts) * tasa)
+local ok = 0
+if tokens >= 1 then tokens = tokens - 1; ok = 1 end
+redis.call('HSET', KEYS[1], 't', tostring(tokens), 'ts', tostring(ahora))
+redis.call('EXPIRE', KEYS[1], math.ceil(cap / tasa) + 1)
+return {ok, tostring(tokens)}
+"""
+
+
+class SQLiteBuckets:
+    """ Stand-in local: un archivo SQLite (WAL) con un bucket por fila. """
+    nombre = 'sqlite'
+    EXPIRA = 86400   # buckets sin uso hace un día ya están llenos: se borran
+
+    def __init__(self, ruta):
+        self.ruta = str(ruta)
+        self._local = threading.local()
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.ruta, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('CREATE TABLE IF NOT EXISTS bucket (clave TEXT PRIMARY KEY, tokens REAL, ts REAL)')
+            conn.execute('CREATE TABLE IF NOT EXISTS rechazo (scope TEXT PRIMARY KEY, n INTEGER)')
+            self._local.conn = conn
+        return conn
+
+    def consumir(self, clave, capacidad, tasa, ahora):
+        conn = self._conn()
+        conn.execute('BEGIN IMMEDIATE')   # lock de escritura: lectura+update atómicos entre procesos
+        try:
+            fila = conn.execute('SELECT tokens, ts FROM bucket WHERE clave = ?', (clave,)).fetchone()
+            tokens = capacidad if fila is None else min(capacidad, fila[0] + max(0.0, ahora - fila[1]) * tasa)
+            permitido = tokens >= 1
+            if permitido:
+                tokens -= 1
+            conn.execute('INSERT OR REPLACE INTO bucket (clave, tokens, ts) VALUES (?, ?, ?)',
+                         (clave, tokens, ahora))
+            if random.random() < 0.001:
+                conn.execute('DELETE FROM bucket WHERE ts < ?', (ahora - self.EXPIRA,))
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return permitido, tokens
+
+    def contar_rechazo(self, scope):
+        self._conn().execute('INSERT INTO rechazo (scope, n) VALUES (?, 1) '
+                             'ON CONFLICT(scope) DO UPDATE SET n = n + 1', (scope,))
+
+    def rechazos(self):
+        return dict(self._conn().execute('SELECT scope, n FROM rechazo ORDER BY scope').fetchall())
+
+
+class RedisBuckets:
+    nombre = 'redis'
+    PREFIJO = 'throttle:'
+
+    def __init__(self, url):
+        self.cliente = redis.Redis.from_url(url)
+        self._script = self.cliente.register_script(_LUA_BUCKET)
+
+    def consumir(self, clave, capacidad, tasa, ahora):
+        ok, tokens = self._script(keys=[self.PREFIJO + clave], args=[capacidad, tasa, ahora])
+        return bool(ok), float(tokens)
+
+    def contar_rechazo(self, scope):
+        self.cliente.hincrby(self.PREFIJO + 'rechazos', scope, 1)
+
+    def rechazos(self):
+        return {k.decode(): int(v) for k, v in sorted(self.cliente.hgetall(self.PREFIJO + 'rechazos').items())}
+
+
+_almacen = None
+_almacen_lock = threading.Lock()
+
+
+def almacen():
+    global _almacen
+    if _almacen is None:
+        with _almacen_lock:
+            if _almacen is None:
+                url = getattr(settings, 'THROTTLE_REDIS_URL', None)
+                if url and redis is not None:
+                    _almacen = RedisBuckets(url)
+                else:
+                    _almacen = SQLiteBuckets(settings.THROTTLE_SQLITE_PATH)
+    return _almacen
+
+
+def contadores_rechazos():
+    return almacen().rechazos()
+
+
+def _avisar_falla(exc):
+    global _ultimo_aviso
+    ahora = time.monotonic()
+    if ahora - _ultimo_aviso >= _AVISO_CADA:
+        _ultimo_aviso = ahora
+        logger.warning("Throttling: almacén %s no disponible, se deja pasar el request (%s: %s)",
+                       almacen().nombre, type(exc).__name__, exc)
+
+
+class ScopedBucketThrottle(BaseThrottle):
+    """ Un bucket por (scope, usuario); anónimos por IP. """
+    parse_rate = SimpleRateThrottle.parse_rate
+
+    def scope_de(self, request, view):
+        por_accion = getattr(view, 'throttle_scopes', {})
+        accion = getattr(view, 'action', None)
+        if accion in por_accion:
+            return por_accion[accion]
+        if getattr(view, 'throttle_scope', None):
+            return view.throttle_scope
+        if request.method not in ('GET', 'HEAD', 'OPTIONS'):
+            return 'escritura'
+        if accion == 'list' or getattr(view, 'detail', None) is False:
+            return 'listado'
+        return 'detalle'
+
+    def allow_request(self, request, view):
+        self.espera = None
+        scope = self.scope_de(request, view)
+        rate = settings.REST_FRAMEWORK.get('DEFAULT_THROTTLE_RATES', {}).get(scope)
+        if rate is None:
+            return True
+        capacidad, periodo = self.parse_rate(rate)
+        tasa = capacidad / periodo
+
+        user = request.user
+        ident = f"u{user.pk}" if user and user.is_authenticated else f"ip{self.get_ident(request)}"
+        try:
+            permitido, tokens = almacen().consumir(f"{scope}:{ident}", capacidad, tasa, time.time())
+            if not permitido:
+                self.espera = (1 - tokens) / tasa
+                almacen().contar_rechazo(scope)
+        except ERRORES_ALMACEN as exc:
+            _avisar_falla(exc)
+            return True
+        return permitido
+
+    def wait(self):
+        return self.espera
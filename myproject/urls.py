@@ -1,20 +1,26 @@
 # myproject/urls.py
 from django.contrib import admin
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from rest_framework_simplejwt.views import TokenRefreshView
 
 # Vistas / APIs existentes
 from accounts.auth import EmailOrUsernameTokenObtainPairView  # login personalizado
-from accounts.views import PerfilUsuarioAPIView
+from accounts.views import PerfilUsuarioAPIView, RevocarTokenAPIView
 from empleados.views import EmpleadoViewSet
 from productos.views import ProductoViewSet
 from incidentes.views import IncidenteViewSet
-from dashboard.views import MetricsSummaryView, RecentActivityView
+from dashboard.views import (MetricsSummaryView, RecentActivityView, ReporteProductosView,
+                             PerfilesView, PerfilDetalleView, ThrottleEstadoView)
 
 # 👇 IMPORTAR LOS VIEWS DE ALQUILERES (NO los modelos)
 from alquileres.views import AlquilerViewSet, DetAlquilerViewSet
 from clientes.views import ClienteViewSet
+from jobs.views import JobViewSet
+from myproject.media import serve_media
+from eventos.views import stream as eventos_stream
+from sincronizacion.views import SyncView
 
 router = DefaultRouter()
 router.register(r'gestion-empleados', EmpleadoViewSet, basename='empleado')
@@ -26,6 +32,7 @@ router.register(r'alquileres', AlquilerViewSet, basename='alquiler')
 router.register(r'det-alquileres', DetAlquilerViewSet, basename='detalquiler')
 
 router.register(r'clientes', ClienteViewSet, basename='cliente')
+router.register(r'jobs', JobViewSet, basename='job')
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -33,6 +40,7 @@ urlpatterns = [
     # Auth (JWT)
     path('api/token/', EmailOrUsernameTokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('api/token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('api/token/revocar/', RevocarTokenAPIView.as_view(), name='token_revocar'),
 
     # Perfil del usuario logueado
     path('api/perfil/', PerfilUsuarioAPIView.as_view(), name='perfil_usuario'),
@@ -40,8 +48,32 @@ urlpatterns = [
     # Dashboard (si ya lo usas)
     path('api/metrics/summary/', MetricsSummaryView.as_view(), name='metrics_summary'),
     path('api/activity/recent/', RecentActivityView.as_view(), name='recent_activity'),
+    path('api/metrics/throttle/', ThrottleEstadoView.as_view(), name='metrics_throttle'),
+
+    # Eventos en tiempo real (SSE)
+    path('api/eventos/', eventos_stream, name='eventos_stream'),
+
+    # Delta-sync para clientes offline
+    path('api/sync/', SyncView.as_view(), name='sync'),
+
+    # Reportes
+    path('api/reportes/productos/', ReporteProductosView.as_view(), name='reporte_productos'),
+
+    # Profiler a demanda (solo admin)
+    path('api/perfiles/', PerfilesView.as_view(), name='perfiles'),
+    path('api/perfiles/<str:perfil_id>/', PerfilDetalleView.as_view(), name='perfil_detalle'),
+    path('api/perfiles/<str:perfil_id>/folded/', PerfilDetalleView.as_view(), {'formato': 'folded'},
+         name='perfil_folded'),
+
+    # Comprobante/remito PDF sin barra final (el router genera también .../comprobante.pdf/)
+    path('api/alquileres/<int:pk>/comprobante.pdf',
+         AlquilerViewSet.as_view({'get': 'comprobante'}, detail=True, **AlquilerViewSet.comprobante.kwargs),
+         name='alquiler_comprobante_pdf'),
 
     # Todas las colecciones DRF
     path('api/', include(router.urls)),
+
+    # Imágenes subidas (nombres por hash => cache immutable)
+    path(f"{settings.MEDIA_URL.strip('/')}/<path:path>", serve_media, name='media'),
 ]
 
@@ -0,0 +1,147 @@
+# myproject/versionado.py
+"""
+Concurrencia optimista: columna `version` + UPDATE condicional, sin locks
+durante la edición.
+
+Modelo (ModeloVersionado, abstracto):
+  - cada save() de una fila existente hace
+        UPDATE ... SET ..., version = v + 1 WHERE id = ? AND version = v
+    con v = la versión leída (snapshot en from_db) o la que exigió el cliente
+    (exigir_version). Si no afecta filas y la fila existe -> ConflictoVersion.
+  - delete() con versión exigida primero confirma la versión (UPDATE no-op
+    condicional, que además deja la fila bloqueada hasta el DELETE).
+
+Viewset (VersionadoMixin):
+  - GET/POST/PUT/PATCH de un objeto devuelven `ETag: "<version>"`.
+  - PUT/PATCH/DELETE con `If-Match: "<version>"` solo se aplican sobre esa
+    versión; si no, 409 con el estado actual ({"detail", "code", "actual"}).
+    Sin If-Match se sigue protegiendo el leer-modificar-escribir del propio request.
+"""
+from django.db import models, transaction
+from django.db.models import F
+from rest_framework import status
+from rest_framework.response import Response
+
+
+class ConflictoVersion(Exception):
+    def __init__(self, instancia):
+        super().__init__(f"{instancia._meta.label} #{instancia.pk}: la versión cambió")
+        self.instancia = instancia
+
+
+class ModeloVersionado(models.Model):
+    version = models.PositiveIntegerField(default=1, editable=False)
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # versión "de base": el UPDATE solo se aplica si la fila sigue así
+        instance._version_en_db = instance.__dict__.get('version')
+        return instance
+
+    def exigir_version(self, version):
+        """ La próxima escritura solo se aplica si la fila está en `version` (If-Match). """
+        self._version_en_db = version
+        self._version_exigida = True
+
+    def save(self, *args, **kwargs):
+        if self._state.adding:
+            super().save(*args, **kwargs)
+            if self.pk is not None and not kwargs.get('force_insert'):
+                del self.version   # pudo ser un UPDATE (ver _do_update): se relee si se usa
+            return
+
+        esperada = getattr(self, '_version_en_db', None)
+        anterior = self.__dict__.get('version')
+        # sin versión conocida (instancia armada a mano): incrementar sin condición
+        self.version = F('version') + 1 if esperada is None else esperada + 1
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'version'}
+        try:
+            super().save(*args, **kwargs)
+        except BaseException:
+            self.version = anterior
+            raise
+        if esperada is None:
+            del self.version   # queda diferido: se relee si se usa
+        self._version_en_db = None if esperada is None else self.version
+        self._version_exigida = False
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        esperada = getattr(self, '_version_en_db', None)
+        if esperada is None:
+            if self._state.adding:
+                # instancia nueva con pk de una fila existente: subir la versión en vez de volverla a 1
+                values = [(f, m, F('version') + 1 if f.attname == 'version' else v) for f, m, v in values]
+            return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+        if super()._do_update(base_qs.filter(version=esperada), using, pk_val, values, update_fields,
+                              forced_update):
+            return True
+        if base_qs.filter(pk=pk_val).exists():
+            raise ConflictoVersion(self)
+        return False
+
+    def delete(self, *args, **kwargs):
+        if not getattr(self, '_version_exigida', False):
+            return super().delete(*args, **kwargs)
+        with transaction.atomic(using=kwargs.get('using')):
+            confirmada = (type(self)._base_manager
+                          .filter(pk=self.pk, version=self._version_en_db)
+                          .update(version=F('version')))
+            if not confirmada:
+                raise ConflictoVersion(self)
+            return super().delete(*args, **kwargs)
+
+
+def _versiones_if_match(valor):
+    """ 'W/"3", "4"' -> {3, 4}; '*' o vacío -> None. """
+    valor = (valor or '').strip()
+    if not valor or valor == '*':
+        return None
+    versiones = set()
+    for etiqueta in valor.split(','):
+        # CompressionMiddleware convierte el ETag en débil: se compara el valor igual
+        etiqueta = etiqueta.strip().removeprefix('W/').strip('"')
+        if etiqueta.isdigit():
+            versiones.add(int(etiqueta))
+    return versiones
+
+
+class VersionadoMixin:
+    """ ETag/If-Match sobre ModeloVersionado.version; 409 con el estado actual si no coincide. """
+    conflicto_mensaje = "El registro fue modificado por otro usuario. Revisá los cambios y volvé a guardar."
+
+    def get_object(self):
+        obj = super().get_object()
+        if self.request.method in ('PUT', 'PATCH', 'DELETE') and isinstance(obj, ModeloVersionado):
+            versiones = _versiones_if_match(self.request.headers.get('If-Match'))
+            if versiones is not None:
+                if obj.version not in versiones:
+                    raise ConflictoVersion(obj)
+                obj.exigir_version(obj.version)
+        return obj
+
+    def handle_exception(self, exc):
+        if isinstance(exc, ConflictoVersion):
+            return self._conflicto(exc.instancia)
+        return super().handle_exception(exc)
+
+    def _conflicto(self, instancia):
+        actual = self.get_queryset().filter(pk=instancia.pk).first()
+        datos = None if actual is None else self.get_serializer(actual).data
+        response = Response({'detail': self.conflicto_mensaje, 'code': 'version_conflict', 'actual': datos},
+                            status=status.HTTP_409_CONFLICT)
+        if actual is not None:
+            response['ETag'] = f'"{actual.version}"'
+        return response
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        datos = getattr(response, 'data', None)
+        if (200 <= response.status_code < 300 and isinstance(datos, dict)
+                and isinstance(datos.get('version'), int) and 'ETag' not in response):
+            response['ETag'] = f'"{datos["version"]}"'
+        return response
@@ -0,0 +1,21 @@
+# outbox/admin.py
+from django.contrib import admin
+from django.utils import timezone
+
+from myproject.admin_rendimiento import ModelAdminRapido
+from .models import MensajeOutbox
+
+
+@admin.register(MensajeOutbox)
+class MensajeOutboxAdmin(ModelAdminRapido):
+    list_display = ('id', 'tipo', 'agregado', 'agregado_id', 'estado', 'intentos', 'creado_en', 'enviado_en')
+    list_filter = ('estado', 'tipo')
+    search_id_fields = ('pk', 'agregado_id')
+    readonly_fields = ('creado_en', 'enviado_en')
+    actions = ('reintentar',)
+
+    @admin.action(description='Reintentar (vuelve a pendiente)')
+    def reintentar(self, request, queryset):
+        n = queryset.exclude(estado='enviado').update(estado='pendiente', intentos=0,
+                                                      disponible_en=timezone.now())
+        self.message_user(request, f'{n} mensajes vuelven a la cola.')
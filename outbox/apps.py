@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class OutboxConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'outbox'
+
+    def ready(self):
+        # receivers que escriben en el outbox dentro de la transacción del cambio
+        from . import senales  # noqa: F401
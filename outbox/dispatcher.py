@@ -0,0 +1,125 @@
+# outbox/dispatcher.py
+"""
+Envío del outbox (ver manage.py run_outbox). Correr UN solo dispatcher: el orden
+por agregado se garantiza eligiendo, de cada agregado, solo mensajes sin otro
+anterior todavía no enviado (pendiente en backoff o en error).
+
+Si el receptor rechaza un lote por su contenido (MensajeRechazado) el lote se
+parte a la mitad hasta aislar los mensajes rechazados: solo esos suman intentos,
+el resto se envía. Si falla por otra causa (caída, timeout) falla el lote entero.
+"""
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import MensajeOutbox
+from .transportes import MensajeRechazado
+
+logger = logging.getLogger(__name__)
+
+
+def elegir_lote(tamano, ahora):
+    candidatos = list(MensajeOutbox.objects
+                      .filter(estado='pendiente', disponible_en__lte=ahora)
+                      .order_by('pk')[:tamano * 4])
+    if not candidatos:
+        return []
+
+    # primer no enviado de cada agregado que NO está entre los candidatos: corta ese agregado
+    ids = {m.pk for m in candidatos}
+    agregados = Q()
+    for agregado, agregado_id in {(m.agregado, m.agregado_id) for m in candidatos}:
+        agregados |= Q(agregado=agregado, agregado_id=agregado_id)
+    corte = {}
+    bloqueantes = (MensajeOutbox.objects
+                   .filter(agregados, estado__in=('pendiente', 'error'), pk__lt=max(ids))
+                   .exclude(pk__in=ids)
+                   .values_list('agregado', 'agregado_id', 'pk'))
+    for agregado, agregado_id, pk in bloqueantes:
+        clave = (agregado, agregado_id)
+        corte[clave] = min(corte.get(clave, pk), pk)
+
+    lote = [m for m in candidatos if m.pk < corte.get((m.agregado, m.agregado_id), float('inf'))]
+    return lote[:tamano]
+
+
+def _enviar(transporte, lote, enviados, rechazados):
+    """
+    Envía `lote`; ante MensajeRechazado lo parte en mitades (bisección). Los
+    mensajes de un agregado con uno anterior rechazado no se envían: quedan
+    pendientes detrás de él. Otras excepciones se propagan.
+    """
+    try:
+        transporte.enviar([m.como_dict() for m in lote])
+    except MensajeRechazado as exc:
+        if len(lote) == 1:
+            rechazados.append((lote[0], exc))
+            return
+        mitad = len(lote) // 2
+        _enviar(transporte, lote[:mitad], enviados, rechazados)
+        frenados = {(m.agregado, m.agregado_id) for m, _ in rechazados}
+        resto = [m for m in lote[mitad:] if (m.agregado, m.agregado_id) not in frenados]
+        if resto:
+            _enviar(transporte, resto, enviados, rechazados)
+        return
+    enviados.extend(lote)
+
+
+def despachar(transporte, tamano):
+    """ Envía un lote. Devuelve cuántos mensajes se enviaron (0 si no había o falló). """
+    ahora = timezone.now()
+    lote = elegir_lote(tamano, ahora)
+    if not lote:
+        return 0
+    enviados, rechazados = [], []
+    try:
+        _enviar(transporte, lote, enviados, rechazados)
+    except Exception as exc:
+        # caída a mitad de una bisección: lo ya enviado o rechazado se registra igual
+        resueltos = {m.pk for m in enviados} | {m.pk for m, _ in rechazados}
+        _fallo([m for m in lote if m.pk not in resueltos], exc, ahora)
+    if enviados:
+        MensajeOutbox.objects.filter(pk__in=[m.pk for m in enviados]).update(
+            estado='enviado', enviado_en=timezone.now(), error='')
+    for mensaje, exc in rechazados:
+        _fallo([mensaje], exc, ahora)
+    return len(enviados)
+
+
+def _fallo(lote, exc, ahora):
+    error = f"{type(exc).__name__}: {exc}"[:2000]
+    if not lote:
+        return
+    logger.warning("Outbox: falló el envío de %s mensajes (%s)", len(lote), error)
+    ids = [m.pk for m in lote]
+    MensajeOutbox.objects.filter(pk__in=ids).update(intentos=F('intentos') + 1, error=error)
+    MensajeOutbox.objects.filter(pk__in=ids, intentos__gte=settings.OUTBOX_MAX_INTENTOS).update(estado='error')
+    # backoff exponencial según el intento (lo que falló junto se reintenta junto)
+    intentos = max(m.intentos for m in lote) + 1
+    espera = min(settings.OUTBOX_BACKOFF_BASE * 2 ** (intentos - 1), settings.OUTBOX_BACKOFF_MAX)
+    MensajeOutbox.objects.filter(pk__in=ids, estado='pendiente').update(
+        disponible_en=ahora + timedelta(seconds=espera))
+
+
+def purgar_enviados(ahora=None):
+    limite = (ahora or timezone.now()) - timedelta(days=settings.OUTBOX_RETENCION_DIAS)
+    return MensajeOutbox.objects.filter(estado='enviado', enviado_en__lt=limite).delete()[0]
+
+
+def loop(transporte, tamano, poll=1.0, una_vez=False, detener=lambda: False):
+    ultima_purga = 0.0
+    while not detener():
+        close_old_connections()
+        if time.monotonic() - ultima_purga > 3600:
+            purgar_enviados()
+            ultima_purga = time.monotonic()
+        enviados = despachar(transporte, tamano)
+        if not enviados:
+            if una_vez:
+                return
+            time.sleep(poll)
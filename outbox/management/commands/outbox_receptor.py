@@ -0,0 +1,53 @@
+# outbox/management/commands/outbox_receptor.py
+import json
+import random
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = ("Receptor HTTP local que simula al sistema contable (para probar HTTPTransporte): "
+            "deduplica por clave y puede fallar a propósito.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--puerto', type=int, default=8765)
+        parser.add_argument('--fallar', type=float, default=0.0, help='Probabilidad de responder 503')
+
+    def handle(self, *args, **opts):
+        vistas, lock, salida, fallar = set(), threading.Lock(), self.stdout, opts['fallar']
+
+        class Receptor(BaseHTTPRequestHandler):
+            def do_POST(self):
+                cuerpo = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+                if random.random() < fallar:
+                    self.send_response(503)
+                    self.end_headers()
+                    salida.write("503 (simulado)")
+                    return
+                nuevos = duplicados = 0
+                for m in json.loads(cuerpo or b'{}').get('mensajes', []):
+                    with lock:
+                        if m['clave'] in vistas:
+                            duplicados += 1
+                            continue
+                        vistas.add(m['clave'])
+                    nuevos += 1
+                    salida.write(f"{m['agregado']}#{m['agregado_id']} {m['tipo']} {m['clave']}")
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.end_headers()
+                self.wfile.write(json.dumps({'nuevos': nuevos, 'duplicados': duplicados}).encode())
+
+            def log_message(self, *args):
+                pass
+
+        servidor = ThreadingHTTPServer(('127.0.0.1', opts['puerto']), Receptor)
+        self.stdout.write(f"Receptor contable en http://127.0.0.1:{opts['puerto']}/")
+        try:
+            servidor.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            servidor.server_close()
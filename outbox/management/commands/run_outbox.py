@@ -0,0 +1,33 @@
+# outbox/management/commands/run_outbox.py
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils.module_loading import import_string
+
+from outbox.dispatcher import loop
+
+_detener = False
+
+
+def _on_term(signum, frame):
+    global _detener
+    _detener = True   # termina el lote en curso y sale
+
+
+class Command(BaseCommand):
+    help = "Dispatcher del outbox hacia el sistema contable (correr una sola instancia)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--lote', type=int, default=None, help='Mensajes por envío (OUTBOX_LOTE)')
+        parser.add_argument('--poll', type=float, default=1.0, help='Segundos entre consultas sin pendientes')
+        parser.add_argument('--transporte', default=None, help='Ruta de la clase (OUTBOX_TRANSPORTE)')
+        parser.add_argument('--once', action='store_true', help='Enviar lo pendiente y salir')
+
+    def handle(self, *args, **opts):
+        transporte = import_string(opts['transporte'] or settings.OUTBOX_TRANSPORTE)()
+        lote = opts['lote'] or settings.OUTBOX_LOTE
+        self.stdout.write(f"Outbox: {type(transporte).__name__}, lotes de {lote}")
+        signal.signal(signal.SIGTERM, _on_term)
+        signal.signal(signal.SIGINT, _on_term)
+        loop(transporte, lote, poll=opts['poll'], una_vez=opts['once'], detener=lambda: _detener)
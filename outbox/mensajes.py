@@ -0,0 +1,59 @@
+# outbox/mensajes.py
+"""
+Mensajes para el sistema contable. Todo cuelga del agregado 'alquiler', así el
+alta, los ítems y los cargos por incidentes de un alquiler llegan en orden.
+"""
+from decimal import Decimal
+
+from .registro import mensaje
+
+AGREGADO = 'alquiler'
+
+
+def alquiler_creado(alquiler):
+    return mensaje(AGREGADO, alquiler.pk, 'alquiler.creado', {
+        'id': alquiler.pk,
+        'cliente': alquiler.cliente_id,
+        'cliente_nombre': alquiler.cliente_nombre,
+        'creado_en': alquiler.creado_en,
+    }, clave=f'alquiler.creado:{alquiler.pk}')
+
+
+def alquiler_item(det, accion):
+    """ accion: 'alta' | 'modificacion' | 'baja' """
+    return mensaje(AGREGADO, det.alquiler_id, 'alquiler.item', {
+        'accion': accion,
+        'id': det.pk,
+        'alquiler': det.alquiler_id,
+        'producto': det.producto_id,
+        'cantidad': det.cantidad,
+        'precio_unit': det.precio_unit,
+    })
+
+
+def incidente_creado(incidente, det):
+    return mensaje(AGREGADO, det.alquiler_id, 'incidente.creado', {
+        'id': incidente.pk,
+        'alquiler': det.alquiler_id,
+        'det_alquiler': det.pk,
+        'producto': det.producto_id,
+        'tipo': incidente.tipo_incidente,
+        'cantidad_afectada': incidente.cantidad_afectada,
+    }, clave=f'incidente.creado:{incidente.pk}')
+
+
+def incidente_resuelto(incidente_id, alquiler_id, det_id, producto_id, resultado_final,
+                       cantidad_afectada, cantidad_repuesta, precio_unit, fecha_resolucion):
+    """ Cargo de un incidente cerrado; importe_referencia = afectada * precio del ítem. """
+    return mensaje(AGREGADO, alquiler_id, 'incidente.resuelto', {
+        'id': incidente_id,
+        'alquiler': alquiler_id,
+        'det_alquiler': det_id,
+        'producto': producto_id,
+        'resultado_final': resultado_final,
+        'cantidad_afectada': cantidad_afectada,
+        'cantidad_repuesta': cantidad_repuesta,
+        'precio_unit': precio_unit,
+        'importe_referencia': Decimal(cantidad_afectada or 0) * Decimal(precio_unit or 0),
+        'fecha_resolucion': fecha_resolucion,
+    }, clave=f'incidente.resuelto:{incidente_id}')
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:02
+
+import django.core.serializers.json
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MensajeOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('clave', models.CharField(max_length=120, unique=True)),
+                ('agregado', models.CharField(max_length=30)),
+                ('agregado_id', models.BigIntegerField()),
+                ('tipo', models.CharField(max_length=50)),
+                ('payload', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('estado', models.CharField(choices=[('pendiente', 'Pendiente'), ('enviado', 'Enviado'), ('error', 'Error')], default='pendiente', max_length=10)),
+                ('intentos', models.PositiveIntegerField(default=0)),
+                ('disponible_en', models.DateTimeField(auto_now_add=True)),
+                ('error', models.TextField(blank=True)),
+                ('creado_en', models.DateTimeField(auto_now_add=True)),
+                ('enviado_en', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['estado', 'disponible_en'], name='outbox_cola_idx'), models.Index(fields=['agregado', 'agregado_id', 'estado'], name='outbox_agregado_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,49 @@
+# outbox/models.py
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+
+class MensajeOutbox(models.Model):
+    """
+    Mensaje para el sistema contable, escrito en la misma transacción que el
+    cambio que lo origina (ver outbox/registro.py). Lo envía el dispatcher
+    (manage.py run_outbox) en orden de id dentro de cada agregado.
+    `clave` es única: deduplica al registrar y viaja como clave de idempotencia.
+    """
+    ESTADOS = (
+        ('pendiente', 'Pendiente'),
+        ('enviado',   'Enviado'),
+        ('error',     'Error'),      # agotó reintentos: bloquea su agregado hasta reintentarlo
+    )
+
+    clave         = models.CharField(max_length=120, unique=True)
+    agregado      = models.CharField(max_length=30)          # 'alquiler'
+    agregado_id   = models.BigIntegerField()
+    tipo          = models.CharField(max_length=50)          # 'alquiler.creado', 'incidente.resuelto', ...
+    payload       = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    estado        = models.CharField(max_length=10, choices=ESTADOS, default='pendiente')
+
+    intentos      = models.PositiveIntegerField(default=0)
+    disponible_en = models.DateTimeField(auto_now_add=True)  # backoff entre reintentos
+    error         = models.TextField(blank=True)
+    creado_en     = models.DateTimeField(auto_now_add=True)
+    enviado_en    = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            # lote: WHERE estado='pendiente' AND disponible_en <= now ORDER BY id
+            models.Index(fields=['estado', 'disponible_en'], name='outbox_cola_idx'),
+            # orden por agregado: no enviados anteriores del mismo agregado
+            models.Index(fields=['agregado', 'agregado_id', 'estado'], name='outbox_agregado_idx'),
+        ]
+
+    def __str__(self):
+        return f"Outbox #{self.pk} {self.tipo} ({self.get_estado_display()})"
+
+    def como_dict(self):
+        return {
+            'id': self.pk, 'clave': self.clave, 'tipo': self.tipo,
+            'agregado': self.agregado, 'agregado_id': self.agregado_id,
+            'payload': self.payload, 'creado_en': self.creado_en,
+        }
@@ -0,0 +1,35 @@
+# outbox/registro.py
+"""
+Alta de mensajes. Se llama dentro de la transacción del cambio: si ésta hace
+rollback, el mensaje tampoco existe. El envío es asincrónico (dispatcher), así
+que el checkout no espera nunca al sistema contable.
+
+    registrar('alquiler', alquiler.pk, 'alquiler.creado', {...})
+    registrar_varios([MensajeOutbox(...), ...])
+
+Sin `clave` se genera una única (mensajes que representan un estado nuevo);
+con `clave` fija (p.ej. 'incidente.resuelto:12') un segundo registro se ignora.
+"""
+import uuid
+
+from django.db import transaction
+
+from .models import MensajeOutbox
+
+
+def mensaje(agregado, agregado_id, tipo, payload, clave=None):
+    return MensajeOutbox(
+        clave=clave or f"{tipo}:{agregado_id}:{uuid.uuid4().hex}",
+        agregado=agregado, agregado_id=agregado_id, tipo=tipo, payload=payload,
+    )
+
+
+def registrar_varios(mensajes):
+    if not transaction.get_connection().in_atomic_block:
+        raise RuntimeError("El outbox se escribe dentro de la transacción del cambio (transaction.atomic).")
+    # ignore_conflicts: claves repetidas no generan un segundo mensaje
+    MensajeOutbox.objects.bulk_create(mensajes, ignore_conflicts=True)
+
+
+def registrar(agregado, agregado_id, tipo, payload, clave=None):
+    registrar_varios([mensaje(agregado, agregado_id, tipo, payload, clave)])
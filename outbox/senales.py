@@ -0,0 +1,47 @@
+# outbox/senales.py
+"""
+Mensajes del outbox a partir de los guardados individuales. Alquiler.save,
+DetAlquiler.save/delete e Incidente.save son atómicos, así que cada post_save /
+post_delete corre en la misma transacción que el cambio.
+El cierre masivo (incidentes.models.resolver_en_lote) registra los suyos directo.
+Las operaciones bulk de DetAlquiler (comandos de mantenimiento) no generan mensajes.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from alquileres.models import Alquiler, DetAlquiler
+from incidentes.models import Incidente
+from . import mensajes
+from .registro import registrar_varios
+
+
+@receiver(post_save, sender=Alquiler, dispatch_uid='outbox_alquiler')
+def alquiler_guardado(sender, instance: Alquiler, created: bool, **kwargs):
+    if created:
+        registrar_varios([mensajes.alquiler_creado(instance)])
+
+
+@receiver(post_save, sender=DetAlquiler, dispatch_uid='outbox_det_guardado')
+def det_guardado(sender, instance: DetAlquiler, created: bool, **kwargs):
+    registrar_varios([mensajes.alquiler_item(instance, 'alta' if created else 'modificacion')])
+
+
+@receiver(post_delete, sender=DetAlquiler, dispatch_uid='outbox_det_borrado')
+def det_borrado(sender, instance: DetAlquiler, **kwargs):
+    registrar_varios([mensajes.alquiler_item(instance, 'baja')])
+
+
+@receiver(post_save, sender=Incidente, dispatch_uid='outbox_incidente')
+def incidente_guardado(sender, instance: Incidente, created: bool, **kwargs):
+    det = instance.det_alquiler
+    if created:
+        registrar_varios([mensajes.incidente_creado(instance, det)])
+        return
+    # _abierto_en_db todavía tiene el estado previo (Incidente.save lo actualiza después)
+    _, estaba_abierto = getattr(instance, '_abierto_en_db', (None, False))
+    if estaba_abierto and instance.estado_incidente == 'resuelto':
+        registrar_varios([mensajes.incidente_resuelto(
+            instance.pk, det.alquiler_id, det.pk, det.producto_id, instance.resultado_final,
+            instance.cantidad_afectada, instance.cantidad_repuesta, det.precio_unit,
+            instance.fecha_resolucion,
+        )])
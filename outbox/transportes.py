@@ -0,0 +1,65 @@
+# outbox/transportes.py
+"""
+Transportes del outbox (settings.OUTBOX_TRANSPORTE). Un transporte recibe un
+lote de mensajes (dicts de MensajeOutbox.como_dict()) y lo entrega entero o
+lanza una excepción. Con MensajeRechazado (el receptor no acepta el contenido)
+el dispatcher parte el lote para aislar el mensaje culpable; con cualquier otra
+(receptor caído, timeout, 5xx) reintenta el lote completo. El receptor
+deduplica por `clave`.
+"""
+import json
+import logging
+import urllib.error
+import urllib.request
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+# 4xx que no dependen del contenido del lote: se reintentan como una caída
+_HTTP_NO_RECHAZO = {401, 403, 408, 429}
+
+
+class MensajeRechazado(Exception):
+    """ El receptor rechazó el lote por su contenido: reenviarlo igual no va a funcionar. """
+
+
+class LogTransporte:
+    """ Solo loguea (desarrollo). """
+
+    def enviar(self, mensajes):
+        for m in mensajes:
+            logger.info("outbox %s %s", m['clave'], m['tipo'])
+
+
+class HTTPTransporte:
+    """
+    POST {"mensajes": [...]} a OUTBOX_HTTP_URL; cualquier respuesta no 2xx es un
+    fallo, y un 4xx por el contenido (400, 409, 413, 422, ...) es MensajeRechazado.
+    """
+
+    def __init__(self, url=None, timeout=None, token=None):
+        self.url = url or settings.OUTBOX_HTTP_URL
+        self.timeout = timeout or settings.OUTBOX_HTTP_TIMEOUT
+        self.token = token if token is not None else getattr(settings, 'OUTBOX_HTTP_TOKEN', '')
+
+    def enviar(self, mensajes):
+        cuerpo = json.dumps({'mensajes': mensajes}, cls=DjangoJSONEncoder).encode()
+        headers = {'Content-Type': 'application/json'}
+        if self.token:
+            headers['Authorization'] = f'Bearer {self.token}'
+        request = urllib.request.Request(self.url, data=cuerpo, headers=headers, method='POST')
+        # urlopen lanza HTTPError para 4xx/5xx
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                response.read()
+        except urllib.error.HTTPError as exc:
+            if 400 <= exc.code < 500 and exc.code not in _HTTP_NO_RECHAZO:
+                raise MensajeRechazado(f"HTTP {exc.code}: {exc.reason}") from exc
+            raise
+
+
+def transporte():
+    return import_string(settings.OUTBOX_TRANSPORTE)()
@@ -1,8 +1,31 @@
 from django.contrib import admin
-from .models import Producto
+from myproject.admin_rendimiento import ModelAdminRapido
+from .models import AjustePrecio, HistorialPrecio, Producto
 
 @admin.register(Producto)
-class ProductoAdmin(admin.ModelAdmin):
-    list_display = ('nombre', 'categoria', 'precio', 'stock', 'activo')
+class ProductoAdmin(ModelAdminRapido):
+    list_display = ('nombre', 'codigo', 'categoria', 'precio', 'stock', 'activo')
     list_filter = ('categoria', 'activo')
-    search_fields = ('nombre', 'descripcion')
+    # prefijo de nombre (índice producto_nombre_lower_idx, ver ModelAdminRapido); el
+    # autocomplete de DetAlquiler busca solo por ese prefijo, el changelist también en la descripción
+    search_fields = ('^nombre', '=codigo', 'descripcion')
+    search_id_fields = ('pk',)
+    ordering = ('nombre',)
+
+
+@admin.register(AjustePrecio)
+class AjustePrecioAdmin(ModelAdminRapido):
+    list_display = ('id', 'creado_en', 'tipo', 'valor', 'redondeo', 'categoria', 'activo', 'productos', 'usuario')
+    list_filter = ('tipo', 'categoria')
+    list_select_related = ('usuario',)
+    ordering = ('-creado_en',)
+
+
+@admin.register(HistorialPrecio)
+class HistorialPrecioAdmin(ModelAdminRapido):
+    list_display = ('producto', 'precio_anterior', 'precio_nuevo', 'ajuste', 'creado_en')
+    list_select_related = ('producto', 'ajuste')
+    raw_id_fields = ('producto', 'ajuste')
+    search_fields = ('^producto__nombre',)
+    search_id_fields = ('producto_id', 'ajuste_id')
+    ordering = ('-creado_en',)
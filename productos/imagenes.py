@@ -0,0 +1,84 @@
+# productos/imagenes.py
+"""
+Imágenes de productos subidas al servidor.
+
+- El original se guarda con nombre = hash del contenido (productos/originales/<hash>.<ext>).
+- Un job (productos.procesar_imagen) genera miniaturas en PRODUCTOS_THUMB_SIZES,
+  en WebP y JPEG, también con nombre = hash del archivo generado.
+- Como el nombre cambia si cambia el contenido, las URLs se sirven con
+  Cache-Control: immutable (ver myproject/media.py).
+Requiere Pillow para procesar.
+"""
+import hashlib
+import os
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+from .models import Producto
+
+FORMATOS = (
+    ('webp', 'WEBP', {'quality': 80, 'method': 4}),
+    ('jpg', 'JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+)
+EXTENSIONES = {'.jpg', '.jpeg', '.png', '.webp', '.gif'}
+
+
+def _hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:24]
+
+
+def _guardar(nombre, data):
+    # mismo contenido => mismo nombre: si ya existe no se reescribe
+    if not default_storage.exists(nombre):
+        default_storage.save(nombre, ContentFile(data))
+    return nombre
+
+
+def guardar_original(producto: Producto, archivo) -> str:
+    ext = os.path.splitext(archivo.name or '')[1].lower()
+    data = archivo.read()
+    nombre = _guardar(f"productos/originales/{_hash(data)}{ext}", data)
+    Producto.objects.filter(pk=producto.pk).update(imagen_original=nombre, imagen_thumbs={},
+                                                   updated_at=timezone.now())
+    producto.imagen_original.name, producto.imagen_thumbs = nombre, {}
+    return nombre
+
+
+def procesar(producto_id, al_progresar=None) -> dict:
+    """ Genera las miniaturas del original del producto. Devuelve {tamaño: {formato: path}}. """
+    from PIL import Image, ImageOps
+
+    producto = Producto.objects.only('imagen_original').get(pk=producto_id)
+    if not producto.imagen_original:
+        return {}
+
+    with default_storage.open(producto.imagen_original.name, 'rb') as f:
+        img = Image.open(f)
+        img = ImageOps.exif_transpose(img)
+        img.load()
+    if img.mode not in ('RGB', 'RGBA'):
+        img = img.convert('RGBA' if 'transparency' in img.info else 'RGB')
+
+    tamanios = sorted(settings.PRODUCTOS_THUMB_SIZES)
+    thumbs = {}
+    for i, lado in enumerate(tamanios, start=1):
+        copia = img.copy()
+        copia.thumbnail((lado, lado), Image.LANCZOS)
+        thumbs[str(lado)] = {}
+        for ext, formato, opciones in FORMATOS:
+            salida = copia.convert('RGB') if formato == 'JPEG' else copia
+            buf = BytesIO()
+            salida.save(buf, formato, **opciones)
+            data = buf.getvalue()
+            thumbs[str(lado)][ext] = _guardar(f"productos/thumbs/{_hash(data)}.{ext}", data)
+        if al_progresar:
+            al_progresar(i * 100 // len(tamanios), f"{lado}px")
+
+    # solo si el original no cambió mientras procesábamos
+    Producto.objects.filter(pk=producto_id, imagen_original=producto.imagen_original.name) \
+        .update(imagen_thumbs=thumbs, updated_at=timezone.now())
+    return thumbs
@@ -0,0 +1,219 @@
+# productos/importacion.py
+"""
+Importación del catálogo desde planillas de proveedores (CSV).
+
+    POST /api/productos/importar/   (multipart: archivo; ?dry_run=1)
+    manage.py importar_catalogo archivo.csv [--dry-run]
+
+Columnas: codigo, nombre, categoria, precio (obligatorias); descripcion,
+stock, activo (opcionales: si no vienen en el encabezado no se tocan).
+Separador ',' o ';' (se detecta en el encabezado); precios "1234.50" o
+"1.234,50"; categoría por clave o por nombre ("Cristalería").
+
+La clave natural es Producto.codigo. El archivo se lee en streaming de a
+PRODUCTOS_IMPORTACION_LOTE filas: por lote, un SELECT de los existentes y un
+bulk_create(update_conflicts=True) solo con las filas nuevas o cambiadas (las
+iguales no se escriben, así no se mueve su updated_at para /api/sync/), más
+un bulk_create de HistorialPrecio con los precios que cambiaron.
+Todo en una transacción: con cualquier fila inválida no se importa nada.
+"""
+import csv
+import io
+from decimal import Decimal, InvalidOperation
+from itertools import chain, islice
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from eventos.broadcaster import publicar_varios
+from .models import HistorialPrecio, Producto
+
+OBLIGATORIAS = ('codigo', 'nombre', 'categoria', 'precio')
+OPCIONALES = ('descripcion', 'stock', 'activo')
+ERRORES_MAX = 100    # errores informados (se validan todas las filas igual)
+CAMBIOS_MAX = 500    # detalle de filas creadas/actualizadas en el resumen
+
+_CATEGORIAS = {}
+for _clave, _nombre in Producto.CATEGORIAS:
+    _CATEGORIAS[_clave] = _clave
+    _CATEGORIAS[_nombre.lower()] = _clave
+_BOOLEANOS = {'1': True, 'si': True, 'sí': True, 'true': True, 'x': True,
+              '0': False, 'no': False, 'false': False, '': False}
+_CENTAVO = Decimal('0.01')
+_PRECIO_MAX = Decimal(10) ** (Producto._meta.get_field('precio').max_digits - 2)
+
+
+class ErrorFila(Exception):
+    pass
+
+
+def _precio(valor):
+    valor = valor.strip().replace('$', '').replace(' ', '')
+    if ',' in valor:
+        valor = valor.replace('.', '').replace(',', '.')
+    try:
+        precio = Decimal(valor).quantize(_CENTAVO)
+    except InvalidOperation:
+        raise ErrorFila(f"precio inválido: {valor!r}")
+    if precio < 0 or precio >= _PRECIO_MAX:
+        raise ErrorFila(f"precio fuera de rango: {valor}")
+    return precio
+
+
+def _fila(crudo, columnas):
+    """ dict de la fila CSV -> dict de campos de Producto validados. """
+    datos = {}
+    codigo = crudo['codigo'].strip()
+    if not codigo:
+        raise ErrorFila("falta codigo")
+    if len(codigo) > Producto._meta.get_field('codigo').max_length:
+        raise ErrorFila("codigo demasiado largo")
+    datos['nombre'] = crudo['nombre'].strip()
+    if not datos['nombre']:
+        raise ErrorFila("falta nombre")
+    if len(datos['nombre']) > Producto._meta.get_field('nombre').max_length:
+        raise ErrorFila("nombre demasiado largo")
+    categoria = _CATEGORIAS.get(crudo['categoria'].strip().lower())
+    if categoria is None:
+        raise ErrorFila(f"categoria inválida: {crudo['categoria']!r} "
+                        f"(opciones: {', '.join(c for c, _ in Producto.CATEGORIAS)})")
+    datos['categoria'] = categoria
+    datos['precio'] = _precio(crudo['precio'])
+    if 'descripcion' in columnas:
+        datos['descripcion'] = crudo['descripcion'].strip()
+    if 'stock' in columnas:
+        try:
+            datos['stock'] = int(crudo['stock'].strip() or 0)
+        except ValueError:
+            raise ErrorFila(f"stock inválido: {crudo['stock']!r}")
+        if datos['stock'] < 0:
+            raise ErrorFila("stock negativo")
+    if 'activo' in columnas:
+        activo = _BOOLEANOS.get(crudo['activo'].strip().lower())
+        if activo is None:
+            raise ErrorFila(f"activo inválido: {crudo['activo']!r}")
+        datos['activo'] = activo
+    return codigo, datos
+
+
+def _filas_csv(texto):
+    """ (n° de línea, dict) por fila; separador según el encabezado. """
+    primera = next(texto, '')
+    separador = ';' if primera.count(';') > primera.count(',') else ','
+    lector = csv.reader(chain([primera], texto), delimiter=separador)
+    encabezado = [c.strip().lower() for c in next(lector, [])]
+    faltan = [c for c in OBLIGATORIAS if c not in encabezado]
+    if faltan:
+        raise ErrorFila(f"faltan columnas: {', '.join(faltan)}")
+    yield encabezado
+    for linea, valores in enumerate(lector, start=2):
+        if not any(v.strip() for v in valores):
+            continue
+        yield linea, dict(zip(encabezado, valores + [''] * (len(encabezado) - len(valores))))
+
+
+def _aplicar_lote(filas, campos, resultado):
+    existentes = {
+        p['codigo']: p
+        for p in Producto.objects.filter(codigo__in=[c for _, c, _ in filas]).values('id', 'codigo', *campos)
+    }
+    escribir, stock, historial = [], [], []
+    ahora = timezone.now()
+    for linea, codigo, datos in filas:
+        previo = existentes.get(codigo)
+        if previo is None:
+            accion, cambiados = 'creado', sorted(datos)
+        else:
+            cambiados = [c for c in campos if datos[c] != previo[c]]
+            if not cambiados:
+                resultado['sin_cambios'] += 1
+                continue
+            accion = 'actualizado'
+        resultado['creados' if accion == 'creado' else 'actualizados'] += 1
+        if len(resultado['cambios']) < CAMBIOS_MAX:
+            resultado['cambios'].append({
+                'linea': linea, 'codigo': codigo, 'accion': accion,
+                'campos': {c: [None if previo is None else str(previo[c]), str(datos[c])] for c in cambiados},
+            })
+        producto = Producto(codigo=codigo, updated_at=ahora, **datos)
+        escribir.append(producto)
+        if 'stock' in cambiados:
+            stock.append((producto, previo))
+        if previo is not None and 'precio' in cambiados:
+            historial.append(HistorialPrecio(producto_id=previo['id'], precio_anterior=previo['precio'],
+                                             precio_nuevo=datos['precio'], creado_en=ahora))
+
+    if escribir:
+        Producto.objects.bulk_create(
+            escribir, update_conflicts=True, unique_fields=['codigo'],
+            update_fields=[*campos, 'updated_at'],
+        )
+        HistorialPrecio.objects.bulk_create(historial)
+    publicar_varios([
+        ('producto.stock', {'id': p.pk if previo is None else previo['id'], 'stock': p.stock})
+        for p, previo in stock if p.pk or previo
+    ])
+
+
+def importar(texto, dry_run=False, lote=None):
+    """
+    Importa desde un iterable de líneas (archivo de texto). Devuelve el resumen:
+    {filas, creados, actualizados, sin_cambios, errores, errores_total, cambios, aplicado}.
+    Con errores o dry_run los conteos son los que se habrían aplicado.
+    """
+    lote = lote or settings.PRODUCTOS_IMPORTACION_LOTE
+    resultado = {'filas': 0, 'creados': 0, 'actualizados': 0, 'sin_cambios': 0,
+                 'errores': [], 'errores_total': 0, 'cambios': [], 'aplicado': False}
+    try:
+        filas = _filas_csv(iter(texto))
+        encabezado = next(filas)
+    except ErrorFila as exc:
+        resultado['errores'].append({'linea': 1, 'error': str(exc)})
+        resultado['errores_total'] = 1
+        return resultado
+    except (UnicodeDecodeError, csv.Error) as exc:
+        resultado['errores'].append({'linea': 1, 'error': f"archivo ilegible: {exc}"})
+        resultado['errores_total'] = 1
+        return resultado
+    columnas = set(encabezado)
+    campos = ['nombre', 'categoria', 'precio', *(c for c in OPCIONALES if c in columnas)]
+    vistos = set()
+    n_errores = 0
+
+    with transaction.atomic():
+        try:
+            while True:
+                bloque = list(islice(filas, lote))
+                if not bloque:
+                    break
+                validas = []
+                for linea, crudo in bloque:
+                    resultado['filas'] += 1
+                    try:
+                        codigo, datos = _fila(crudo, columnas)
+                        if codigo in vistos:
+                            raise ErrorFila(f"codigo repetido en el archivo: {codigo}")
+                        vistos.add(codigo)
+                        validas.append((linea, codigo, datos))
+                    except ErrorFila as exc:
+                        n_errores += 1
+                        if len(resultado['errores']) < ERRORES_MAX:
+                            resultado['errores'].append({'linea': linea, 'error': str(exc)})
+                # con errores se sigue igual (el resumen queda completo) y al final se deshace todo
+                _aplicar_lote(validas, campos, resultado)
+        except (UnicodeDecodeError, csv.Error) as exc:
+            n_errores += 1
+            resultado['errores'].append({'linea': resultado['filas'] + 2, 'error': f"archivo ilegible: {exc}"})
+
+        if n_errores or dry_run:
+            transaction.set_rollback(True)
+        else:
+            resultado['aplicado'] = True
+    resultado['errores_total'] = n_errores
+    return resultado
+
+
+def texto_de(archivo_binario):
+    """ Envuelve un archivo binario (upload, open(..., 'rb')) para leerlo como texto en streaming. """
+    return io.TextIOWrapper(archivo_binario, encoding='utf-8-sig', newline='')
@@ -0,0 +1,41 @@
+# productos/management/commands/importar_catalogo.py
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from productos.importacion import importar, texto_de
+
+
+class Command(BaseCommand):
+    help = "Importa/actualiza el catálogo desde un CSV de proveedor (upsert por codigo, todo o nada)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('archivo', help='CSV con columnas codigo, nombre, categoria, precio [, descripcion, stock, activo]')
+        parser.add_argument('--dry-run', action='store_true', help='Solo mostrar el resumen, sin guardar')
+        parser.add_argument('--lote', type=int, default=None, help='Filas por upsert (default: PRODUCTOS_IMPORTACION_LOTE)')
+        parser.add_argument('--detalle', action='store_true', help='Listar cada fila creada/actualizada')
+
+    def handle(self, *args, **opts):
+        inicio = time.perf_counter()
+        try:
+            with open(opts['archivo'], 'rb') as f:
+                r = importar(texto_de(f), dry_run=opts['dry_run'], lote=opts['lote'])
+        except OSError as exc:
+            raise CommandError(str(exc))
+        segundos = time.perf_counter() - inicio
+
+        if opts['detalle']:
+            for c in r['cambios']:
+                campos = ', '.join(f"{k}: {a} -> {b}" for k, (a, b) in c['campos'].items())
+                self.stdout.write(f"  línea {c['linea']} {c['codigo']} {c['accion']}: {campos}")
+        for e in r['errores']:
+            self.stderr.write(f"  línea {e['linea']}: {e['error']}")
+
+        resumen = (f"{r['filas']} filas: {r['creados']} creados, {r['actualizados']} actualizados, "
+                   f"{r['sin_cambios']} sin cambios ({segundos:.2f}s)")
+        if r['errores_total']:
+            raise CommandError(f"{r['errores_total']} filas con errores; no se importó nada. {resumen}")
+        if opts['dry_run']:
+            self.stdout.write(self.style.WARNING(f"[dry-run] {resumen}"))
+        else:
+            self.stdout.write(self.style.SUCCESS(resumen))
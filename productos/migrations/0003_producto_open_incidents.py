@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('productos', '0002_producto_created_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='producto',
+            name='open_incidents',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
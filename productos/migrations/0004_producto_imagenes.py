@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('productos', '0003_producto_open_incidents'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='producto',
+            name='imagen_original',
+            field=models.FileField(blank=True, max_length=255, upload_to='productos/originales/'),
+        ),
+        migrations.AddField(
+            model_name='producto',
+            name='imagen_thumbs',
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('productos', '0005_producto_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='producto',
+            index=models.Index(fields=['nombre'], name='producto_nombre_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('productos', '0006_producto_nombre_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='producto',
+            name='codigo',
+            field=models.CharField(blank=True, max_length=60, null=True, unique=True),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:11
+
+import django.db.models.deletion
+import django.utils.timezone
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('productos', '0007_producto_codigo'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AjustePrecio',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('tipo', models.CharField(choices=[('porcentaje', 'Porcentaje'), ('monto', 'Monto fijo')], max_length=12)),
+                ('valor', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('redondeo', models.DecimalField(decimal_places=2, default=Decimal('0.01'), max_digits=5)),
+                ('categoria', models.CharField(blank=True, choices=[('vajilla', 'Vajilla'), ('cristaleria', 'Cristalería'), ('manteleria', 'Mantelería'), ('decoracion', 'Decoración'), ('salon', 'Salón'), ('mobiliario', 'Mobiliario')], max_length=20)),
+                ('activo', models.BooleanField(null=True)),
+                ('productos', models.PositiveIntegerField(default=0)),
+                ('creado_en', models.DateTimeField(auto_now_add=True)),
+                ('usuario', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='HistorialPrecio',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('precio_anterior', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('precio_nuevo', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('creado_en', models.DateTimeField(default=django.utils.timezone.now)),
+                ('ajuste', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='historial', to='productos.ajusteprecio')),
+                ('producto', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='historial_precios', to='productos.producto')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['producto', '-creado_en'], name='historial_precio_prod_idx')],
+            },
+        ),
+    ]
@@ -1,6 +1,11 @@
 # productos/models.py
+from decimal import Decimal
+
+from django.conf import settings
 from django.db import models
+from django.db.models.functions import Lower
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 
 class Producto(models.Model):
     CATEGORIAS = (
@@ -12,14 +17,49 @@ class Producto(models.Model):
         ('mobiliario', 'Mobiliario'),
     )
 
+    # Código del proveedor: clave natural de la importación de catálogo (productos/importacion.py).
+    # NULL para los cargados a mano (varios NULL no chocan con unique).
+    codigo = models.CharField(max_length=60, null=True, blank=True, unique=True)
     nombre = models.CharField(max_length=120)
     descripcion = models.TextField(blank=True)
     categoria = models.CharField(max_length=20, choices=CATEGORIAS)
     precio = models.DecimalField(max_digits=10, decimal_places=2)
     stock = models.PositiveIntegerField(default=0)
     imagen_url = models.URLField(blank=True)
+    # Imagen subida (productos/imagenes.py). Las miniaturas las genera un job:
+    # {"96": {"webp": "productos/thumbs/<hash>.webp", "jpg": ...}, "320": {...}}
+    imagen_original = models.FileField(upload_to='productos/originales/', blank=True, max_length=255)
+    imagen_thumbs = models.JSONField(default=dict, blank=True, editable=False)
     activo = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Última modificación (delta-sync, /api/sync/). Los UPDATE masivos también la tocan.
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+    # Incidentes en estado 'abierto' sobre este producto (lo mantiene Incidente.save/delete)
+    open_incidents = models.PositiveIntegerField(default=0, editable=False)
+
+    # lo mantienen UPDATE ... F() de incidentes: un save del producto no lo pisa
+    DENORMALIZADOS = ('open_incidents',)
+
+    class Meta:
+        indexes = [
+            # orden del listado
+            models.Index(fields=['nombre'], name='producto_nombre_idx'),
+            # búsqueda por prefijo sin distinguir mayúsculas (admin, autocomplete: q_prefijo)
+            models.Index(Lower('nombre'), name='producto_nombre_lower_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # stock "de base" para publicar producto.stock solo si cambia (eventos/senales.py)
+        instance._stock_en_db = instance.__dict__.get('stock')
+        return instance
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [f.name for f in self._meta.concrete_fields
+                                       if not f.primary_key and f.name not in self.DENORMALIZADOS]
+        super().save(*args, **kwargs)
 
     def clean(self):
         # Evitar borrar si hay incidentes abiertos (se evalúa en delete())
@@ -27,12 +67,7 @@ class Producto(models.Model):
 
     def delete(self, *args, **kwargs):
         # Chequeo condicional: si hay incidentes abiertos -> bloquear borrado
-        from incidentes.models import Incidente  # import diferido para evitar ciclos
-        abiertos = Incidente.objects.filter(
-            det_alquiler__producto=self,
-            estado_incidente='abierto'
-        ).exists()
-        if abiertos:
+        if self.open_incidents > 0:
             raise ValidationError(
                 "No se puede borrar el producto: existen incidentes abiertos asociados."
             )
@@ -40,3 +75,44 @@ class Producto(models.Model):
 
     def __str__(self):
         return self.nombre
+
+
+class AjustePrecio(models.Model):
+    """ Un ajuste masivo de precios (productos/precios.py); los precios previos quedan en HistorialPrecio. """
+    TIPOS = (
+        ('porcentaje', 'Porcentaje'),
+        ('monto', 'Monto fijo'),
+    )
+
+    tipo = models.CharField(max_length=12, choices=TIPOS)
+    valor = models.DecimalField(max_digits=10, decimal_places=2)
+    # múltiplo al que se redondea el precio nuevo: 0.01, 1, 10, 100
+    redondeo = models.DecimalField(max_digits=5, decimal_places=2, default=Decimal('0.01'))
+    # filtros usados (vacío / NULL = todos)
+    categoria = models.CharField(max_length=20, choices=Producto.CATEGORIAS, blank=True)
+    activo = models.BooleanField(null=True)
+    productos = models.PositiveIntegerField(default=0)
+    usuario = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True,
+                                on_delete=models.SET_NULL, related_name='+')
+    creado_en = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Ajuste #{self.pk} ({self.tipo} {self.valor})"
+
+
+class HistorialPrecio(models.Model):
+    """ Precio anterior/nuevo de cada cambio (ajuste masivo o edición individual, ajuste NULL). """
+    # sin índice propio: lo cubre historial_precio_prod_idx (producto, -creado_en)
+    producto = models.ForeignKey(Producto, on_delete=models.CASCADE, related_name='historial_precios',
+                                 db_index=False)
+    ajuste = models.ForeignKey(AjustePrecio, null=True, blank=True, on_delete=models.CASCADE,
+                               related_name='historial')
+    precio_anterior = models.DecimalField(max_digits=10, decimal_places=2)
+    precio_nuevo = models.DecimalField(max_digits=10, decimal_places=2)
+    # sin auto_now_add: las filas de un ajuste se insertan con INSERT ... SELECT
+    creado_en = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['producto', '-creado_en'], name='historial_precio_prod_idx'),
+        ]
@@ -0,0 +1,122 @@
+# productos/precios.py
+"""
+Ajuste masivo de precios (POST /api/productos/ajustar-precios/).
+
+Dos sentencias, sin traer productos a Python:
+  1. INSERT INTO historial (producto, ajuste, anterior, nuevo, fecha) SELECT ... FROM producto
+  2. UPDATE producto SET precio = ROUND(precio * factor / paso) * paso WHERE <mismos filtros>
+
+El precio nuevo es la misma expresión SQL en ambas, y las filas quedan
+bloqueadas por el INSERT ... SELECT (FOR UPDATE en PostgreSQL/MySQL; lock de
+escritura en SQLite), así el historial coincide con lo actualizado. Los
+productos cuyo precio no cambia (redondeo) no se tocan.
+
+Antes (también con dry_run) se rechaza el ajuste si dejaría algún producto con
+precio en $0 (ValidationError): un monto negativo mal cargado no puede poner a
+cero el catálogo entero.
+"""
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.db import connections, router, transaction
+from django.db.models import DateTimeField, DecimalField, ExpressionWrapper, F, IntegerField, Value
+from django.db.models.functions import Greatest, Round
+from django.utils import timezone
+
+from .models import AjustePrecio, HistorialPrecio, Producto
+
+CENTAVO = Decimal('0.01')
+REDONDEOS = (CENTAVO, Decimal('1'), Decimal('10'), Decimal('100'))
+MUESTRA = 20   # filas de ejemplo en la respuesta
+
+
+def expresion_precio(tipo, valor, redondeo=CENTAVO):
+    """ Expresión SQL del precio nuevo (nunca negativo). """
+    salida = DecimalField(max_digits=10, decimal_places=2)
+    if tipo == 'porcentaje':
+        expr = F('precio') * Value(1 + valor / 100, output_field=DecimalField())
+    else:
+        expr = F('precio') + Value(valor, output_field=DecimalField())
+    if redondeo == CENTAVO:
+        expr = Round(expr, 2)
+    else:
+        paso = Value(redondeo, output_field=DecimalField())
+        expr = Round(expr / paso) * paso
+    return ExpressionWrapper(Greatest(expr, Value(Decimal('0'), output_field=DecimalField())),
+                             output_field=salida)
+
+
+def productos_a_ajustar(nuevo, categoria=None, activo=None, using='default'):
+    qs = Producto.objects.using(using).order_by()
+    if categoria:
+        qs = qs.filter(categoria=categoria)
+    if activo is not None:
+        qs = qs.filter(activo=activo)
+    return qs.alias(precio_ajustado=nuevo).exclude(precio=F('precio_ajustado'))
+
+
+def validar_sin_ceros(qs):
+    """ ValidationError si el ajuste lleva algún precio a $0 (la expresión nunca baja de 0). """
+    en_cero = qs.filter(precio_ajustado__lte=0)
+    ejemplo = en_cero.order_by('nombre').values_list('nombre', 'precio').first()
+    if ejemplo is not None:
+        nombre, precio = ejemplo
+        raise ValidationError(
+            f"El ajuste dejaría {en_cero.count()} producto(s) con precio $0 o menos "
+            f"(p. ej. \"{nombre}\", hoy ${precio}).")
+
+
+def ajustar_precios(tipo, valor, redondeo=CENTAVO, categoria=None, activo=None, dry_run=False, usuario=None):
+    """
+    Devuelve {ajuste, productos, muestra}; con dry_run no escribe nada
+    (ajuste None, muestra con el precio que quedaría). ValidationError si
+    algún precio quedaría en $0.
+    """
+    db = router.db_for_write(Producto)
+    nuevo = expresion_precio(tipo, valor, redondeo)
+    qs = productos_a_ajustar(nuevo, categoria, activo, using=db)
+    validar_sin_ceros(qs)
+
+    if dry_run:
+        muestra = (qs.annotate(precio_nuevo=nuevo)
+                   .order_by('nombre')
+                   .values('id', 'nombre', 'precio', 'precio_nuevo')[:MUESTRA])
+        # SQLite devuelve la expresión sin cuantizar (117.300000000000)
+        muestra = [{**m, 'precio_nuevo': Decimal(m['precio_nuevo']).quantize(CENTAVO)} for m in muestra]
+        return {'ajuste': None, 'productos': qs.count(), 'muestra': muestra}
+
+    with transaction.atomic(using=db):
+        ajuste = AjustePrecio.objects.using(db).create(
+            tipo=tipo, valor=valor, redondeo=redondeo, categoria=categoria or '',
+            activo=activo, usuario=usuario,
+        )
+        ahora = timezone.now()
+        origen = (qs.select_for_update()
+                  .annotate(h_producto=F('pk'),
+                            h_ajuste=Value(ajuste.pk, output_field=IntegerField()),
+                            h_anterior=F('precio'),
+                            h_nuevo=nuevo,
+                            h_creado=Value(ahora, output_field=DateTimeField()))
+                  .values('h_producto', 'h_ajuste', 'h_anterior', 'h_nuevo', 'h_creado'))
+        conn = connections[db]
+        sql, params = origen.query.get_compiler(using=db).as_sql()
+        qn = conn.ops.quote_name
+        columnas = ', '.join(qn(HistorialPrecio._meta.get_field(f).column)
+                             for f in ('producto', 'ajuste', 'precio_anterior', 'precio_nuevo', 'creado_en'))
+        with conn.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {qn(HistorialPrecio._meta.db_table)} ({columnas}) {sql}", params)
+
+        actualizados = qs.update(precio=nuevo, updated_at=ahora)
+        AjustePrecio.objects.using(db).filter(pk=ajuste.pk).update(productos=actualizados)
+        ajuste.productos = actualizados
+
+    muestra = (HistorialPrecio.objects.using(db)
+               .filter(ajuste=ajuste)
+               .order_by('producto__nombre')
+               .values('producto_id', 'producto__nombre', 'precio_anterior', 'precio_nuevo')[:MUESTRA])
+    return {
+        'ajuste': ajuste.pk,
+        'productos': actualizados,
+        'muestra': [{'id': m['producto_id'], 'nombre': m['producto__nombre'],
+                     'precio': m['precio_anterior'], 'precio_nuevo': m['precio_nuevo']} for m in muestra],
+    }
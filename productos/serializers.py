@@ -1,11 +1,100 @@
 # productos/serializers.py
+import os
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.files.storage import default_storage
 from rest_framework import serializers
-from .models import Producto
+from .imagenes import EXTENSIONES
+from .models import AjustePrecio, Producto
+from .precios import REDONDEOS
+
+try:
+    from PIL import Image
+except ImportError:  # pragma: no cover - depende del entorno
+    Image = None
+
+
+def _url(request, path):
+    url = default_storage.url(path)
+    return request.build_absolute_uri(url) if request is not None else url
+
 
 class ProductoSerializer(serializers.ModelSerializer):
     categoria_display = serializers.CharField(source='get_categoria_display', read_only=True)
+    # miniatura chica para listados; sin imagen subida cae a imagen_url
+    imagen_thumb = serializers.SerializerMethodField()
+    # todas las miniaturas: {"96": {"webp": url, "jpg": url}, ...}
+    imagenes = serializers.SerializerMethodField()
 
     class Meta:
         model = Producto
-        fields = ('id', 'nombre', 'descripcion', 'categoria', 'categoria_display',
-                  'precio', 'stock', 'imagen_url', 'activo')
+        fields = ('id', 'codigo', 'nombre', 'descripcion', 'categoria', 'categoria_display',
+                  'precio', 'stock', 'imagen_url', 'imagen_thumb', 'imagenes',
+                  'activo', 'open_incidents')
+        # columnas que usan los SerializerMethodField (para ?fields=, ver myproject/sparse.py)
+        columnas_de = {'imagen_thumb': ('imagen_thumbs', 'imagen_url'), 'imagenes': ('imagen_thumbs',)}
+
+    def validate_codigo(self, valor):
+        # '' repetido chocaría con unique: sin código es NULL
+        return (valor or '').strip() or None
+
+    def get_imagen_thumb(self, obj):
+        thumbs = obj.imagen_thumbs or {}
+        if thumbs:
+            chica = thumbs[min(thumbs, key=int)]
+            path = chica.get('webp') or chica.get('jpg')
+            if path:
+                return _url(self.context.get('request'), path)
+        return obj.imagen_url or None
+
+    def get_imagenes(self, obj):
+        request = self.context.get('request')
+        return {
+            lado: {fmt: _url(request, path) for fmt, path in formatos.items()}
+            for lado, formatos in (obj.imagen_thumbs or {}).items()
+        }
+
+
+class ImagenProductoSerializer(serializers.Serializer):
+    imagen = serializers.FileField()
+
+    def validate_imagen(self, archivo):
+        if archivo.size > settings.PRODUCTOS_IMAGEN_MAX_BYTES:
+            raise serializers.ValidationError(
+                f"La imagen supera {settings.PRODUCTOS_IMAGEN_MAX_BYTES // (1024 * 1024)} MB.")
+        if os.path.splitext(archivo.name or '')[1].lower() not in EXTENSIONES:
+            raise serializers.ValidationError(
+                f"Formato no soportado. Opciones: {', '.join(sorted(EXTENSIONES))}")
+        if Image is None:
+            return archivo
+        try:
+            Image.open(archivo).verify()
+        except Exception:
+            raise serializers.ValidationError("El archivo no es una imagen válida.")
+        finally:
+            archivo.seek(0)
+        return archivo
+
+
+class ImportacionCatalogoSerializer(serializers.Serializer):
+    archivo = serializers.FileField()
+    dry_run = serializers.BooleanField(default=False)
+
+
+class AjustePreciosSerializer(serializers.Serializer):
+    tipo = serializers.ChoiceField(choices=AjustePrecio.TIPOS)
+    # porcentaje (15 = +15%, -10 = -10%) o monto fijo en pesos
+    valor = serializers.DecimalField(max_digits=10, decimal_places=2)
+    redondeo = serializers.ChoiceField(choices=[str(r) for r in REDONDEOS], default='0.01')
+    categoria = serializers.ChoiceField(choices=Producto.CATEGORIAS, required=False, allow_blank=True)
+    activo = serializers.BooleanField(required=False, allow_null=True, default=None)
+    dry_run = serializers.BooleanField(default=False)
+
+    def validate(self, attrs):
+        if attrs['valor'] == 0:
+            raise serializers.ValidationError({'valor': "El ajuste no puede ser 0."})
+        if attrs['tipo'] == 'porcentaje' and not (-90 <= attrs['valor'] <= 1000):
+            raise serializers.ValidationError({'valor': "El porcentaje debe estar entre -90 y 1000."})
+        attrs['redondeo'] = Decimal(attrs['redondeo'])
+        return attrs
@@ -0,0 +1,9 @@
+# productos/tareas.py
+from jobs.registro import tarea
+from .imagenes import procesar
+
+
+@tarea('productos.procesar_imagen')
+def procesar_imagen_job(job):
+    thumbs = procesar(job.payload['producto'], al_progresar=job.reportar_progreso)
+    return {'producto': job.payload['producto'], 'thumbs': thumbs}
@@ -1,3 +1,34 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
 from django.test import TestCase
 
-# Create your tests here.
+from rest_framework.test import APIClient
+
+from alquileres.models import Alquiler, DetAlquiler
+from incidentes.models import Incidente
+from .models import Producto
+from .views import ProductoViewSet
+
+
+class OpenIncidentsTests(TestCase):
+
+    def setUp(self):
+        self.producto = Producto.objects.create(nombre='Copa', categoria='cristaleria', precio=10, stock=20)
+        alquiler = Alquiler.objects.create(cliente_nombre='Ana')
+        self.det = DetAlquiler.objects.create(alquiler=alquiler, producto=self.producto, cantidad=2, precio_unit=10)
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_superuser('admin', 'admin@empresa.com', 'clave'))
+
+    def test_put_con_producto_leido_antes_no_pisa_el_contador(self):
+        # el PUT leyó el producto antes de que otro request abriera un incidente
+        leido = Producto.objects.get(pk=self.producto.pk)
+        Incidente.objects.create(det_alquiler=self.det, cantidad_afectada=1)
+        with mock.patch.object(ProductoViewSet, 'get_object', return_value=leido):
+            resp = self.client.put(f'/api/productos/{leido.pk}/', {
+                'nombre': 'Copa flauta', 'categoria': 'cristaleria', 'precio': '10.00', 'stock': 19,
+            }, format='json')
+        self.assertEqual(resp.status_code, 200)
+        self.producto.refresh_from_db()
+        self.assertEqual((self.producto.nombre, self.producto.open_incidents), ('Copa flauta', 1))
+        self.assertEqual(self.client.delete(f'/api/productos/{self.producto.pk}/').status_code, 409)
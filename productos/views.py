@@ -1,11 +1,93 @@
 # productos/views.py
-from rest_framework import viewsets
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.permissions import IsAuthenticated
-from .models import Producto
-from .serializers import ProductoSerializer
+from rest_framework.response import Response
+from empleados.permissions import EsUsuarioAdministrador
+from myproject.db_router import ReplicaSafeMixin
+from myproject.sparse import SparseFieldsMixin
+from jobs.registro import encolar
+from jobs.serializers import JobSerializer
+from .imagenes import guardar_original
+from .importacion import importar, texto_de
+from .models import HistorialPrecio, Producto
+from .precios import ajustar_precios
+from .serializers import (AjustePreciosSerializer, ImagenProductoSerializer, ImportacionCatalogoSerializer,
+                          ProductoSerializer)
 from .permissions import SoloAdminEdita
 
-class ProductoViewSet(viewsets.ModelViewSet):
+class ProductoViewSet(ReplicaSafeMixin, SparseFieldsMixin, viewsets.ModelViewSet):
     queryset = Producto.objects.all().order_by('nombre')
     serializer_class = ProductoSerializer
     permission_classes = [IsAuthenticated, SoloAdminEdita]
+
+    def destroy(self, request, *args, **kwargs):
+        # Producto.delete() rechaza el borrado con incidentes abiertos
+        try:
+            return super().destroy(request, *args, **kwargs)
+        except DjangoValidationError as exc:
+            return Response({"detail": exc.messages[0]}, status=status.HTTP_409_CONFLICT)
+
+    @transaction.atomic
+    def perform_update(self, serializer):
+        anterior = serializer.instance.precio
+        producto = serializer.save()
+        if producto.precio != anterior:
+            HistorialPrecio.objects.create(producto=producto, precio_anterior=anterior, precio_nuevo=producto.precio)
+
+    @action(detail=True, methods=['post'], url_path='imagen',
+            parser_classes=[MultiPartParser, FormParser])
+    def imagen(self, request, pk=None):
+        """
+        POST multipart {imagen: archivo}. Guarda el original y encola la
+        generación de miniaturas; responde 202 con el job para seguirlo en /api/jobs/<id>/.
+        """
+        producto = self.get_object()
+        serializer = ImagenProductoSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        guardar_original(producto, serializer.validated_data['imagen'])
+        job = encolar('productos.procesar_imagen', {'producto': producto.pk}, usuario=request.user)
+        return Response({
+            'producto': ProductoSerializer(producto, context=self.get_serializer_context()).data,
+            'job': JobSerializer(job).data,
+        }, status=status.HTTP_202_ACCEPTED)
+
+    @action(detail=False, methods=['post'], url_path='importar',
+            parser_classes=[MultiPartParser, FormParser])
+    def importar(self, request):
+        """
+        POST multipart {archivo: CSV, dry_run?}. Upsert del catálogo por codigo
+        (productos/importacion.py); todo o nada. Responde el resumen de cambios,
+        con 400 si alguna fila es inválida.
+        """
+        serializer = ImportacionCatalogoSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        dry_run = serializer.validated_data['dry_run'] or request.query_params.get('dry_run') in ('1', 'true')
+        resultado = importar(texto_de(serializer.validated_data['archivo'].file), dry_run=dry_run)
+        return Response(resultado, status=status.HTTP_400_BAD_REQUEST if resultado['errores_total']
+                        else status.HTTP_200_OK)
+
+    @action(detail=False, methods=['post'], url_path='ajustar-precios',
+            permission_classes=[IsAuthenticated, EsUsuarioAdministrador])
+    def ajustar_precios(self, request):
+        """
+        {tipo: porcentaje|monto, valor, redondeo?: 0.01|1|10|100, categoria?, activo?, dry_run?}
+        Un UPDATE + un INSERT ... SELECT al historial (productos/precios.py).
+        """
+        serializer = AjustePreciosSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        datos = serializer.validated_data
+        try:
+            resultado = ajustar_precios(
+                datos['tipo'], datos['valor'], datos['redondeo'],
+                categoria=datos.get('categoria'), activo=datos['activo'],
+                dry_run=datos['dry_run'], usuario=request.user,
+            )
+        except DjangoValidationError as exc:
+            raise ValidationError({'valor': exc.messages})
+        resultado['dry_run'] = datos['dry_run']
+        return Response(resultado)
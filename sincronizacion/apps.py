@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class SincronizacionConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'sincronizacion'
+
+    def ready(self):
+        # receivers que registran tombstones al borrar
+        from . import senales  # noqa: F401
@@ -0,0 +1,18 @@
+# sincronizacion/colecciones.py
+"""
+Colecciones que expone /api/sync/: nombre -> (modelo, serializer, queryset).
+Cada modelo tiene updated_at (indexado) y sus borrados quedan en Tombstone.
+"""
+from alquileres.models import Alquiler
+from alquileres.serializers import AlquilerSerializer
+from clientes.models import Cliente
+from clientes.serializers import ClienteSerializer
+from productos.models import Producto
+from productos.serializers import ProductoSerializer
+
+COLECCIONES = {
+    'productos':  (Producto, ProductoSerializer, lambda: Producto.objects.all()),
+    'clientes':   (Cliente, ClienteSerializer, lambda: Cliente.objects.all()),
+    'alquileres': (Alquiler, AlquilerSerializer, lambda: Alquiler.objects.prefetch_related('items__producto')),
+}
+
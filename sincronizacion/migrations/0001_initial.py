@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 15:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('coleccion', models.CharField(max_length=30)),
+                ('objeto_id', models.BigIntegerField()),
+                ('eliminado_en', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['coleccion', 'eliminado_en'], name='tombstone_coleccion_idx')],
+            },
+        ),
+    ]
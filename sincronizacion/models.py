@@ -0,0 +1,21 @@
+# sincronizacion/models.py
+from django.db import models
+
+
+class Tombstone(models.Model):
+    """
+    Registro de un borrado, para que /api/sync/ se lo informe a los clientes
+    que sincronizan por delta (solo se guardan SYNC_TOMBSTONES_DIAS días).
+    """
+    coleccion    = models.CharField(max_length=30)    # 'productos', 'clientes', 'alquileres'
+    objeto_id    = models.BigIntegerField()
+    eliminado_en = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # WHERE coleccion = ? AND eliminado_en >= ?
+            models.Index(fields=['coleccion', 'eliminado_en'], name='tombstone_coleccion_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.coleccion} #{self.objeto_id} eliminado"
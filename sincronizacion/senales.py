@@ -0,0 +1,22 @@
+# sincronizacion/senales.py
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models.signals import post_delete
+from django.utils import timezone
+
+from .colecciones import COLECCIONES
+from .models import Tombstone
+
+
+def registrar_borrado(sender, instance, **kwargs):
+    nombre = next(n for n, (modelo, _, _) in COLECCIONES.items() if modelo is sender)
+    tombstone = Tombstone.objects.create(coleccion=nombre, objeto_id=instance.pk)
+    # limpieza ocasional: más viejos que la retención ya no sirven (el cliente hace sync completo)
+    if tombstone.pk % 500 == 0:
+        limite = timezone.now() - timedelta(days=settings.SYNC_TOMBSTONES_DIAS)
+        Tombstone.objects.filter(eliminado_en__lt=limite).delete()
+
+
+for _modelo, _, _ in COLECCIONES.values():
+    post_delete.connect(registrar_borrado, sender=_modelo, dispatch_uid=f'tombstone_{_modelo._meta.label}')
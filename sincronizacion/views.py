@@ -0,0 +1,74 @@
+# sincronizacion/views.py
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .colecciones import COLECCIONES
+from .models import Tombstone
+
+
+def _token(momento):
+    """ Token opaco para el cliente: microsegundos UTC desde epoch. """
+    return str(int(momento.timestamp() * 1_000_000))
+
+
+def _desde_token(token):
+    try:
+        return datetime.fromtimestamp(int(token) / 1_000_000, tz=dt_timezone.utc)
+    except (TypeError, ValueError, OverflowError, OSError):
+        raise ValidationError({'since': 'Token de sincronización inválido.'})
+
+
+class SyncView(APIView):
+    """
+    GET /api/sync/?since=<token>&colecciones=productos,clientes,alquileres
+
+    Sin `since` (o con un token más viejo que la retención de tombstones) devuelve todo
+    con "completo": true y el cliente reemplaza su copia local. Si no, solo lo que
+    cambió o se borró desde el token:
+        {"token": "...", "completo": false,
+         "productos": {"cambios": [...], "eliminados": [ids]}, ...}
+    Se relee un margen (SYNC_MARGEN_SEGUNDOS) antes del token para no perder
+    transacciones que confirmaron tarde; los cambios repetidos son idempotentes (upsert por id).
+    No usa la réplica: un retraso de replicación haría perder cambios.
+    """
+    permission_classes = [IsAuthenticated]
+    throttle_scope = 'listado'
+
+    def get(self, request):
+        ahora = timezone.now()
+
+        pedidas = request.query_params.get('colecciones')
+        nombres = [c.strip() for c in pedidas.split(',') if c.strip()] if pedidas else list(COLECCIONES)
+        invalidas = [c for c in nombres if c not in COLECCIONES]
+        if invalidas or not nombres:
+            raise ValidationError({'colecciones': f"Opciones: {', '.join(COLECCIONES)}"})
+
+        since = request.query_params.get('since')
+        desde = _desde_token(since) if since else None
+        retencion = ahora - timedelta(days=settings.SYNC_TOMBSTONES_DIAS)
+        completo = desde is None or desde < retencion
+        if not completo:
+            desde -= timedelta(seconds=settings.SYNC_MARGEN_SEGUNDOS)
+
+        data = {'token': _token(ahora), 'completo': completo}
+        context = {'request': request}
+        for nombre in nombres:
+            _, serializer_class, queryset = COLECCIONES[nombre]
+            qs = queryset()
+            eliminados = []
+            if not completo:
+                qs = qs.filter(updated_at__gte=desde)
+                eliminados = list(Tombstone.objects
+                                  .filter(coleccion=nombre, eliminado_en__gte=desde)
+                                  .values_list('objeto_id', flat=True).distinct())
+            data[nombre] = {
+                'cambios': serializer_class(qs.order_by('pk'), many=True, context=context).data,
+                'eliminados': eliminados,
+            }
+        return Response(data)